@@ -0,0 +1,68 @@
+"""
+Caesar cipher microbenchmark.
+
+Compares the former per-character CaesarCipher implementation with the translation table one.
+
+Usage (from the repository root):
+
+    python benchmarks/caesar_translate.py
+    python benchmarks/caesar_translate.py --sizes 1024 1048576 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cryptools'))
+
+from src.cryptools import CaesarCipher  # noqa: E402
+
+
+SIZES: list[int] = [1024, 1024 ** 2, 100 * 1024 ** 2]
+SAMPLE: str = 'This message shall remain private, 42 times! '
+
+
+def legacy_process(text: str, key: int) -> str:
+    """Former CaesarCipher._process implementation, kept here as the comparison baseline."""
+    processed_text: list[str] = []
+
+    for char in text.upper():
+        if char.isalpha():
+            index: int = ord(char) + key % 26
+            if index > ord('Z'):
+                index = index - 26
+            processed_text.append(chr(index))
+        else:
+            processed_text.append(char)
+
+    return ''.join(processed_text)
+
+
+def best_of(func, repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='input sizes in bytes')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measure (best is kept)')
+    parser.add_argument('--key', type=int, default=3)
+    args = parser.parse_args()
+
+    cipher = CaesarCipher(args.key)
+
+    print(f"{'size':>12} {'legacy (s)':>12} {'table (s)':>12} {'speed-up':>10}")
+    for size in args.sizes:
+        text: str = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+        legacy: float = best_of(lambda: legacy_process(text, args.key), args.repeat)
+        table: float = best_of(lambda: cipher._process(text, decode=False), args.repeat)
+        print(f'{size:>12} {legacy:>12.4f} {table:>12.4f} {legacy / table:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
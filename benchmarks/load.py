@@ -0,0 +1,254 @@
+"""
+HTTP load generator.
+
+Starts the cryptools server locally (or targets a running one with --url), then keeps `--concurrency` requests in \
+flight for `--duration` seconds, drawn from a weighted mix of the Atbash, Caesar and Affine routes. The throughput, \
+the latency percentiles and the error rates are reported as text, and optionally as JSON.
+
+Usage (from the repository root):
+
+    python benchmarks/load.py
+    python benchmarks/load.py --concurrency 64 --duration 30 --payload-size 4096 --mix caesar=3 affine=1
+    python benchmarks/load.py --workers 4 --reuse-port --output load.json
+    python benchmarks/load.py --url http://127.0.0.1:5000 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Optional
+
+import tornado.httpclient
+import tornado.testing
+
+
+APP_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cryptools', 'app.py')
+CONCURRENCY: int = 16
+DURATION: float = 10.0
+WARMUP: float = 1.0
+PAYLOAD_SIZE: int = 256
+REQUEST_TIMEOUT: float = 30.0
+STARTUP_TIMEOUT: float = 10.0
+SAMPLE: str = 'This message shall remain private, 42 times! '
+
+# route name: (path, cipher arguments of the body)
+ROUTES: dict[str, tuple[str, dict[str, Any]]] = {
+    'atbash': ('/cipher/atbash/', {}),
+    'caesar': ('/cipher/caesar/', {'key': 3}),
+    'affine': ('/cipher/affine/', {'keys': [5, 7]}),
+}
+
+
+def _parse_mix(values: list[str]) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for value in values:
+        name, _, weight = value.partition('=')
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route '{name}', expected one of {', '.join(ROUTES)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight '{weight}' for route '{name}'")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"Invalid weight '{weight}' for route '{name}'")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('At least one route must have a positive weight')
+    return mix
+
+
+def percentile(latencies: list[float], rank: float) -> float:
+    """
+    This function returns the nearest-rank percentile of sorted latencies.
+
+    :argument: latencies (list[float]) sorted latencies
+    :argument: rank (float) percentile, from 0 to 100
+    :return: (float) latency, 0 if there is none
+    """
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, max(0, int(len(latencies) * rank / 100 + 0.5) - 1))]
+
+
+def summarize(latencies: list[float], errors: dict[str, int], elapsed: float) -> dict[str, Any]:
+    latencies = sorted(latencies)
+    failed: int = sum(errors.values())
+    requests: int = len(latencies) + failed
+    return {
+        'requests': requests,
+        'rps': requests / elapsed if elapsed else 0.0,
+        'error_rate': failed / requests if requests else 0.0,
+        'errors': dict(sorted(errors.items())),
+        'latency_ms': {
+            'p50': percentile(latencies, 50) * 1e3,
+            'p95': percentile(latencies, 95) * 1e3,
+            'p99': percentile(latencies, 99) * 1e3,
+            'max': latencies[-1] * 1e3 if latencies else 0.0,
+        },
+    }
+
+
+class LoadGenerator:
+    """
+    Load generator.
+
+    Each of the `concurrency` clients sends requests one after the other until the deadline, so that there are \
+    always `concurrency` requests in flight (closed-loop load). Requests sent during the warm-up are not measured.
+
+    The latency of a request is measured from its sending to the end of its response; only successful (200) \
+    responses are part of the latency percentiles, the others are counted as errors, by status code or exception.
+    """
+    def __init__(self, url: str, mix: dict[str, float], concurrency: int, payload_size: int, seed: int = 0):
+        self.url: str = url.rstrip('/')
+        self.concurrency: int = concurrency
+        self._routes: list[str] = [name for name, weight in mix.items() if weight > 0]
+        self._weights: list[float] = [mix[name] for name in self._routes]
+        self._rng = random.Random(seed)
+
+        text: str = (SAMPLE * (payload_size // len(SAMPLE) + 1))[:payload_size]
+        self._bodies: dict[str, str] = {
+            name: json.dumps({'text': text, 'encrypt': True, **ROUTES[name][1]}) for name in self._routes
+        }
+        self.latencies: dict[str, list[float]] = {name: [] for name in self._routes}
+        self.errors: dict[str, dict[str, int]] = {name: {} for name in self._routes}
+
+    async def _client(self, client: tornado.httpclient.AsyncHTTPClient, measure_from: float, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            name: str = self._rng.choices(self._routes, self._weights)[0]
+            start: float = time.monotonic()
+            try:
+                response = await client.fetch(
+                    self.url + ROUTES[name][0],
+                    method='POST',
+                    headers={'Content-Type': 'application/json'},
+                    body=self._bodies[name],
+                    request_timeout=REQUEST_TIMEOUT,
+                    raise_error=False,
+                )
+                error: Optional[str] = None if response.code == 200 else str(response.code)
+            except Exception as exc:
+                error = type(exc).__name__
+            end: float = time.monotonic()
+
+            if start < measure_from or end > deadline:
+                continue
+            if error is None:
+                self.latencies[name].append(end - start)
+            else:
+                self.errors[name][error] = self.errors[name].get(error, 0) + 1
+
+    async def run(self, duration: float, warmup: float = WARMUP) -> dict[str, Any]:
+        """
+        This method runs the load and returns the report.
+
+        :argument: duration (float) measured duration in seconds
+        :argument: warmup (float) duration in seconds before the measure starts
+        :return: (dict) overall and per route summaries
+        """
+        client = tornado.httpclient.AsyncHTTPClient(force_instance=True, max_clients=self.concurrency)
+        measure_from: float = time.monotonic() + warmup
+        deadline: float = measure_from + duration
+        try:
+            await asyncio.gather(*(self._client(client, measure_from, deadline) for _ in range(self.concurrency)))
+        finally:
+            client.close()
+
+        errors: dict[str, int] = {}
+        for route_errors in self.errors.values():
+            for error, count in route_errors.items():
+                errors[error] = errors.get(error, 0) + count
+        return {
+            'url': self.url,
+            'concurrency': self.concurrency,
+            'duration': duration,
+            'total': summarize([latency for values in self.latencies.values() for latency in values], errors, duration),
+            'routes': {
+                name: summarize(self.latencies[name], self.errors[name], duration) for name in self._routes
+            },
+        }
+
+
+def start_server(args: list[str]) -> tuple[subprocess.Popen, str]:
+    """This function starts the cryptools server on a free local port and waits until it accepts connections."""
+    sock, port = tornado.testing.bind_unused_port()
+    sock.close()
+    process = subprocess.Popen(
+        [sys.executable, APP_PATH, '--port', str(port), '--address', '127.0.0.1', *args],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline: float = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'Server exited with status {process.returncode}')
+        with socket.socket() as probe:
+            if probe.connect_ex(('127.0.0.1', port)) == 0:
+                return process, f'http://127.0.0.1:{port}'
+        time.sleep(0.05)
+    process.kill()
+    raise SystemExit('Server did not start')
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines: list[str] = [
+        f"{report['url']}, {report['concurrency']} concurrent clients, {report['duration']:.1f} s",
+        f"{'route':<10} {'requests':>9} {'rps':>9} {'errors':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for name, summary in [*report['routes'].items(), ('total', report['total'])]:
+        latency: dict[str, float] = summary['latency_ms']
+        lines.append(
+            f"{name:<10} {summary['requests']:>9} {summary['rps']:>9.1f} {summary['error_rate']:>8.2%} "
+            f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} {latency['max']:>8.2f}"
+        )
+    if report['total']['errors']:
+        lines.append('errors: ' + ', '.join(f'{error}: {count}' for error, count in report['total']['errors'].items()))
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='base URL of a running server (by default, one is started locally)')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='number of requests in flight')
+    parser.add_argument('--duration', type=float, default=DURATION, help='measured duration in seconds')
+    parser.add_argument('--warmup', type=float, default=WARMUP, help='unmeasured duration before, in seconds')
+    parser.add_argument('--payload-size', type=int, default=PAYLOAD_SIZE, help='length of the texts to cipher')
+    parser.add_argument(
+        '--mix', nargs='+', default=list(ROUTES), metavar='ROUTE[=WEIGHT]',
+        help=f"routes to request and their weights, among {', '.join(ROUTES)} (default: all, evenly)"
+    )
+    parser.add_argument('--seed', type=int, default=0, help='seed of the route choices')
+    parser.add_argument('--output', help='JSON report file')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes of the local server')
+    parser.add_argument('--reuse-port', action='store_true', help='start the local server with --reuse-port')
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('--concurrency must be a positive integer')
+    try:
+        mix: dict[str, float] = _parse_mix(args.mix)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    process: Optional[subprocess.Popen] = None
+    url: str = args.url
+    if url is None:
+        process, url = start_server(['--workers', str(args.workers), *(['--reuse-port'] if args.reuse_port else [])])
+    try:
+        generator = LoadGenerator(url, mix, args.concurrency, args.payload_size, args.seed)
+        report: dict[str, Any] = asyncio.run(generator.run(args.duration, args.warmup))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
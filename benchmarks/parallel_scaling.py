@@ -0,0 +1,58 @@
+"""
+Parallel cipher scaling benchmark.
+
+Measures the throughput of ParallelCipher on a single large buffer, from 1 to N worker processes.
+
+Usage (from the repository root):
+
+    python benchmarks/parallel_scaling.py
+    python benchmarks/parallel_scaling.py --size 268435456 --workers 1 2 4 --shard-size 4194304
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cryptools'))
+
+from src.cryptools import AffineCipher  # noqa: E402
+from src.parallel import ParallelCipher, SHARD_SIZE  # noqa: E402
+
+
+SIZE: int = 1024 ** 3
+SAMPLE: bytes = b'This message shall remain private, 42 times! '
+
+
+def main() -> None:
+    cpu_count: int = os.cpu_count() or 1
+    default_workers: list[int] = sorted({1, *(2 ** i for i in range(1, cpu_count.bit_length()) if 2 ** i <= cpu_count), cpu_count})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=SIZE, help=f'input size in bytes (default {SIZE})')
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers, help='worker counts to measure')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE, help=f'shard size in bytes (default {SHARD_SIZE})')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measure (best is kept)')
+    args = parser.parse_args()
+
+    data: bytes = (SAMPLE * (args.size // len(SAMPLE) + 1))[:args.size]
+    cipher = AffineCipher(5, 7)
+
+    start: float = time.perf_counter()
+    cipher.encode_bytes(data)
+    single: float = time.perf_counter() - start
+    print(f'{"in-process":>10} {single:>10.3f} s {args.size / 1024 ** 2 / single:>10.1f} MB/s')
+
+    for workers in args.workers:
+        with ParallelCipher(cipher, workers=workers, shard_size=args.shard_size) as parallel:
+            parallel.encode_bytes(data[:args.shard_size * workers + 1])  # start the worker processes
+            timings: list[float] = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                parallel.encode_bytes(data)
+                timings.append(time.perf_counter() - start)
+        elapsed: float = min(timings)
+        print(f'{workers:>10} {elapsed:>10.3f} s {args.size / 1024 ** 2 / elapsed:>10.1f} MB/s {single / elapsed:>6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+"""
+Benchmark suite with regression tracking.
+
+Measures every Cipher subclass (encode and decode, over several input sizes and alphabet mixes) and every route of \
+make_app, served in-process, then writes the results as JSON. A results file can be compared with a stored baseline:
+the measures slower than the baseline by more than the threshold are reported, and the exit status is 1.
+
+Usage (from the repository root):
+
+    python benchmarks/suite.py run --output baseline.json
+    python benchmarks/suite.py run --sizes 64 4096 --mixes letters --no-http --output current.json
+    python benchmarks/suite.py run --output current.json --baseline baseline.json
+    python benchmarks/suite.py compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import string
+import sys
+import time
+import timeit
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cryptools'))
+
+import tornado.httpclient  # noqa: E402
+import tornado.httpserver  # noqa: E402
+import tornado.testing  # noqa: E402
+import tornado.websocket  # noqa: E402
+
+from app import make_app  # noqa: E402
+from src.cryptools import Cipher  # noqa: E402
+from src.registry import CIPHERS  # noqa: E402
+
+
+SIZES: list[int] = [64, 4 * 1024, 1024 ** 2, 100 * 1024 ** 2]
+MIN_TIME: float = 0.2
+REPEAT: int = 3
+HTTP_REQUESTS: int = 200
+THRESHOLD: float = 0.1
+
+# keys of each registry cipher; every Cipher subclass must be reachable from here
+CIPHER_KEYS: dict[str, tuple] = {
+    'atbash': (),
+    'caesar': (3,),
+    'affine': (5, 7),
+    'substitution': ('QWERTYUIOPASDFGHJKLZXCVBNM',),
+    'vigenere': ('LEMON',),
+    'pipeline': (('caesar', 3), ('affine', 5, 7), ('atbash',)),
+}
+
+# characters each alphabet mix is drawn from, with their weights
+MIXES: dict[str, list[tuple[str, int]]] = {
+    'letters': [(string.ascii_letters, 1)],
+    'punctuation': [(string.ascii_letters, 1), (string.punctuation + string.digits + ' \n', 1)],
+    'unicode': [(string.ascii_letters + ' ', 3), ('éèàçüößøåñ', 1), ('日本語文字', 1)],
+}
+
+SAMPLE: str = 'This message shall remain private, 42 times! '
+SUBSTITUTION_KEY: str = CIPHER_KEYS['substitution'][0]
+
+# (name, method, path, headers, body) of the request measured for each route of make_app; the WS method measures the
+# round trip of a message over an open WebSocket connection, {job} is the id of the last job submitted
+ROUTE_REQUESTS: list[tuple[str, str, str, dict[str, str], Optional[str]]] = [
+    ('atbash', 'POST', '/cipher/atbash/', {}, json.dumps({'text': SAMPLE, 'encrypt': True})),
+    ('caesar', 'POST', '/cipher/caesar/', {}, json.dumps({'text': SAMPLE, 'encrypt': True, 'key': 3})),
+    ('affine', 'POST', '/cipher/affine/', {}, json.dumps({'text': SAMPLE, 'encrypt': True, 'keys': [5, 7]})),
+    (
+        'substitution', 'POST', '/cipher/substitution/', {},
+        json.dumps({'text': SAMPLE, 'encrypt': True, 'key': SUBSTITUTION_KEY})
+    ),
+    ('vigenere', 'POST', '/cipher/vigenere/', {}, json.dumps({'text': SAMPLE, 'encrypt': True, 'key': 'LEMON'})),
+    (
+        'batch', 'POST', '/cipher/batch/', {},
+        json.dumps({'items': [{'cipher': 'caesar', 'text': SAMPLE, 'encrypt': True, 'key': key} for key in range(8)]})
+    ),
+    (
+        'pipeline', 'POST', '/cipher/pipeline/', {},
+        json.dumps({
+            'text': SAMPLE, 'encrypt': True,
+            'stages': [{'cipher': 'caesar', 'key': 3}, {'cipher': 'affine', 'keys': [5, 7]}, {'cipher': 'atbash'}]
+        })
+    ),
+    ('stream', 'POST', '/cipher/caesar/stream/?encrypt=true&key=3', {'Content-Type': 'text/plain'}, SAMPLE * 64),
+    ('websocket', 'WS', '/cipher/caesar/ws/?encrypt=true&key=3', {}, SAMPLE),
+    ('crack', 'POST', '/crack/', {}, json.dumps({'text': 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH' * 4})),
+    (
+        'crack_substitution', 'POST', '/crack/substitution/', {},
+        json.dumps({'text': 'ZIOL DTLLQUT LIQSS KTDQOF HKOCQZT' * 4, 'restarts': 1, 'seed': 0})
+    ),
+    (
+        'jobs', 'POST', '/jobs/?cipher=caesar&key=3&encrypt=true', {'Content-Type': 'application/octet-stream'},
+        SAMPLE * 64
+    ),
+    ('job', 'GET', '/jobs/{job}', {}, None),
+    ('job_result', 'GET', '/jobs/{job}/result', {}, None),
+    ('stats', 'GET', '/stats/', {}, None),
+    ('metrics', 'GET', '/metrics', {}, None),
+]
+
+
+def make_text(mix: str, size: int, seed: int = 0) -> str:
+    """
+    This function returns a deterministic text of about `size` UTF-8 bytes drawn from the input alphabet mix.
+
+    A 64 KiB block is generated once then repeated, so that 100 MB inputs are built quickly.
+    """
+    rng = random.Random(seed)
+    pools: list[str] = [pool for pool, _ in MIXES[mix]]
+    weights: list[int] = [weight for _, weight in MIXES[mix]]
+    block: str = ''.join(rng.choice(rng.choices(pools, weights)[0]) for _ in range(min(size, 64 * 1024)))
+
+    text: str = block * (size // len(block.encode()) + 1)
+    # trim to the target size in bytes, never splitting a character
+    return text.encode()[:size].decode(errors='ignore')
+
+
+def _run_coroutine(coroutine: Coroutine) -> Any:
+    """This function runs a coroutine that never awaits, without the overhead of an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError('Input coroutine is not synchronous')
+
+
+def _measure(function: Callable[[], Any], repeat: int, min_time: float) -> tuple[float, int]:
+    """
+    This function measures the input function.
+
+    The number of calls per run is calibrated so that a run lasts at least `min_time` seconds, the best of `repeat` \
+    runs is kept.
+
+    :return: (tuple) seconds per call, calls per run
+    """
+    timer = timeit.Timer(function)
+    number: int = 1
+    while True:
+        elapsed: float = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+    best: float = min([elapsed] + timer.repeat(repeat - 1, number)) if repeat > 1 else elapsed
+    return best / number, number
+
+
+def _check_coverage() -> None:
+    """This function makes sure that every Cipher subclass is benchmarked: new ciphers must be added to CIPHER_KEYS."""
+    classes: set[type] = set()
+    pending: list[type] = [Cipher]
+    while pending:
+        subclasses: list[type] = pending.pop().__subclasses__()
+        classes.update(subclasses)
+        pending.extend(subclasses)
+    covered: set[type] = {type(CIPHERS[name](*keys)) for name, keys in CIPHER_KEYS.items()}
+    missing: set[type] = classes - covered
+    if missing:
+        raise SystemExit(f"Cipher subclasses without benchmark keys: {', '.join(sorted(cls.__name__ for cls in missing))}")
+
+
+def run_ciphers(sizes: list[int], mixes: list[str], repeat: int, min_time: float) -> list[dict[str, Any]]:
+    _check_coverage()
+    results: list[dict[str, Any]] = []
+    for mix in mixes:
+        for size in sizes:
+            text: str = make_text(mix, size)
+            for name, keys in CIPHER_KEYS.items():
+                cipher: Cipher = CIPHERS[name](*keys)
+                for operation in ('encode', 'decode'):
+                    method = getattr(cipher, operation)
+                    seconds, number = _measure(lambda: _run_coroutine(method(text)), repeat, min_time)
+                    result: dict[str, Any] = {
+                        'name': f'cipher/{name}/{operation}/{mix}/{size}',
+                        'seconds': seconds,
+                        'mb_per_s': size / seconds / 1e6,
+                        'calls': number,
+                    }
+                    results.append(result)
+                    print(f"{result['name']:<48} {seconds * 1e6:>14.2f} us {result['mb_per_s']:>10.1f} MB/s", file=sys.stderr)
+    return results
+
+
+async def _run_http(requests: int) -> list[dict[str, Any]]:
+    app = make_app()
+    patterns: list[str] = [rule.matcher.regex.pattern for rule in app.wildcard_router.rules]
+    measured: set[str] = set()
+    for _, _, path, _, _ in ROUTE_REQUESTS:
+        path = path.format(job='0' * 32).split('?')[0]
+        measured.update(pattern for pattern in patterns if re.match(pattern, path))
+    missing: list[str] = [pattern for pattern in patterns if pattern not in measured]
+    if missing:
+        raise SystemExit(f"Routes without a benchmark request: {', '.join(missing)}")
+
+    sock, port = tornado.testing.bind_unused_port()
+    server = tornado.httpserver.HTTPServer(app)
+    server.add_sockets([sock])
+    client = tornado.httpclient.AsyncHTTPClient()
+
+    results: list[dict[str, Any]] = []
+    job: str = ''
+    try:
+        for name, method, path, headers, body in ROUTE_REQUESTS:
+            path = path.format(job=job)
+            connection: Optional[tornado.websocket.WebSocketClientConnection] = None
+            if method == 'WS':
+                connection = await tornado.websocket.websocket_connect(f'ws://127.0.0.1:{port}{path}')
+
+                async def send() -> Any:
+                    await connection.write_message(body)
+                    return await connection.read_message()
+            else:
+                def send() -> Awaitable:
+                    return client.fetch(f'http://127.0.0.1:{port}{path}', method=method, headers=headers, body=body)
+
+            response: Any = await send()  # warm-up: caches, registry, quadgrams
+            if name == 'jobs':
+                job = response.headers['Location'].rsplit('/', 1)[1]
+                while app.settings['jobs'].get(job).status != 'done':
+                    await asyncio.sleep(0.001)
+            latencies: list[float] = []
+            count: int = requests if not name.startswith('crack_') else max(1, requests // 20)
+            for _ in range(count):
+                start: float = time.perf_counter()
+                await send()
+                latencies.append(time.perf_counter() - start)
+            if connection is not None:
+                connection.close()
+            latencies.sort()
+            result: dict[str, Any] = {
+                'name': f'http/{name}',
+                'seconds': statistics.median(latencies),
+                'mean': statistics.fmean(latencies),
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'requests_per_s': len(latencies) / sum(latencies),
+                'calls': len(latencies),
+            }
+            results.append(result)
+            print(f"{result['name']:<48} {result['seconds'] * 1e6:>14.2f} us {result['requests_per_s']:>10.1f} req/s", file=sys.stderr)
+    finally:
+        client.close()
+        server.stop()
+        await server.close_all_connections()
+        app.settings['executor'].shutdown()
+    return results
+
+
+def run_http(requests: int) -> list[dict[str, Any]]:
+    return asyncio.run(_run_http(requests))
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """
+    This function compares two results files.
+
+    :argument: baseline (dict) results of the reference run
+    :argument: current (dict) results of the run to check
+    :argument: threshold (float) relative slow-down above which a measure is a regression, e.g. 0.1 for 10%
+    :return: (list) the regressions, worst first
+    """
+    reference: dict[str, float] = {result['name']: result['seconds'] for result in baseline['results']}
+    regressions: list[dict[str, Any]] = []
+    for result in current['results']:
+        if result['name'] not in reference:
+            continue
+        change: float = result['seconds'] / reference[result['name']] - 1
+        status: str = 'REGRESSION' if change > threshold else 'improved' if change < -threshold else 'ok'
+        print(f"{result['name']:<48} {reference[result['name']] * 1e6:>14.2f} us {result['seconds'] * 1e6:>14.2f} us "
+              f"{change:>+8.1%}  {status}")
+        if change > threshold:
+            regressions.append({'name': result['name'], 'baseline': reference[result['name']],
+                                'seconds': result['seconds'], 'change': change})
+    return sorted(regressions, key=lambda regression: regression['change'], reverse=True)
+
+
+def _compare_files(baseline_path: str, current: dict[str, Any], threshold: float) -> int:
+    with open(baseline_path) as file:
+        baseline: dict[str, Any] = json.load(file)
+    regressions: list[dict[str, Any]] = compare(baseline, current, threshold)
+    print(f'{len(regressions)} regression(s) above {threshold:.0%}')
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='input sizes in bytes')
+    run_parser.add_argument('--mixes', nargs='+', choices=list(MIXES), default=list(MIXES), help='alphabet mixes')
+    run_parser.add_argument('--repeat', type=int, default=REPEAT, help='number of runs per measure (best is kept)')
+    run_parser.add_argument('--min-time', type=float, default=MIN_TIME, help='minimum duration of a run in seconds')
+    run_parser.add_argument('--requests', type=int, default=HTTP_REQUESTS, help='HTTP requests per route')
+    run_parser.add_argument('--no-ciphers', action='store_true', help='skip the cipher benchmarks')
+    run_parser.add_argument('--no-http', action='store_true', help='skip the HTTP benchmarks')
+    run_parser.add_argument('--output', help='JSON results file (standard output by default)')
+    run_parser.add_argument('--baseline', help='JSON results file to compare the run with')
+    run_parser.add_argument('--threshold', type=float, default=THRESHOLD, help='regression threshold, e.g. 0.1')
+
+    compare_parser = commands.add_parser('compare', help='compare a results file with a baseline')
+    compare_parser.add_argument('baseline', help='JSON results file of the reference run')
+    compare_parser.add_argument('current', help='JSON results file of the run to check')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD, help='regression threshold, e.g. 0.1')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.current) as file:
+            return _compare_files(args.baseline, json.load(file), args.threshold)
+
+    results: list[dict[str, Any]] = []
+    if not args.no_ciphers:
+        results += run_ciphers(args.sizes, args.mixes, args.repeat, args.min_time)
+    if not args.no_http:
+        results += run_http(args.requests)
+
+    report: dict[str, Any] = {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'cpus': os.cpu_count(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return _compare_files(args.baseline, report, args.threshold) if args.baseline else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
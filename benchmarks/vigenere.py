@@ -0,0 +1,83 @@
+"""
+Vigenere cipher microbenchmark.
+
+Compares a per-character Vigenere loop with VigenereCipher, which translates the letters of a same key position at \
+once with a Caesar table, or with NumPy when it is installed (see VIGENERE_NUMPY_THRESHOLD).
+
+Usage (from the repository root):
+
+    python benchmarks/vigenere.py
+    python benchmarks/vigenere.py --sizes 1048576 --key CRYPTOGRAPHY --repeat 5
+    python benchmarks/vigenere.py --letters-only
+"""
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cryptools'))
+
+from src import cryptools  # noqa: E402
+from src.cryptools import VigenereCipher  # noqa: E402
+
+
+SIZES: list[int] = [1024 ** 2, 100 * 1024 ** 2]
+SAMPLE: str = 'This message shall remain private, 42 times! '
+
+
+def naive_process(text: str, key: str) -> str:
+    """Per-character implementation, kept here as the comparison baseline."""
+    shifts: list[int] = [ord(letter) - ord('A') for letter in key.upper()]
+    processed_text: list[str] = []
+    position: int = 0
+
+    for char in text.upper():
+        if 'A' <= char <= 'Z':
+            processed_text.append(chr((ord(char) - ord('A') + shifts[position % len(shifts)]) % 26 + ord('A')))
+            position += 1
+        else:
+            processed_text.append(char)
+
+    return ''.join(processed_text)
+
+
+def best_of(func, repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='input sizes in bytes')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measure (best is kept)')
+    parser.add_argument('--key', default='LEMON')
+    parser.add_argument('--letters-only', action='store_true', help='benchmark a text without any non-letter')
+    args = parser.parse_args()
+
+    cipher = VigenereCipher(args.key)
+
+    print(
+        f"{'size':>12} {'naive (s)':>12} {'table (s)':>12} {'numpy (s)':>12} {'bytes (s)':>12} {'speed-up':>10}"
+    )
+    for size in args.sizes:
+        sample: str = ''.join(filter(str.isalpha, SAMPLE)) if args.letters_only else SAMPLE
+        text: str = (sample * (size // len(sample) + 1))[:size]
+        data: bytes = text.encode()
+        naive: float = best_of(lambda: naive_process(text, args.key), args.repeat)
+        with mock.patch.object(cryptools, 'np', None):
+            table: float = best_of(lambda: cipher._process(text, decode=False), args.repeat)
+        vectorized: float = best_of(lambda: cipher._process(text, decode=False), args.repeat)
+        raw: float = best_of(lambda: cipher._process_bytes(data, decode=False), args.repeat)
+        print(
+            f'{size:>12} {naive:>12.4f} {table:>12.4f} {vectorized:>12.4f} {raw:>12.4f} '
+            f'{naive / min(table, vectorized):>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Command-line bulk file encoder.
+
+Encrypts or decrypts a file, or a pipe, with one of the cryptools ciphers:
+
+    python -m cryptools caesar --key 3 --encrypt export.log export.masked.log
+    python -m cryptools affine --keys 5 7 --decrypt < export.masked.log > export.log
+    python -m cryptools caesar --key 3 --preserve-case --encrypt export.log export.masked.log
+
+Regular files are memory-mapped and processed in fixed-size windows, the output file being preallocated and written \
+through its own mapping. Pipes are read and written window by window. Either way, memory usage does not depend on the \
+input size. The throughput is reported on the standard error.
+"""
+import argparse
+import mmap
+import os
+import sys
+import time
+from typing import BinaryIO, Optional
+
+from .src.cryptools import ALPHABETS, Cipher
+from .src.registry import default_registry
+
+
+WINDOW_SIZE: int = 16 * 1024 ** 2
+
+
+def _is_regular_file(path: str) -> bool:
+    return path != '-' and os.path.isfile(path)
+
+
+def _transform_files(cipher: Cipher, decode: bool, input_path: str, output_path: str, window_size: int) -> int:
+    """
+    This function ciphers a regular file into another one through memory mappings.
+
+    :return: (int)
+        The number of bytes processed.
+    """
+    size: int = os.path.getsize(input_path)
+
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        if size:
+            with open(input_path, 'r+b') as file, mmap.mmap(file.fileno(), size, access=mmap.ACCESS_WRITE) as buffer:
+                (cipher.decode_into if decode else cipher.encode_into)(buffer)
+        return size
+
+    transform = cipher.decode_bytes if decode else cipher.encode_bytes
+    with open(input_path, 'rb') as source, open(output_path, 'w+b') as destination:
+        destination.truncate(size)
+        if not size:
+            return size
+        with mmap.mmap(source.fileno(), size, access=mmap.ACCESS_READ) as input_buffer, \
+                mmap.mmap(destination.fileno(), size, access=mmap.ACCESS_WRITE) as output_buffer:
+            for start in range(0, size, window_size):
+                end: int = min(start + window_size, size)
+                output_buffer[start:end] = transform(input_buffer[start:end])
+            output_buffer.flush()
+
+    return size
+
+
+def _transform_stream(cipher: Cipher, decode: bool, source: BinaryIO, destination: BinaryIO, window_size: int) -> int:
+    """
+    This function ciphers a binary stream into another one, window by window.
+
+    :return: (int)
+        The number of bytes processed.
+    """
+    transform_into = cipher.decode_into if decode else cipher.encode_into
+    window: bytearray = bytearray(window_size)
+    view: memoryview = memoryview(window)
+    size: int = 0
+
+    while True:
+        length: int = source.readinto(window)
+        if not length:
+            break
+        transform_into(view[:length])
+        destination.write(view[:length])
+        size += length
+
+    destination.flush()
+    return size
+
+
+def _open(path: str, mode: str, default: BinaryIO) -> BinaryIO:
+    return default if path == '-' else open(path, mode)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m cryptools', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('cipher', choices=('atbash', 'caesar', 'affine'), help='cipher to use')
+    parser.add_argument('--key', type=int, help='caesar key')
+    parser.add_argument('--keys', type=int, nargs=2, metavar=('A', 'B'), help='affine keys')
+    direction = parser.add_mutually_exclusive_group(required=True)
+    direction.add_argument('--encrypt', action='store_true')
+    direction.add_argument('--decrypt', action='store_true')
+    parser.add_argument('input', nargs='?', default='-', help="input path, '-' for the standard input (default)")
+    parser.add_argument('output', nargs='?', default='-', help="output path, '-' for the standard output (default)")
+    parser.add_argument(
+        '--alphabet', default='uppercase',
+        help=f"alphabet: {', '.join(ALPHABETS)} or its ASCII letters in order (default uppercase)"
+    )
+    parser.add_argument('--preserve-case', action='store_true', help='keep the case of the letters')
+    parser.add_argument('--window', type=int, default=WINDOW_SIZE, help=f'window size in bytes (default {WINDOW_SIZE})')
+    parser.add_argument('--quiet', action='store_true', help='do not report the throughput')
+    return parser
+
+
+def _parse_args(parser: argparse.ArgumentParser, argv: Optional[list[str]]) -> argparse.Namespace:
+    args = parser.parse_intermixed_args(argv)
+
+    if args.cipher == 'caesar' and args.key is None:
+        parser.error('the caesar cipher requires --key')
+    if args.cipher == 'affine' and args.keys is None:
+        parser.error('the affine cipher requires --keys')
+    if args.window < 1:
+        parser.error('--window must be a positive integer')
+
+    try:
+        args.cipher = default_registry.get(
+            args.cipher, *{'caesar': [args.key], 'affine': args.keys}.get(args.cipher, []),
+            alphabet=args.alphabet, preserve_case=args.preserve_case,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not args.cipher.alphabet.isascii():
+        parser.error('--alphabet must be made of ASCII characters')
+
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser: argparse.ArgumentParser = _parser()
+    args = _parse_args(parser, argv)
+
+    start: float = time.perf_counter()
+
+    try:
+        if _is_regular_file(args.input) and args.output != '-':
+            size: int = _transform_files(args.cipher, args.decrypt, args.input, args.output, args.window)
+        else:
+            with _open(args.input, 'rb', sys.stdin.buffer) as source, \
+                    _open(args.output, 'wb', sys.stdout.buffer) as destination:
+                size = _transform_stream(args.cipher, args.decrypt, source, destination, args.window)
+    except OSError as exc:
+        parser.error(str(exc))
+
+    elapsed: float = time.perf_counter() - start
+
+    if not args.quiet:
+        megabytes: float = size / 1024 ** 2
+        print(f'{megabytes:.1f} MB in {elapsed:.3f} s ({megabytes / elapsed if elapsed else 0:.1f} MB/s)', file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,116 +1,1486 @@
+import argparse
+import asyncio
+import codecs
+from collections import deque
 from http import HTTPStatus
 import json
-from typing import Optional, Awaitable, Any
+import os
+import signal
+import sys
+from typing import Optional, Awaitable, Any, Union
 
+import tornado.escape
+import tornado.httpserver
+import tornado.iostream
+import tornado.log
+import tornado.netutil
 import tornado.web
-import tornado.ioloop
+import tornado.websocket
 
-from src import cryptools
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from src import cryptanalysis
+from src.admission import AdmissionController, MAX_IN_FLIGHT, RETRY_AFTER
+from src.cache import ResponseCache, CACHE_SIZE, CACHE_MAX_TEXT
+from src.cryptools import Cipher
+from src.executor import CipherExecutor, OFFLOAD_THRESHOLD, OFFLOAD_WORKERS
+from src.jobs import Job, JobStore, JOB_WORKERS, JOB_MAX_PENDING, JOB_TTL, JOB_STORE_SIZE, JOB_WINDOW
+from src.metrics import Metrics, PhaseTimer
+from src.profiling import Profile, Profiler, PROFILE_HEADER, PROFILE_KEEP, PROFILE_MODES, SUMMARY_HEADER
+from src.registry import default_registry
 
 
 PORT = 5000
+ADDRESS = ''
+SHUTDOWN_TIMEOUT: float = 10.0
+
+MAX_BODY_SIZE: int = 64 * 1024 ** 2
+STREAM_MAX_BODY_SIZE: int = 16 * 1024 ** 3
+# route name: maximum request body size in bytes, the other routes being bounded by MAX_BODY_SIZE
+# (the jobs limit only applies to octet-stream bodies, JSON and msgpack ones being parsed on the event loop)
+BODY_LIMITS: dict[str, int] = {
+    'crack': 16 * 1024 ** 2,
+    'crack_substitution': 1024 ** 2,
+    'jobs': 1024 ** 3,
+    'stream': STREAM_MAX_BODY_SIZE,
+}
+STREAM_CONTENT_TYPES: tuple[str, ...] = ('text/plain', 'application/octet-stream')
+WEBSOCKET_MAX_PENDING: int = 64
+WEBSOCKET_MAX_MESSAGE_SIZE: int = 16 * 1024 ** 2
+
+HAS_MSGPACK: bool = msgpack is not None
+
+# media type: body format
+MEDIA_TYPES: dict[str, str] = {
+    'application/json': 'json',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/octet-stream': 'octet-stream',
+}
+CONTENT_TYPES: dict[str, str] = {
+    'json': 'application/json; charset=UTF-8',
+    'msgpack': 'application/msgpack',
+    'octet-stream': 'application/octet-stream',
+}
+
+CIPHER_ARGS: dict[str, dict[str, type]] = {
+    'atbash': {},
+    'caesar': {'key': int},
+    'affine': {'keys': list},
+    'substitution': {'key': str},
+    'vigenere': {'key': str},
+}
+# list argument: (item type, number of items)
+LIST_ARGS: dict[str, tuple[type, int]] = {
+    'keys': (int, 2),
+}
+
+
+def _validate_args(body: Any, required_args: dict[str, type]) -> str:
+    """This function returns the validation error of a request body, or an empty string if the body is valid."""
+    if not isinstance(body, dict) or not all(arg in body for arg in required_args.keys()):
+        return 'Missing body argument'
+    for arg_name, arg_type in required_args.items():
+        if not isinstance(body[arg_name], arg_type):
+            return f"Invalid type for body argument '{arg_name}'"
+        if arg_name in LIST_ARGS:
+            item_type, length = LIST_ARGS[arg_name]
+            if len(body[arg_name]) != length:
+                return f"Invalid length for body argument '{arg_name}'"
+            if not all(isinstance(item, item_type) for item in body[arg_name]):
+                return f"Invalid type for body argument '{arg_name}'"
+    return ''
+
+
+def _negotiate(accept: str, default: str) -> str:
+    """
+    This function returns the response format matching an Accept header.
+
+    The supported media type with the highest quality is picked, the first one listed on ties. Wildcards, media types \
+    the server does not support (e.g. msgpack when it is not installed) and an empty header leave the default format.
+
+    :argument: accept (str) the Accept header value
+    :argument: default (str) the format used when no supported media type is accepted, i.e. the request body format
+    :return: (str) the response format: json, msgpack or octet-stream
+    """
+    best, best_quality = default, 0.0
+    for media_range in accept.split(','):
+        media_type, *params = media_range.split(';')
+        body_format: Optional[str] = MEDIA_TYPES.get(media_type.strip().lower())
+        if body_format is None or (body_format == 'msgpack' and not HAS_MSGPACK):
+            continue
+        quality: float = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > best_quality:
+            best, best_quality = body_format, quality
+    return best
+
+
+def _parameter(handler: tornado.web.RequestHandler, name: str, arg_type: type, required: bool = True) -> Any:
+    """
+    This function returns a request parameter given out of the body.
+
+    The parameter is read from the query arguments, or else from the `X-Cipher-<Name>` header (e.g. \
+    X-Cipher-Key). Booleans are `true` or `false`, lists are integers given comma-separated or repeated.
+
+    :argument: handler (RequestHandler) the request handler
+    :argument: name (str) the parameter name
+    :argument: arg_type (type) the parameter type: bool, int, str or list
+    :argument: required (bool) whether a missing parameter is an error, rather than None
+    :return: (Any) the parameter value
+    """
+    values: list[str] = handler.get_query_arguments(name)
+    if not values and f'X-Cipher-{name}' in handler.request.headers:
+        values = [handler.request.headers[f'X-Cipher-{name}']]
+    if arg_type is list:
+        values = [value for arg in values for value in arg.split(',') if value]
+    if not values:
+        if not required:
+            return None
+        raise ValueError('Missing query argument')
+    try:
+        if arg_type is list:
+            return [int(value) for value in values]
+        if arg_type is bool:
+            if values[-1] not in ('true', 'false'):
+                raise ValueError(values[-1])
+            return values[-1] == 'true'
+        return arg_type(values[-1])
+    except ValueError:
+        raise ValueError(f"Invalid type for query argument '{name}'")
+
+
+def _parameter_keys(handler: tornado.web.RequestHandler, name: str) -> list[Any]:
+    """This function returns the key material of a cipher, as expected by the registry, from the request parameters."""
+    keys: list[Any] = []
+    for arg_name, arg_type in CIPHER_ARGS[name].items():
+        if arg_type is list:
+            keys.extend(_parameter(handler, arg_name, list))
+        else:
+            keys.append(_parameter(handler, arg_name, arg_type))
+    return keys
+
+
+def _cipher_keys(name: str, body: dict) -> tuple:
+    """This function returns the key material of a cipher, as expected by the registry, from a validated body."""
+    keys: list = []
+    for arg_name in CIPHER_ARGS[name]:
+        if isinstance(body[arg_name], list):
+            keys.extend(body[arg_name])
+        else:
+            keys.append(body[arg_name])
+    return tuple(keys)
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    """
+    This is the parent request handler class.
+
+    It keeps track of the number of requests being processed, so that the server can wait for them on shutdown.
+
+    Each finished request is reported to the application metrics, with the duration of its phases (see _phase), the \
+    body bytes read and written and its error kind: the exception type for unexpected errors, the status otherwise. \
+    Requests are labelled with the fixed route name of their handler, never with their path, so that paths holding \
+    ids (e.g. /jobs/<id>) do not each add their own series.
+
+    Handlers reading a body admit their requests with _admit, before the body is read.
+
+    When the application has a profiler, requests asking for it or sampled are profiled from prepare() to finish() \
+    (see src/profiling.py), the summary of the profile being sent as the X-Profile-Summary header when possible.
+    """
+    in_flight: int = 0
+    route: str = ''
+
+    def initialize(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.error_kind: Optional[str] = None
+        self.bytes_in: int = 0
+        self._bytes_out: int = 0
+        self._admitted: Optional[str] = None
+        self._profile: Optional[Profile] = None
+
+    def prepare(self) -> Optional[Awaitable[None]]:
+        BaseHandler.in_flight += 1
+        self._in_flight: bool = True
+        self.settings['metrics'].monitor(asyncio.get_running_loop())
+        profiler: Optional[Profiler] = self.settings['profiler']
+        if profiler is not None:
+            self._profile = profiler.start(self.request.headers.get(PROFILE_HEADER))
+        return None
+
+    def finish(self, chunk: Any = None) -> Awaitable[None]:
+        if self._profile is not None:
+            if chunk is not None:
+                self.write(chunk)
+                chunk = None
+            self._stop_profile()
+        return super().finish(chunk)
+
+    def _stop_profile(self) -> None:
+        profile, self._profile = self._profile, None
+        self.settings['profiler'].stop(profile, self.request.path, self.request.method, self.get_status(), self.phases)
+        if not self._headers_written:
+            self.set_header(SUMMARY_HEADER, profile.summary())
+
+    def _reject(self, status: HTTPStatus, error: str) -> None:
+        self.set_status(status)
+        self.finish({'error': error})
+
+    def _admit(self, cipher: str) -> bool:
+        """
+        This method admits the request, or rejects it right away, from its headers only.
+
+        A request whose Content-Length exceeds the body limit of its route is rejected with a 413, a request over the \
+        in-flight bounds of the admission controller (see AdmissionController) with a 429 and a Retry-After header. \
+        An admitted request holds its in-flight slot until it is finished, and its body is bounded by the route limit \
+        whether it has a Content-Length or not.
+
+        This must be called from prepare() of a handler streaming its body (see tornado.web.stream_request_body): the \
+        others read the whole body before prepare() is called.
 
+        :argument: cipher (str) the cipher name the in-flight bounds apply to
+        :return: (bool) whether the request is admitted; if not, it is finished
+        """
+        limit: int = self._body_limit()
+        content_length: str = self.request.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > limit:
+            self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f'Request body larger than {limit} bytes')
+            return False
+
+        admission: AdmissionController = self.settings['admission']
+        if not admission.acquire(cipher):
+            self.set_header('Retry-After', str(admission.retry_after))
+            self._reject(HTTPStatus.TOO_MANY_REQUESTS, 'Too many requests')
+            return False
+        self._admitted = cipher
+        self.request.connection.set_max_body_size(limit)
+        return True
+
+    def _body_limit(self) -> int:
+        """This method returns the maximum body size of the request, in bytes."""
+        return self.settings['body_limits'].get(self.route, MAX_BODY_SIZE)
+
+    def _phase(self, name: str) -> PhaseTimer:
+        """This method times the enclosed block as a phase of the request: the durations of a phase add up."""
+        return PhaseTimer(self.phases, name)
+
+    def write(self, chunk: Any) -> None:
+        with self._phase('serialize'):
+            super().write(self._serialize(chunk) if isinstance(chunk, dict) else chunk)
+
+    def _serialize(self, payload: dict) -> Union[dict, bytes]:
+        """This method encodes a response payload: dictionaries are left to tornado, which writes them as JSON."""
+        return payload
+
+    def flush(self, include_footers: bool = False) -> Awaitable[None]:
+        self._bytes_out += sum(map(len, self._write_buffer))
+        return super().flush(include_footers)
+
+    def _write_unexpected_error(self, exc: Exception) -> None:
+        tornado.log.app_log.error('Unexpected error in %s', self.request.path, exc_info=exc)
+        self.error_kind = type(exc).__name__
+        self.set_status(HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.write({'error': 'Unexpected error'})
+
+    def on_finish(self) -> None:
+        if self._profile is not None:
+            self._stop_profile()
+        if self._admitted is not None:
+            self.settings['admission'].release(self._admitted)
+            self._admitted = None
+        if getattr(self, '_in_flight', False):
+            BaseHandler.in_flight -= 1
+            self._in_flight = False
+
+            status: int = self.get_status()
+            if self.error_kind is None and status >= 400:
+                self.error_kind = HTTPStatus(status).name.lower()
+            self.settings['metrics'].observe_request(
+                self.route,
+                status,
+                self.request.request_time(),
+                self.phases,
+                self.bytes_in or len(self.request.body),
+                self._bytes_out,
+                self.error_kind,
+            )
+
+    def on_connection_close(self) -> None:
+        super().on_connection_close()
+        self.error_kind = self.error_kind or 'connection_closed'
+        self.on_finish()
+
+
+@tornado.web.stream_request_body
+class BaseCipherHandler(BaseHandler):
+    """
+    This is the parent class of the handlers taking their parameters out of the request body.
+
+    The body format is given by the Content-Type header: `application/json` (the default, also used for missing or \
+    unknown types), `application/msgpack` when msgpack is installed, or `application/octet-stream`. An octet-stream \
+    body is the raw UTF-8 text itself, the other parameters being given as query arguments or `X-Cipher-<Name>` \
+    headers (see _parameter), so that a large text is neither escaped nor parsed.
+
+    The response format is negotiated from the Accept header (see _negotiate) and defaults to the body format. An \
+    octet-stream response is the raw output text; errors and other payloads are still written as JSON.
+
+    The body is received in chunks, so that requests can be admitted (see _admit) before it is read.
+    """
+    required_args: dict[str, type] = {'text': str, 'encrypt': bool}
+    optional_args: dict[str, type] = {}
+    body_formats: tuple[str, ...] = ('json', 'msgpack', 'octet-stream')
+
+    def initialize(self) -> None:
+        super().initialize()
+        self.body_format: str = 'json'
+        self.response_format: str = 'json'
+        self._chunks: list[bytes] = []
+
+    def prepare(self) -> Optional[Awaitable[None]]:
+        super().prepare()
+        if not self._admit(self.route):
+            return None
+        content_type: str = self.request.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        body_format: str = MEDIA_TYPES.get(content_type, 'json')
+        if body_format not in self.body_formats or (body_format == 'msgpack' and not HAS_MSGPACK):
+            self.set_status(HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+            self.finish({'error': f"Unsupported content type '{content_type}'"})
+            return None
+        self.body_format = body_format
+        self.response_format = _negotiate(self.request.headers.get('Accept', ''), body_format)
+        return None
 
-class BaseCipherHandler(tornado.web.RequestHandler):
     def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
-        pass
+        self.bytes_in += len(chunk)
+        self._chunks.append(chunk)
+        return None
 
-    def _validate_post(self, expected_args: dict[str, Any] = None) -> None:
-        is_valid: bool = True
-        error: str = ''
+    def _serialize(self, payload: dict) -> bytes:
+        """
+        This method encodes a response payload in the negotiated format and sets the matching Content-Type.
+
+        :argument: payload (dict) the response payload
+        :return: (bytes) the response body
+        """
+        response_format: str = self.response_format
+        if response_format == 'octet-stream' and payload.keys() != {'text'}:
+            response_format = 'json'
+        self.set_header('Content-Type', CONTENT_TYPES[response_format])
+        if response_format == 'msgpack':
+            return msgpack.packb(payload, unicode_errors='surrogatepass')
+        if response_format == 'octet-stream':
+            try:
+                # restores the undecodable bytes of an octet-stream body
+                return payload['text'].encode('utf-8', errors='surrogateescape')
+            except UnicodeEncodeError:
+                return payload['text'].encode('utf-8', errors='surrogatepass')
+        return tornado.escape.json_encode(payload).encode()
 
-        required_args = {'text': str, 'encrypt': bool}
+    def _decode_body(self, required_args: dict[str, type]) -> Any:
+        """This method returns the request body decoded from its format, raising ValueError if it is invalid."""
+        # the chunks are dropped once joined, so that the body is held once while it is decoded
+        body: bytes = b''.join(self._chunks)
+        self._chunks = []
+        if self.body_format == 'msgpack':
+            try:
+                return msgpack.unpackb(body, raw=False)
+            except (ValueError, TypeError, msgpack.UnpackException):
+                raise ValueError('Invalid msgpack body')
+        if self.body_format == 'octet-stream':
+            args: dict[str, Any] = {'text': body.decode('utf-8', errors='surrogateescape')}
+            for arg_name, arg_type in required_args.items():
+                if arg_name != 'text':
+                    args[arg_name] = _parameter(self, arg_name, arg_type)
+            for arg_name, arg_type in self.optional_args.items():
+                value: Any = _parameter(self, arg_name, arg_type, required=False)
+                if value is not None:
+                    args[arg_name] = value
+            return args
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise ValueError('Invalid JSON body')
+
+    def _validate_post(self, expected_args: dict[str, Any] = None) -> None:
+        required_args = dict(self.required_args)
         if expected_args:
             required_args.update(expected_args)
 
-        body: dict = json.loads(self.request.body)
+        with self._phase('parse'):
+            try:
+                self.body: Any = self._decode_body(required_args)
+            except ValueError as exc:
+                self.body = None
+                self.is_valid, self.error = False, str(exc)
+                return
 
-        if not all(arg in body for arg in required_args.keys()):
-            is_valid, error = False, 'Missing body argument'
-        else:
-            for arg_name, arg_type in required_args.items():
-                if not isinstance(body[arg_name], arg_type):
-                    is_valid, error = False, f"Invalid type for body argument '{arg_name}'"
-                    break
+            self.error: str = _validate_args(self.body, required_args)
+            for arg_name, arg_type in self.optional_args.items():
+                if not self.error and arg_name in self.body and not isinstance(self.body[arg_name], arg_type):
+                    self.error = f"Invalid type for body argument '{arg_name}'"
+            self.is_valid: bool = not self.error
+
+    async def _process(self, cipher: Cipher, text: str, encrypt: bool) -> str:
+        with self._phase('cipher'):
+            return await self.settings['executor'].run(cipher, text, decode=not encrypt)
+
+    async def _write_text(self, entry: tuple, cipher: Cipher, text: str, encrypt: bool) -> None:
+        """
+        This method ciphers the input text and writes the `{"text": ...}` response.
 
-        self.is_valid, self.error = is_valid, error
+        When the response cache is enabled and the text is short enough, the serialized response is looked up by \
+        content first (see ResponseCache) and its digest is sent as the ETag: a request whose If-None-Match matches \
+        it gets a 304 Not Modified, without the text being ciphered nor the response sent again.
+
+        :argument: entry (tuple) the cipher name and keys, as given to the registry
+        :argument: cipher (Cipher) the cipher instance
+        :argument: text (str) the text to process
+        :argument: encrypt (bool) whether the text is enciphered
+        """
+        cache: Optional[ResponseCache] = self.settings['cache']
+        if cache is None or not cache.accepts(text):
+            self.write({'text': await self._process(cipher, text, encrypt)})
+            return
+
+        key: bytes = cache.key(entry, not encrypt, text, self.response_format)
+        self.set_header('Etag', f'"{key.hex()}"')
+        self.set_header('Vary', 'Accept, Content-Type')
+        if self.check_etag_header():
+            self.set_status(HTTPStatus.NOT_MODIFIED)
+            return
+
+        response: Optional[bytes] = cache.get(key)
+        if response is None:
+            processed: str = await self._process(cipher, text, encrypt)
+            with self._phase('serialize'):
+                response = self._serialize({'text': processed})
+            cache.put(key, response)
+        else:
+            self.set_header('Content-Type', CONTENT_TYPES[self.response_format])
+        self.write(response)
 
 
 class AtbashCipherHandler(BaseCipherHandler):
+    route: str = 'atbash'
+
     async def post(self):
-        self._validate_post()
+        self._validate_post(CIPHER_ARGS['atbash'])
 
         if self.is_valid:
-            req_body: dict = json.loads(self.request.body)
             try:
-                if req_body['encrypt']:
-                    text = await cryptools.AtbashCipher().encode(req_body['text'])
-                else:
-                    text = await cryptools.AtbashCipher().decode(req_body['text'])
-                self.write({'text': text})
-            except Exception:
-                self.set_status(HTTPStatus.INTERNAL_SERVER_ERROR)
-                self.write({'error': 'Unexpected error'})
+                entry: tuple = ('atbash',)
+                cipher = default_registry.get(*entry)
+                await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+            except Exception as exc:
+                self._write_unexpected_error(exc)
         else:
             self.set_status(HTTPStatus.BAD_REQUEST)
             self.write({'error': self.error})
 
 
 class CaesarCipherHandler(BaseCipherHandler):
+    route: str = 'caesar'
+
     async def post(self):
-        self._validate_post({'key': int})
+        self._validate_post(CIPHER_ARGS['caesar'])
 
         if self.is_valid:
-            req_body: dict = json.loads(self.request.body)
             try:
-                if req_body['encrypt']:
-                    text = await cryptools.CaesarCipher(req_body['key']).encode(req_body['text'])
-                else:
-                    text = await cryptools.CaesarCipher(req_body['key']).decode(req_body['text'])
-                self.write({'text': text})
-            except Exception:
-                self.set_status(HTTPStatus.INTERNAL_SERVER_ERROR)
-                self.write({'error': 'Unexpected error'})
+                entry: tuple = ('caesar', self.body['key'])
+                cipher = default_registry.get(*entry)
+                await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+            except Exception as exc:
+                self._write_unexpected_error(exc)
         else:
             self.set_status(HTTPStatus.BAD_REQUEST)
             self.write({'error': self.error})
 
 
 class AffineCipherHandler(BaseCipherHandler):
+    route: str = 'affine'
+
     async def post(self):
-        self._validate_post({'keys': list})
+        self._validate_post(CIPHER_ARGS['affine'])
 
         if self.is_valid:
-            req_body: dict = json.loads(self.request.body)
             try:
-                if req_body['encrypt']:
-                    text = await cryptools.AffineCipher(*req_body['keys']).encode(req_body['text'])
-                else:
-                    text = await cryptools.AffineCipher(*req_body['keys']).decode(req_body['text'])
-                self.write({'text': text})
+                entry: tuple = ('affine', *self.body['keys'])
+                cipher = default_registry.get(*entry)
+            except (TypeError, ValueError) as exc:
+                self.set_status(HTTPStatus.BAD_REQUEST)
+                self.write({'error': str(exc) if isinstance(exc, ValueError) else 'Invalid cipher keys'})
+                return
+            try:
+                await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+            except Exception as exc:
+                self._write_unexpected_error(exc)
+        else:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+
+
+class SubstitutionCipherHandler(BaseCipherHandler):
+    route: str = 'substitution'
+
+    async def post(self):
+        self._validate_post(CIPHER_ARGS['substitution'])
+
+        if self.is_valid:
+            try:
+                entry: tuple = ('substitution', self.body['key'])
+                cipher = default_registry.get(*entry)
+            except ValueError as exc:
+                self.set_status(HTTPStatus.BAD_REQUEST)
+                self.write({'error': str(exc)})
+                return
+            try:
+                await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+            except Exception as exc:
+                self._write_unexpected_error(exc)
+        else:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+
+
+class VigenereCipherHandler(BaseCipherHandler):
+    route: str = 'vigenere'
+
+    async def post(self):
+        self._validate_post(CIPHER_ARGS['vigenere'])
+
+        if self.is_valid:
+            try:
+                entry: tuple = ('vigenere', self.body['key'])
+                cipher = default_registry.get(*entry)
+            except ValueError as exc:
+                self.set_status(HTTPStatus.BAD_REQUEST)
+                self.write({'error': str(exc)})
+                return
+            try:
+                await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+            except Exception as exc:
+                self._write_unexpected_error(exc)
+        else:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+
+
+class PipelineCipherHandler(BaseCipherHandler):
+    """
+    Pipeline request handler.
+
+    The body holds the usual parameters plus the list of stages the text goes through, each stage being a cipher name \
+    and its keys:
+
+        {"text": "abc", "encrypt": true, "stages": [{"cipher": "caesar", "key": 3}, {"cipher": "atbash"}]}
+
+    The stages are composed into a single substitution, so the text is processed in one pass whatever their number.
+    """
+    route: str = 'pipeline'
+    body_formats: tuple[str, ...] = ('json', 'msgpack')
+
+    async def post(self):
+        self._validate_post({'stages': list})
+
+        if self.is_valid:
+            stages: list[tuple] = []
+            for stage in self.body['stages']:
+                error: str = _validate_args(stage, {'cipher': str})
+                if not error and stage['cipher'] not in CIPHER_ARGS:
+                    error = f"Unknown cipher '{stage['cipher']}'"
+                if not error:
+                    error = _validate_args(stage, CIPHER_ARGS[stage['cipher']])
+                if error:
+                    self.is_valid, self.error = False, error
+                    break
+                stages.append((stage['cipher'], *_cipher_keys(stage['cipher'], stage)))
+
+        if not self.is_valid:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+            return
+
+        entry: tuple = ('pipeline', *stages)
+        try:
+            cipher = default_registry.get(*entry)
+        except (TypeError, ValueError) as exc:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': str(exc) if isinstance(exc, ValueError) else 'Invalid cipher keys'})
+            return
+
+        try:
+            await self._write_text(entry, cipher, self.body['text'], self.body['encrypt'])
+        except Exception as exc:
+            self._write_unexpected_error(exc)
+
+
+class BatchCipherHandler(BaseCipherHandler):
+    """
+    Batch request handler.
+
+    The body holds a list of items, each item being a single cipher request plus the name of its cipher:
+
+        {"items": [{"cipher": "caesar", "key": 3, "encrypt": true, "text": "abc"}, ...]}
+
+    Items are grouped by (cipher, keys, direction): each cipher is fetched once per batch and the texts of a group are \
+    ciphered in a single call (see Cipher.encode_many). Results are returned in the items order, each result holding \
+    either the output text or the error of its item.
+    """
+    route: str = 'batch'
+    required_args: dict[str, type] = {'items': list}
+    body_formats: tuple[str, ...] = ('json', 'msgpack')
+
+    async def post(self):
+        self._validate_post()
+
+        if not self.is_valid:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+            return
+
+        items: list = self.body['items']
+        results: list[dict[str, str]] = [{}] * len(items)
+        groups: dict[tuple[tuple, bool], list[int]] = {}
+
+        for index, item in enumerate(items):
+            error: str = _validate_args(item, {'cipher': str})
+            if not error and item['cipher'] not in CIPHER_ARGS:
+                error = f"Unknown cipher '{item['cipher']}'"
+            if not error:
+                error = _validate_args(item, {**BaseCipherHandler.required_args, **CIPHER_ARGS[item['cipher']]})
+            if error:
+                results[index] = {'error': error}
+                continue
+            try:
+                entry: tuple = (item['cipher'], *_cipher_keys(item['cipher'], item))
+                groups.setdefault((entry, item['encrypt']), []).append(index)
+            except TypeError:
+                results[index] = {'error': 'Invalid cipher keys'}
+
+        for (entry, encrypt), indexes in groups.items():
+            try:
+                cipher = default_registry.get(*entry)
+            except ValueError as exc:
+                for index in indexes:
+                    results[index] = {'error': str(exc)}
+                continue
+            except TypeError:
+                # e.g. a wrong number of affine keys
+                for index in indexes:
+                    results[index] = {'error': 'Invalid cipher keys'}
+                continue
             except Exception as exc:
-                self.set_status(HTTPStatus.INTERNAL_SERVER_ERROR)
-                self.write({'error': 'Unexpected error'})
+                tornado.log.app_log.error('Unexpected error in %s', self.request.path, exc_info=exc)
+                for index in indexes:
+                    results[index] = {'error': 'Unexpected error'}
+                continue
+
+            try:
+                with self._phase('cipher'):
+                    texts: list[str] = await self.settings['executor'].run_many(
+                        cipher, [items[index]['text'] for index in indexes], decode=not encrypt
+                    )
+            except Exception as exc:
+                tornado.log.app_log.error('Unexpected error in %s', self.request.path, exc_info=exc)
+                for index in indexes:
+                    results[index] = {'error': 'Unexpected error'}
+                continue
+            for index, text in zip(indexes, texts):
+                results[index] = {'text': text}
+
+        self.write({'results': results})
+
+
+@tornado.web.stream_request_body
+class CipherStreamHandler(BaseHandler):
+    """
+    Streaming request handler.
+
+    The body is the raw text to encrypt or decrypt (`text/plain` or `application/octet-stream`), the direction and keys \
+    are given as query arguments:
+
+        POST /cipher/caesar/stream/?encrypt=true&key=3
+        POST /cipher/affine/stream/?encrypt=false&keys=5,7
+        POST /cipher/vigenere/stream/?encrypt=true&key=LEMON
+
+    Each body chunk is transformed as soon as it is received and flushed back to the client (chunked transfer \
+    encoding), so that memory usage does not depend on the body size. The chunks go through a cipher stream, which \
+    carries the key position of the Vigenere cipher from a chunk to the next one.
+
+    A `text/plain` body is decoded as UTF-8 (invalid bytes are passed through untouched), an \
+    `application/octet-stream` body is translated as raw bytes: only ASCII letters are ciphered.
+    """
+    route: str = 'stream'
+
+    def prepare(self) -> None:
+        super().prepare()
+        if not self._admit(self.path_args[0]):
+            return
+
+        content_type: str = self.request.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in STREAM_CONTENT_TYPES:
+            self._reject(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported content type '{content_type}'")
+            return
+
+        name: str = self.path_args[0]
+        try:
+            encrypt: bool = _parameter(self, 'encrypt', bool)
+            keys: list[Any] = _parameter_keys(self, name)
+        except ValueError as exc:
+            self._reject(HTTPStatus.BAD_REQUEST, str(exc))
+            return
+
+        try:
+            self._cipher = default_registry.get(name, *keys)
+        except (TypeError, ValueError) as exc:
+            self._reject(HTTPStatus.BAD_REQUEST, str(exc) if isinstance(exc, ValueError) else 'Invalid cipher keys')
+            return
+
+        decode: bool = not encrypt
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+        if content_type == 'text/plain':
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape')
+            self._stream = self._cipher._stream(decode)
+            self.set_header('Content-Type', 'text/plain; charset=UTF-8')
         else:
+            self._stream = self._cipher._stream_bytes(decode)
+            self.set_header('Content-Type', 'application/octet-stream')
+
+    def _transform(self, chunk: bytes, final: bool = False) -> bytes:
+        with self._phase('cipher'):
+            if self._decoder is None:
+                return self._stream(chunk)
+            text: str = self._stream(self._decoder.decode(chunk, final))
+            return text.encode('utf-8', errors='surrogateescape')
+
+    async def data_received(self, chunk: bytes) -> None:
+        self.bytes_in += len(chunk)
+        self.write(self._transform(chunk))
+        await self.flush()
+
+    def post(self, name: str) -> None:
+        self.finish(self._transform(b'', final=True))
+
+
+class CipherWebSocketHandler(tornado.websocket.WebSocketHandler):
+    """
+    WebSocket request handler.
+
+    The cipher, its keys and the direction are fixed once per connection, as query arguments (or `X-Cipher-<Name>` \
+    headers) of the upgrade request:
+
+        ws://localhost:5000/cipher/caesar/ws/?encrypt=true&key=3
+
+    Each message is then a text to encrypt or decrypt, and is answered with the output text, in the messages order: \
+    text messages get text replies, binary messages are translated as raw bytes (only ASCII letters are ciphered) and \
+    get binary replies. The cipher instance is held by the connection, so a message costs a single translation.
+
+    Replies are pipelined: the next message is read without waiting for the previous replies to be sent, up to \
+    `WEBSOCKET_MAX_PENDING` unsent replies. Past this, reading stops until the client catches up (backpressure).
+
+    Each connection is reported to the application metrics once closed, as a request with the 101 status.
+    """
+    route: str = 'websocket'
+    sessions: set['CipherWebSocketHandler'] = set()
+
+    def initialize(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.error_kind: Optional[str] = None
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+        self._pending: deque[Awaitable[None]] = deque()
+
+    def prepare(self) -> None:
+        name: str = self.path_args[0]
+        try:
+            encrypt: bool = _parameter(self, 'encrypt', bool)
+            self._cipher: Cipher = default_registry.get(name, *_parameter_keys(self, name))
+        except (TypeError, ValueError) as exc:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.finish({'error': str(exc) if isinstance(exc, ValueError) else 'Invalid cipher keys'})
+            return
+        self._decode: bool = not encrypt
+        self.settings['metrics'].monitor(asyncio.get_running_loop())
+
+    def open(self, name: str) -> None:
+        # replies are small and latency-bound: they are not held back by Nagle's algorithm
+        self.set_nodelay(True)
+        CipherWebSocketHandler.sessions.add(self)
+
+    async def on_message(self, message: Union[str, bytes]) -> None:
+        binary: bool = isinstance(message, bytes)
+        self.bytes_in += len(message)
+        executor: CipherExecutor = self.settings['executor']
+        try:
+            with PhaseTimer(self.phases, 'cipher'):
+                if binary:
+                    output: Union[str, bytes] = await executor.call(
+                        len(message), self._cipher.decode_bytes if self._decode else self._cipher.encode_bytes, message
+                    )
+                else:
+                    output = await executor.run(self._cipher, message, self._decode)
+        except Exception as exc:
+            tornado.log.app_log.error('Unexpected error in %s', self.request.path, exc_info=exc)
+            self.error_kind = type(exc).__name__
+            self.close(1011, 'Unexpected error')
+            return
+
+        try:
+            self._pending.append(self.write_message(output, binary=binary))
+        except tornado.websocket.WebSocketClosedError:
+            return
+        self.bytes_out += len(output)
+        while self._pending and (self._pending[0].done() or len(self._pending) > WEBSOCKET_MAX_PENDING):
+            try:
+                await self._pending.popleft()
+            except tornado.websocket.WebSocketClosedError:
+                return
+
+    def on_close(self) -> None:
+        if self not in CipherWebSocketHandler.sessions:
+            return
+        CipherWebSocketHandler.sessions.discard(self)
+        if self.error_kind is None and self.close_code not in (None, 1000, 1001):
+            self.error_kind = f'close_{self.close_code}'
+        self.settings['metrics'].observe_request(
+            self.route,
+            HTTPStatus.SWITCHING_PROTOCOLS,
+            self.request.request_time(),
+            self.phases,
+            self.bytes_in,
+            self.bytes_out,
+            self.error_kind,
+        )
+
+
+class CrackHandler(BaseCipherHandler):
+    """
+    Key recovery request handler.
+
+    The body holds the ciphertext and, optionally, the number of candidates and the scoring method:
+
+        {"text": "WKLV PHVVDJH", "top": 5, "method": "chi2"}
+
+    The most likely Atbash, Caesar and Affine keys are returned, best first, with a preview of the deciphered text.
+    """
+    route: str = 'crack'
+    required_args: dict[str, type] = {'text': str}
+    optional_args: dict[str, type] = {'top': int, 'method': str}
+
+    async def post(self):
+        self._validate_post()
+
+        if not self.is_valid:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': self.error})
+            return
+
+        text: str = self.body['text']
+        try:
+            with self._phase('cipher'):
+                candidates: list[dict] = await self.settings['executor'].call(
+                    len(text), cryptanalysis.crack, text, self.body.get('top', 5), self.body.get('method', 'chi2')
+                )
+            self.write({'candidates': candidates})
+        except ValueError as exc:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': str(exc)})
+        except Exception as exc:
+            self._write_unexpected_error(exc)
+
+
+class SubstitutionCrackHandler(BaseCipherHandler):
+    """
+    Substitution key recovery request handler.
+
+    The body holds the ciphertext and, optionally, the number of hill-climbing restarts and the random seed:
+
+        {"text": "...", "restarts": 5, "seed": 42}
+
+    The most likely key is returned with a preview of the deciphered text.
+    """
+    route: str = 'crack_substitution'
+    required_args: dict[str, type] = {'text': str}
+    optional_args: dict[str, type] = {'restarts': int, 'seed': int}
+
+    async def post(self):
+        self._validate_post()
+
+        if not self.is_valid:
             self.set_status(HTTPStatus.BAD_REQUEST)
             self.write({'error': self.error})
+            return
+
+        executor: CipherExecutor = self.settings['executor']
+        try:
+            # solving is CPU-bound whatever the text length: always left to the worker pool
+            with self._phase('cipher'):
+                solution: dict = await executor.call(
+                    executor.threshold,
+                    cryptanalysis.solve_substitution,
+                    self.body['text'],
+                    self.body.get('restarts', cryptanalysis.SOLVER_RESTARTS),
+                    self.body.get('seed'),
+                )
+            self.write(solution)
+        except ValueError as exc:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': str(exc)})
+        except Exception as exc:
+            self._write_unexpected_error(exc)
+
+
+class JobsHandler(BaseCipherHandler):
+    """
+    Job submission request handler.
+
+    The body holds a single cipher request plus the name of its cipher, as the batch items:
+
+        {"cipher": "caesar", "key": 3, "encrypt": true, "text": "..."}
+
+    or, as an `application/octet-stream` body, the raw text, the other parameters being query arguments:
+
+        POST /jobs/?cipher=caesar&key=3&encrypt=true
+
+    The job is run in the background (see JobStore) and its id is returned right away, with a 202 Accepted status and \
+    the job URL as Location. An octet-stream text is handed to the job as the chunks received, which it joins and \
+    decodes window by window, off the event loop.
+
+    When the store already holds its maximum of unfinished jobs, a submission is rejected from its headers with a 429, \
+    before its body is read.
+
+    Only octet-stream bodies are bounded by the jobs body limit: JSON and msgpack bodies are parsed on the event loop, \
+    so they keep the MAX_BODY_SIZE bound of the other routes.
+    """
+    route: str = 'jobs'
+    required_args: dict[str, type] = {'cipher': str, 'text': str, 'encrypt': bool}
+
+    def _admit(self, cipher: str) -> bool:
+        if not self.settings['jobs'].accepts():
+            self._reject_job()
+            return False
+        return super()._admit(cipher)
 
+    def _body_limit(self) -> int:
+        content_type: str = self.request.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if MEDIA_TYPES.get(content_type) == 'octet-stream':
+            return super()._body_limit()
+        return min(super()._body_limit(), MAX_BODY_SIZE)
 
-def make_app() -> tornado.web.Application:
+    def _reject_job(self) -> None:
+        self.set_header('Retry-After', str(self.settings['admission'].retry_after))
+        self._reject(HTTPStatus.TOO_MANY_REQUESTS, 'Too many jobs')
+
+    def _validate_job(self) -> tuple[tuple, Union[str, list[bytes]], bool]:
+        """This method returns the cipher entry, text and direction of the job, raising ValueError if invalid."""
+        if self.body_format == 'octet-stream':
+            with self._phase('parse'):
+                name: str = _parameter(self, 'cipher', str)
+                if name not in CIPHER_ARGS:
+                    raise ValueError(f"Unknown cipher '{name}'")
+                encrypt: bool = _parameter(self, 'encrypt', bool)
+                chunks, self._chunks = self._chunks, []
+                return (name, *_parameter_keys(self, name)), chunks, encrypt
+
+        self._validate_post()
+        if not self.is_valid:
+            raise ValueError(self.error)
+        name = self.body['cipher']
+        if name not in CIPHER_ARGS:
+            raise ValueError(f"Unknown cipher '{name}'")
+        error: str = _validate_args(self.body, CIPHER_ARGS[name])
+        if error:
+            raise ValueError(error)
+        return (name, *_cipher_keys(name, self.body)), self.body['text'], self.body['encrypt']
+
+    async def post(self):
+        jobs: JobStore = self.settings['jobs']
+        try:
+            entry, text, encrypt = self._validate_job()
+            cipher = default_registry.get(*entry)
+        except (TypeError, ValueError) as exc:
+            self.set_status(HTTPStatus.BAD_REQUEST)
+            self.write({'error': str(exc) if isinstance(exc, ValueError) else 'Invalid cipher keys'})
+            return
+
+        # other submissions may have been accepted while the body was read
+        if not jobs.accepts():
+            self._reject_job()
+            return
+
+        job: Job = jobs.submit(cipher, text, decode=not encrypt)
+        self.set_status(HTTPStatus.ACCEPTED)
+        self.set_header('Location', self.reverse_url('job', job.id))
+        self.write(job.describe())
+
+
+class JobHandler(BaseHandler):
+    """
+    Job status request handler.
+
+    The status is pending, running, done or failed; the progress is the share of the text processed so far:
+
+        {"id": "...", "status": "running", "progress": 0.25, "size": 400000000, "processed": 100000000}
+
+    Finished jobs are dropped after a while (see JobStore): an unknown job gets a 404.
+    """
+    route: str = 'job'
+
+    def get(self, job_id: str) -> None:
+        job: Optional[Job] = self.settings['jobs'].get(job_id)
+        if job is None:
+            self.set_status(HTTPStatus.NOT_FOUND)
+            self.write({'error': 'Unknown job'})
+            return
+        self.write(job.describe())
+
+
+class JobResultHandler(BaseHandler):
+    """
+    Job result request handler.
+
+    The output text of a done job is streamed back as `text/plain`, chunk by chunk; an unfinished or failed job gets a \
+    409 Conflict, with its status.
+    """
+    route: str = 'job_result'
+
+    async def get(self, job_id: str) -> None:
+        job: Optional[Job] = self.settings['jobs'].get(job_id)
+        if job is None:
+            self.set_status(HTTPStatus.NOT_FOUND)
+            self.write({'error': 'Unknown job'})
+            return
+        if job.status != 'done':
+            self.set_status(HTTPStatus.CONFLICT)
+            self.write({'error': 'Job is not done', **job.describe()})
+            return
+
+        self.set_header('Content-Type', 'text/plain; charset=UTF-8')
+        self.set_header('Content-Length', job.result_size)
+        try:
+            for chunk in job.result(JOB_WINDOW):
+                self.write(chunk)
+                await self.flush()
+        except tornado.iostream.StreamClosedError:
+            pass
+
+
+class ProfilesHandler(tornado.web.RequestHandler):
+    """
+    Profiles request handler.
+
+    The metadata of the recent profiles are returned, most recent first: route, status, duration, phases and, for \
+    memory profiles, the peak traced memory and top allocation sites.
+    """
+    def get(self):
+        self.write({'profiles': self.settings['profiler'].profiles()})
+
+
+class ProfileHandler(tornado.web.RequestHandler):
+    """
+    Profile download request handler.
+
+    The function statistics of a CPU profile are returned in the pstats format (e.g. for `python -m pstats` or \
+    snakeviz), or as a text report with `?format=text`, sorted by `?sort=` (cumulative by default).
+    """
+    def get(self, profile_id: str):
+        profile: Optional[Profile] = self.settings['profiler'].get(profile_id)
+        if profile is None or profile.stats is None:
+            self.set_status(HTTPStatus.NOT_FOUND)
+            self.write({'error': 'Unknown profile' if profile is None else 'Profile has no CPU statistics'})
+            return
+        if self.get_query_argument('format', None) == 'text':
+            try:
+                report: str = profile.report(self.get_query_argument('sort', 'cumulative'))
+            except KeyError:
+                self.set_status(HTTPStatus.BAD_REQUEST)
+                self.write({'error': "Invalid query argument 'sort'"})
+                return
+            self.set_header('Content-Type', 'text/plain; charset=UTF-8')
+            self.write(report)
+            return
+        self.set_header('Content-Type', 'application/octet-stream')
+        self.set_header('Content-Disposition', f'attachment; filename="{profile_id}.prof"')
+        self.write(profile.stats)
+
+
+class StatsHandler(tornado.web.RequestHandler):
+    def get(self):
+        cache: Optional[ResponseCache] = self.settings['cache']
+        self.write({
+            'registry': default_registry.stats(),
+            'executor': self.settings['executor'].stats(),
+            'cache': cache.stats() if cache is not None else None,
+            'admission': self.settings['admission'].stats(),
+            'jobs': self.settings['jobs'].stats(),
+        })
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    """
+    Metrics request handler.
+
+    The request metrics (see src/metrics.py) and the registry, executor and in-flight gauges are returned in the \
+    Prometheus text format, for scraping.
+    """
+    def get(self):
+        registry: dict[str, int] = default_registry.stats()
+        executor: dict[str, int] = self.settings['executor'].stats()
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.write(self.settings['metrics'].render([
+            ('requests_in_flight', 'gauge', 'Requests being processed.', [((), BaseHandler.in_flight)]),
+            ('registry_size', 'gauge', 'Cipher instances held by the registry.', [((), registry['size'])]),
+            *(
+                (f'registry_{name}_total', 'counter', f'Cipher registry {name}.', [((), registry[name])])
+                for name in ('hits', 'misses', 'evictions')
+            ),
+            (
+                'executor_calls_total', 'counter', 'Cipher calls, run inline on the event loop or offloaded.',
+                [((('mode', mode),), executor[mode]) for mode in ('inline', 'offloaded')]
+            ),
+            ('executor_pending', 'gauge', 'Offloaded cipher calls not finished yet.', [((), executor['pending'])]),
+            *self._cache_families(),
+            *self._admission_families(),
+        ]))
+
+    def _cache_families(self) -> list[tuple]:
+        cache: Optional[ResponseCache] = self.settings['cache']
+        if cache is None:
+            return []
+        stats: dict[str, int] = cache.stats()
+        return [
+            ('cache_entries', 'gauge', 'Responses held by the response cache.', [((), stats['entries'])]),
+            ('cache_bytes', 'gauge', 'Total size of the cached responses.', [((), stats['bytes'])]),
+            *(
+                (f'cache_{name}_total', 'counter', f'Response cache {name}.', [((), stats[name])])
+                for name in ('hits', 'misses', 'evictions')
+            ),
+        ]
+
+    def _admission_families(self) -> list[tuple]:
+        stats: dict = self.settings['admission'].stats()
+        return [
+            (
+                'admission_in_flight', 'gauge', 'Admitted requests being processed, by cipher.',
+                [((('cipher', cipher),), count) for cipher, count in stats['cipher_in_flight'].items()]
+            ),
+            (
+                'admission_rejected_total', 'counter', 'Requests refused for overload, by cipher.',
+                [((('cipher', cipher),), count) for cipher, count in stats['rejected'].items()]
+            ),
+        ]
+
+
+def make_app(
+        executor: Optional[CipherExecutor] = None,
+        metrics: Optional[Metrics] = None,
+        cache: Optional[ResponseCache] = None,
+        admission: Optional[AdmissionController] = None,
+        body_limits: Optional[dict[str, int]] = None,
+        jobs: Optional[JobStore] = None,
+        profiler: Optional[Profiler] = None,
+) -> tornado.web.Application:
+    # the profile routes only exist when profiling is enabled
+    profile_routes: list[tuple] = [
+        (r"/admin/profiles/", ProfilesHandler),
+        (r"/admin/profiles/([0-9a-f]+)", ProfileHandler),
+    ] if profiler is not None else []
     app = tornado.web.Application([
         (r"/cipher/atbash/", AtbashCipherHandler),
         (r"/cipher/caesar/", CaesarCipherHandler),
         (r"/cipher/affine/", AffineCipherHandler),
-    ])
-
-    app.listen(PORT)
+        (r"/cipher/substitution/", SubstitutionCipherHandler),
+        (r"/cipher/batch/", BatchCipherHandler),
+        (r"/cipher/vigenere/", VigenereCipherHandler),
+        (r"/cipher/pipeline/", PipelineCipherHandler),
+        (r"/cipher/(atbash|caesar|affine|vigenere)/stream/", CipherStreamHandler),
+        (r"/cipher/(atbash|caesar|affine|substitution|vigenere)/ws/", CipherWebSocketHandler),
+        (r"/crack/", CrackHandler),
+        (r"/crack/substitution/", SubstitutionCrackHandler),
+        (r"/jobs/", JobsHandler),
+        tornado.web.url(r"/jobs/([0-9a-f]+)", JobHandler, name='job'),
+        (r"/jobs/([0-9a-f]+)/result", JobResultHandler),
+        (r"/stats/", StatsHandler),
+        (r"/metrics/?", MetricsHandler),
+        *profile_routes,
+    ], executor=executor or CipherExecutor(), metrics=metrics or Metrics(), cache=cache,
+        admission=admission if admission is not None else AdmissionController(),
+        body_limits={**BODY_LIMITS, **(body_limits or {})},
+        jobs=jobs if jobs is not None else JobStore(),
+        profiler=profiler,
+        websocket_max_message_size=WEBSOCKET_MAX_MESSAGE_SIZE)
 
     return app
 
 
-if __name__ == '__main__':
-    app = make_app()
+def _fork_workers(workers: int) -> Optional[int]:
+    """
+    This function forks the input number of worker processes and supervises them.
+
+    Workers exiting abnormally are restarted. SIGTERM and SIGINT received by the supervisor are forwarded to the workers, \
+    the supervisor exiting once all of them have stopped.
+
+    :argument: workers (int)
+        The number of worker processes.
+
+    :return: (Optional[int])
+        The worker id (from 0 to workers - 1) in the worker processes. The supervisor process never returns.
+    """
+    children: dict[int, int] = {}
+    stopping: bool = False
+
+    def start_child(worker_id: int) -> bool:
+        pid: int = os.fork()
+        if pid == 0:
+            return True
+        children[pid] = worker_id
+        return False
+
+    def stop_children(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    for worker_id in range(workers):
+        if start_child(worker_id):
+            return worker_id
+
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+
+    while children:
+        pid, status = os.wait()
+        worker_id = children.pop(pid, None)
+        if worker_id is None or stopping or os.waitstatus_to_exitcode(status) == 0:
+            continue
+        print(f"Worker {worker_id} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+        if start_child(worker_id):
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            return worker_id
+
+    sys.exit(0)
+
+
+async def _serve(
+        sockets: list,
+        shutdown_timeout: float,
+        executor: CipherExecutor,
+        cache: Optional[ResponseCache],
+        admission: Optional[AdmissionController],
+        body_limits: Optional[dict[str, int]],
+        jobs: Optional[JobStore],
+        profiler: Optional[Profiler],
+) -> None:
+    app = make_app(
+        executor, cache=cache, admission=admission, body_limits=body_limits, jobs=jobs, profiler=profiler
+    )
+    server = tornado.httpserver.HTTPServer(app)
+    server.add_sockets(sockets)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+
+    # stop accepting connections, then let in-flight requests complete before closing the remaining connections
+    server.stop()
+    deadline: float = loop.time() + shutdown_timeout
+    while BaseHandler.in_flight and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+    for session in list(CipherWebSocketHandler.sessions):
+        session.close(1001, 'Server shutting down')
+    await server.close_all_connections()
+    app.settings['metrics'].stop()
+    app.settings['jobs'].shutdown()
+    executor.shutdown()
+
 
-    print(f"Application listening on port {PORT}")
+def serve(
+        port: int = PORT,
+        address: str = ADDRESS,
+        workers: int = 1,
+        reuse_port: bool = False,
+        shutdown_timeout: float = SHUTDOWN_TIMEOUT,
+        executor: Optional[CipherExecutor] = None,
+        cache: Optional[ResponseCache] = None,
+        admission: Optional[AdmissionController] = None,
+        body_limits: Optional[dict[str, int]] = None,
+        jobs: Optional[JobStore] = None,
+        profiler: Optional[Profiler] = None,
+) -> None:
+    """
+    This function runs the application until SIGTERM (or SIGINT) is received.
 
-    tornado.ioloop.IOLoop.current().start()
+    With several workers, either the listening socket is bound once and shared by the forked workers, or each worker \
+    binds its own socket with SO_REUSEPORT (reuse_port=True) and the kernel balances connections between them.
+
+    On shutdown, the server stops accepting connections and waits for in-flight requests, up to shutdown_timeout seconds.
+
+    :argument: port (int)
+        The port to listen on.
+    :argument: address (str)
+        The address to listen on, all interfaces if empty.
+    :argument: workers (int)
+        The number of worker processes, one per CPU if 0.
+    :argument: reuse_port (bool)
+        Whether each worker binds its own SO_REUSEPORT socket.
+    :argument: shutdown_timeout (float)
+        The maximum time given to in-flight requests on shutdown, in seconds.
+    :argument: executor (Optional[CipherExecutor])
+        The executor running cipher work in each worker, a default one if not set.
+    :argument: cache (Optional[ResponseCache])
+        The response cache of each worker, no cache if not set.
+    :argument: admission (Optional[AdmissionController])
+        The admission controller of each worker, a default one if not set.
+    :argument: body_limits (Optional[dict[str, int]])
+        The maximum request body sizes, by route name, overriding BODY_LIMITS.
+    :argument: jobs (Optional[JobStore])
+        The job store of each worker, a default one if not set.
+    :argument: profiler (Optional[Profiler])
+        The request profiler of each worker, no profiling if not set.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    sockets: list = []
+    if not reuse_port:
+        sockets = tornado.netutil.bind_sockets(port, address)
+
+    if workers > 1:
+        _fork_workers(workers)
+
+    if reuse_port:
+        sockets = tornado.netutil.bind_sockets(port, address, reuse_port=True)
+
+    print(f"Application listening on port {port} (pid {os.getpid()})")
+
+    asyncio.run(_serve(
+        sockets, shutdown_timeout, executor or CipherExecutor(), cache, admission, body_limits, jobs, profiler
+    ))
+
+
+def _parse_limits(values: list[str], option: str) -> dict[str, int]:
+    """This function parses NAME=INTEGER command line values into a dictionary, raising ValueError if one is invalid."""
+    limits: dict[str, int] = {}
+    for value in values:
+        name, _, limit = value.partition('=')
+        if not name or not limit.isdigit():
+            raise ValueError(f"Invalid {option} value '{value}', expected NAME=INTEGER")
+        limits[name] = int(limit)
+    return limits
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Run the cryptools server.')
+    parser.add_argument('--port', type=int, default=PORT, help=f'port to listen on (default {PORT})')
+    parser.add_argument('--address', default=ADDRESS, help='address to listen on (default all interfaces)')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes, 0 for one per CPU')
+    parser.add_argument('--reuse-port', action='store_true', help='bind one SO_REUSEPORT socket per worker')
+    parser.add_argument(
+        '--shutdown-timeout', type=float, default=SHUTDOWN_TIMEOUT,
+        help=f'seconds given to in-flight requests on shutdown (default {SHUTDOWN_TIMEOUT})'
+    )
+    parser.add_argument(
+        '--offload-threshold', type=int, default=OFFLOAD_THRESHOLD,
+        help=f'text length from which cipher work leaves the event loop (default {OFFLOAD_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--offload-workers', type=int, default=OFFLOAD_WORKERS,
+        help=f'size of the cipher worker pool of each worker process (default {OFFLOAD_WORKERS})'
+    )
+    parser.add_argument('--offload-processes', action='store_true', help='use a process pool instead of threads')
+    parser.add_argument(
+        '--cache-size', type=int, default=CACHE_SIZE,
+        help=f'total size in bytes of the response cache of each worker process, 0 to disable (default {CACHE_SIZE})'
+    )
+    parser.add_argument(
+        '--cache-max-text', type=int, default=CACHE_MAX_TEXT,
+        help=f'length from which texts are not cached (default {CACHE_MAX_TEXT})'
+    )
+    parser.add_argument(
+        '--max-in-flight', type=int, default=MAX_IN_FLIGHT,
+        help=f'requests processed at once by each worker process, 0 for no bound (default {MAX_IN_FLIGHT})'
+    )
+    parser.add_argument(
+        '--max-in-flight-cipher', nargs='+', default=[], metavar='CIPHER=COUNT',
+        help='requests of a cipher processed at once by each worker process (e.g. vigenere=8)'
+    )
+    parser.add_argument(
+        '--retry-after', type=int, default=RETRY_AFTER,
+        help=f'seconds after which requests refused for overload may be retried (default {RETRY_AFTER})'
+    )
+    parser.add_argument(
+        '--max-body-size', nargs='+', default=[], metavar='ROUTE=BYTES',
+        help=f'maximum request body size of a route (e.g. caesar=1048576, default {MAX_BODY_SIZE} bytes)'
+    )
+    parser.add_argument(
+        '--job-workers', type=int, default=JOB_WORKERS,
+        help=f'job worker threads of each worker process (default {JOB_WORKERS})'
+    )
+    parser.add_argument(
+        '--job-max-pending', type=int, default=JOB_MAX_PENDING,
+        help=f'unfinished jobs accepted by each worker process (default {JOB_MAX_PENDING})'
+    )
+    parser.add_argument(
+        '--job-ttl', type=float, default=JOB_TTL, help=f'seconds finished jobs are kept (default {JOB_TTL})'
+    )
+    parser.add_argument(
+        '--job-store-size', type=int, default=JOB_STORE_SIZE,
+        help=f'total size in bytes of the job results of each worker process (default {JOB_STORE_SIZE})'
+    )
+    parser.add_argument('--job-spill-dir', help='directory where large job results are written instead of memory')
+    parser.add_argument(
+        '--profile-rate', type=float, default=0.0, help='share of the requests profiled, from 0 to 1 (default 0)'
+    )
+    parser.add_argument(
+        '--profile-header', action='store_true', help=f'profile the requests sending the {PROFILE_HEADER} header'
+    )
+    parser.add_argument(
+        '--profile-modes', nargs='+', default=['cpu'], choices=PROFILE_MODES,
+        help='profilers of the sampled requests: cpu (cProfile), memory (tracemalloc) (default cpu)'
+    )
+    parser.add_argument('--profile-dir', help='directory where the profiles are written')
+    parser.add_argument(
+        '--profile-keep', type=int, default=PROFILE_KEEP, help=f'number of recent profiles kept (default {PROFILE_KEEP})'
+    )
+    args = parser.parse_args(argv)
+
+    if args.workers < 0:
+        parser.error('--workers must be a positive integer, or 0')
+
+    try:
+        executor = CipherExecutor(args.offload_threshold, args.offload_workers, args.offload_processes)
+        cache: Optional[ResponseCache] = ResponseCache(args.cache_size, args.cache_max_text) if args.cache_size else None
+        admission = AdmissionController(
+            args.max_in_flight, _parse_limits(args.max_in_flight_cipher, '--max-in-flight-cipher'), args.retry_after
+        )
+        body_limits: dict[str, int] = _parse_limits(args.max_body_size, '--max-body-size')
+        jobs = JobStore(args.job_workers, args.job_max_pending, args.job_ttl, args.job_store_size, args.job_spill_dir)
+        profiler: Optional[Profiler] = None
+        if args.profile_rate or args.profile_header:
+            profiler = Profiler(
+                args.profile_rate, args.profile_header, args.profile_dir, args.profile_keep, tuple(args.profile_modes)
+            )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    serve(
+        args.port, args.address, args.workers, args.reuse_port, args.shutdown_timeout, executor, cache, admission,
+        body_limits, jobs, profiler
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,2 @@
-from .cryptools import AtbashCipher, CaesarCipher, AffineCipher
+from .cryptools import AtbashCipher, CaesarCipher, AffineCipher, SubstitutionCipher, CipherPipeline, VigenereCipher
+from .registry import CipherRegistry
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from typing import Optional
+
+
+MAX_IN_FLIGHT: int = 512
+RETRY_AFTER: int = 1
+
+
+class AdmissionController:
+    """
+    Admission controller.
+
+    This bounds the cipher work in flight: at most `max_in_flight` requests overall (0 for no bound) and, for the \
+    ciphers listed in `cipher_limits`, at most that many requests of the cipher. A request is admitted with `acquire` \
+    before its body is read, and must `release` its slot once finished. A request refused because of a bound should be \
+    answered right away with a 429 and the `retry_after` delay, rather than queued behind the others.
+
+    Slots are taken and released from the event loop thread only, so no lock is needed.
+
+    e.g. AdmissionController(64, {'vigenere': 8}) admits 64 requests at once, at most 8 of which are Vigenere ones.
+    """
+    def __init__(
+            self,
+            max_in_flight: int = MAX_IN_FLIGHT,
+            cipher_limits: Optional[dict[str, int]] = None,
+            retry_after: int = RETRY_AFTER,
+    ):
+        if max_in_flight < 0:
+            raise ValueError(f'Input max_in_flight={max_in_flight} must be a non-negative integer')
+        for cipher, limit in (cipher_limits or {}).items():
+            if limit < 1:
+                raise ValueError(f'Input limit={limit} of cipher {cipher!r} must be a positive integer')
+        if retry_after < 0:
+            raise ValueError(f'Input retry_after={retry_after} must be a non-negative integer')
+        self.max_in_flight: int = max_in_flight
+        self.cipher_limits: dict[str, int] = dict(cipher_limits or {})
+        self.retry_after: int = retry_after
+        self.in_flight: int = 0
+        self.cipher_in_flight: defaultdict[str, int] = defaultdict(int)
+        self.rejected: defaultdict[str, int] = defaultdict(int)
+
+    def acquire(self, cipher: str) -> bool:
+        """
+        This method takes an in-flight slot for a request of the input cipher, if the bounds allow it.
+
+        :argument: cipher (str) the cipher name, or the route name for the routes without a single cipher
+        :return: (bool) whether the request is admitted
+        """
+        limit: Optional[int] = self.cipher_limits.get(cipher)
+        if (self.max_in_flight and self.in_flight >= self.max_in_flight) or \
+                (limit is not None and self.cipher_in_flight[cipher] >= limit):
+            self.rejected[cipher] += 1
+            return False
+        self.in_flight += 1
+        self.cipher_in_flight[cipher] += 1
+        return True
+
+    def release(self, cipher: str) -> None:
+        self.in_flight -= 1
+        self.cipher_in_flight[cipher] -= 1
+
+    def stats(self) -> dict:
+        """This method returns the bounds, the requests in flight and the rejected requests, by cipher."""
+        return {
+            'max_in_flight': self.max_in_flight,
+            'cipher_limits': dict(self.cipher_limits),
+            'in_flight': self.in_flight,
+            'cipher_in_flight': {cipher: count for cipher, count in sorted(self.cipher_in_flight.items()) if count},
+            'rejected': dict(sorted(self.rejected.items())),
+        }
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Hashable, Optional
+
+
+CACHE_SIZE: int = 64 * 1024 ** 2
+CACHE_MAX_TEXT: int = 64 * 1024
+DIGEST_SIZE: int = 16
+
+
+class ResponseCache:
+    """
+    Response cache.
+
+    This is a content-addressed cache of serialized cipher responses. A response only depends on the cipher, its keys, \
+    the direction, the text and the response format, so it is stored under a BLAKE2b digest of them (see `key`); the \
+    digest also serves as the ETag of the response, which lets clients revalidate it without sending the text back.
+
+    The cache is bounded by the total size of the responses it holds (`maxbytes`): once it is exceeded, the least \
+    recently used responses are evicted. Texts longer than `max_text` characters are not cached, so that a few large \
+    responses cannot flush the many small repeated ones.
+
+    e.g. cache.get(cache.key(('caesar', 3), False, 'abc')) returns the response of the first such request.
+    """
+    def __init__(self, maxbytes: int = CACHE_SIZE, max_text: int = CACHE_MAX_TEXT):
+        if maxbytes < 1:
+            raise ValueError(f'Input maxbytes={maxbytes} must be a positive integer')
+        if max_text < 0:
+            raise ValueError(f'Input max_text={max_text} must be a non-negative integer')
+        self.maxbytes: int = maxbytes
+        self.max_text: int = max_text
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def accepts(self, text: str) -> bool:
+        """This method returns whether the response to the input text may be cached."""
+        return len(text) <= self.max_text
+
+    @staticmethod
+    def key(cipher: tuple[Hashable, ...], decode: bool, text: str, variant: str = '') -> bytes:
+        """
+        This method returns the digest addressing a response.
+
+        :argument: cipher (tuple) the cipher name and keys, as given to the registry (e.g. ('affine', 5, 7))
+        :argument: decode (bool) whether the text is deciphered
+        :argument: text (str) the input text
+        :argument: variant (str) the representation of the response, e.g. its serialization format
+        :return: (bytes) the digest
+        """
+        digest = hashlib.blake2b(repr((cipher, variant) if variant else cipher).encode(), digest_size=DIGEST_SIZE)
+        digest.update(b'\x00D' if decode else b'\x00E')
+        digest.update(text.encode('utf-8', errors='surrogatepass'))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            response: Optional[bytes] = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: bytes, response: bytes) -> None:
+        if len(response) > self.maxbytes:
+            return
+        with self._lock:
+            previous: Optional[bytes] = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = response
+            self.size += len(response)
+            while self.size > self.maxbytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """This method drops every cached response and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """This method returns the cache size (entries and bytes), bounds and hit / miss / eviction counters."""
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'maxbytes': self.maxbytes,
+            'max_text': self.max_text,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,305 @@
+"""
+Cryptanalysis of the mono-alphabetic ciphers.
+
+Recovers the key of an Atbash, Caesar or Affine ciphertext by frequency analysis:
+
+    crack('WKLV PHVVDJH VKDOO UHPDLQ SULYDWH', top=3)
+
+The letter histogram of the ciphertext is computed once. Every Affine key (Caesar and Atbash being special cases) only \
+permutes that histogram, so a key is scored from the histogram alone, without deciphering the text: a crack costs \
+O(len(text) + keyspace) instead of O(len(text) x keyspace).
+
+Recovers the key of a general substitution ciphertext by hill-climbing over English quadgram statistics:
+
+    solve_substitution(ciphertext)
+"""
+from array import array
+from collections import Counter
+import functools
+import gzip
+import math
+import os
+import random
+import string
+from typing import Any, Optional
+
+from .cryptools import AffineCipher, SubstitutionCipher
+from .utils import gcd
+from .vectorized import HAS_NUMPY, np
+
+
+ALPHABET_LENGTH: int = len(string.ascii_uppercase)
+PREVIEW_LENGTH: int = 64
+QUADGRAMS_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'english_quadgrams.txt.gz')
+SOLVER_RESTARTS: int = 5
+METHODS: tuple[str, ...] = ('chi2', 'loglikelihood')
+
+# relative frequencies of the letters A to Z in English texts
+ENGLISH_FREQUENCIES: tuple[float, ...] = (
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406,
+    0.06749, 0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+)
+
+# every valid (keyA, keyB) pair: keyA co-prime with the alphabet length, as required by AffineCipher
+AFFINE_KEYS: tuple[tuple[int, int], ...] = tuple(
+    (key_a, key_b)
+    for key_a in range(1, ALPHABET_LENGTH) if gcd(key_a, ALPHABET_LENGTH) == 1
+    for key_b in range(ALPHABET_LENGTH)
+)
+
+# IMAGES[k][p] is the ciphertext letter of the plaintext letter p under AFFINE_KEYS[k]
+IMAGES: tuple[tuple[int, ...], ...] = tuple(
+    tuple((key_a * letter + key_b) % ALPHABET_LENGTH for letter in range(ALPHABET_LENGTH)) for key_a, key_b in AFFINE_KEYS
+)
+
+
+def letter_histogram(text: str) -> list[int]:
+    """
+    This function counts the letters of the input text, regardless of their case.
+
+    :argument: text (str)
+        The text to analyse.
+
+    :return: (list[int])
+        The number of occurrences of each letter, from A to Z.
+    """
+    counts: Counter = Counter(text)
+    return [counts[upper] + counts[lower] for upper, lower in zip(string.ascii_uppercase, string.ascii_lowercase)]
+
+
+def score_keys(histogram: list[int], method: str = 'chi2') -> list[float]:
+    """
+    This function scores every Affine key against English letter frequencies, from a ciphertext letter histogram.
+
+    - chi2: chi-squared statistic between the observed and expected counts of the deciphered text (lower is better).
+    - loglikelihood: log-likelihood of the deciphered text under English letter frequencies (higher is better).
+
+    :argument: histogram (list[int])
+        The ciphertext letter histogram (see letter_histogram).
+    :argument: method (str)
+        The scoring method, 'chi2' or 'loglikelihood'.
+
+    :return: (list[float])
+        The score of each key, in AFFINE_KEYS order.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Input method='{method}' must be one of {', '.join(METHODS)}")
+
+    total: int = sum(histogram)
+
+    if HAS_NUMPY:
+        observed = np.asarray(histogram, dtype=np.float64)[np.asarray(IMAGES)]
+        frequencies = np.asarray(ENGLISH_FREQUENCIES)
+        if method == 'chi2':
+            expected = total * frequencies
+            return (((observed - expected) ** 2) / expected).sum(axis=1).tolist()
+        return (observed * np.log(frequencies)).sum(axis=1).tolist()
+
+    if method == 'chi2':
+        expected: list[float] = [total * frequency for frequency in ENGLISH_FREQUENCIES]
+        return [
+            sum((histogram[image] - expected[letter]) ** 2 / expected[letter] for letter, image in enumerate(images))
+            for images in IMAGES
+        ]
+    log_frequencies: list[float] = [math.log(frequency) for frequency in ENGLISH_FREQUENCIES]
+    return [sum(histogram[image] * log_frequencies[letter] for letter, image in enumerate(images)) for images in IMAGES]
+
+
+def _describe(key_a: int, key_b: int) -> dict[str, Any]:
+    if key_a == 1:
+        return {'cipher': 'caesar', 'key': key_b}
+    if (key_a, key_b) == (ALPHABET_LENGTH - 1, ALPHABET_LENGTH - 1):
+        return {'cipher': 'atbash'}
+    return {'cipher': 'affine', 'keys': [key_a, key_b]}
+
+
+def crack(ciphertext: str, top: int = 5, method: str = 'chi2', preview_length: Optional[int] = PREVIEW_LENGTH) -> list[dict]:
+    """
+    This function recovers the most likely keys of an Atbash, Caesar or Affine ciphertext.
+
+    All 312 valid Affine keys are scored, Caesar keys (keyA = 1) and Atbash (keyA = keyB = 25) being reported as such.
+
+    :argument: ciphertext (str)
+        The text to crack.
+    :argument: top (int)
+        The number of candidates to return.
+    :argument: method (str)
+        The scoring method, 'chi2' or 'loglikelihood' (see score_keys).
+    :argument: preview_length (Optional[int])
+        The number of characters of the deciphered text returned with each candidate, none if not set.
+
+    :return: (list[dict])
+        The best candidates, best first. e.g. [{'cipher': 'caesar', 'key': 3, 'score': 12.3, 'preview': 'THIS ...'}]
+    """
+    if top < 1:
+        raise ValueError(f'Input top={top} must be a positive integer')
+
+    histogram: list[int] = letter_histogram(ciphertext)
+    if not sum(histogram):
+        raise ValueError('Input text has no letter to analyse')
+
+    scores: list[float] = score_keys(histogram, method)
+    ranking: list[int] = sorted(range(len(AFFINE_KEYS)), key=scores.__getitem__, reverse=method == 'loglikelihood')
+
+    candidates: list[dict] = []
+    for index in ranking[:top]:
+        candidate: dict[str, Any] = {**_describe(*AFFINE_KEYS[index]), 'score': scores[index]}
+        if preview_length:
+            candidate['preview'] = AffineCipher(*AFFINE_KEYS[index])._process(ciphertext[:preview_length], decode=True)
+        candidates.append(candidate)
+
+    return candidates
+
+
+class QuadgramTable:
+    """
+    English quadgram statistics.
+
+    The log10 probability of every quadgram of letters is held in a flat array of 26^4 floats, indexed by \
+    ((a * 26 + b) * 26 + c) * 26 + d where a, b, c, d are the letter indexes (0 for A to 25 for Z). Quadgrams missing \
+    from the counts get a floor probability.
+
+    The bundled counts (see QUADGRAMS_PATH) are drawn from a public domain English text. Counts files hold one \
+    "QUADGRAM COUNT" line per quadgram, plain or gzip-compressed.
+    """
+    def __init__(self, counts: dict[str, int]):
+        total: int = sum(counts.values())
+        if not total:
+            raise ValueError('Input counts must not be empty')
+        self.floor: float = math.log10(0.01 / total)
+        self.log_probabilities: array = array('d', [self.floor]) * ALPHABET_LENGTH ** 4
+        for quadgram, count in counts.items():
+            self.log_probabilities[self.index(*(ord(letter) - ord('A') for letter in quadgram))] = math.log10(count / total)
+
+    @staticmethod
+    def index(a: int, b: int, c: int, d: int) -> int:
+        return ((a * ALPHABET_LENGTH + b) * ALPHABET_LENGTH + c) * ALPHABET_LENGTH + d
+
+    @classmethod
+    def load(cls, path: str = QUADGRAMS_PATH) -> 'QuadgramTable':
+        """This method builds a quadgram table from a counts file."""
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='ascii') as file:
+            counts: dict[str, int] = {}
+            for line in file:
+                quadgram, count = line.split()
+                counts[quadgram.upper()] = int(count)
+        return cls(counts)
+
+    def score(self, text: str) -> float:
+        """This method returns the log10 probability of the letters of the input text."""
+        letters: list[int] = [ord(char) - ord('A') for char in text.upper() if 'A' <= char <= 'Z']
+        return sum(self.log_probabilities[self.index(*letters[i:i + 4])] for i in range(len(letters) - 3))
+
+
+@functools.lru_cache(maxsize=1)
+def english_quadgrams() -> QuadgramTable:
+    """This function returns the bundled English quadgram table, loaded on first use."""
+    return QuadgramTable.load()
+
+
+def solve_substitution(
+        ciphertext: str,
+        restarts: int = SOLVER_RESTARTS,
+        seed: Optional[int] = None,
+        quadgrams: Optional[QuadgramTable] = None,
+        preview_length: Optional[int] = PREVIEW_LENGTH,
+) -> dict[str, Any]:
+    """
+    This function recovers the most likely key of a substitution ciphertext.
+
+    The key is searched by hill-climbing: starting from the key matching letter frequencies, pairs of letters are \
+    swapped as long as a swap makes the deciphered text more English-like, measured by its quadgram log probability. \
+    The search restarts from a perturbation of the best key found so far, to escape local maxima.
+
+    The text is never deciphered during the search: the ciphertext quadgrams are counted once, and a swap only \
+    rescores the distinct quadgrams holding one of the two swapped letters.
+
+    :argument: ciphertext (str)
+        The text to solve. A few hundred letters are usually enough.
+    :argument: restarts (int)
+        The number of hill-climbing restarts.
+    :argument: seed (Optional[int])
+        The seed of the random generator, for reproducible solves.
+    :argument: quadgrams (Optional[QuadgramTable])
+        The quadgram statistics of the plain text language, English if not set.
+    :argument: preview_length (Optional[int])
+        The number of characters of the deciphered text returned, none if not set.
+
+    :return: (dict)
+        The key (as expected by SubstitutionCipher), its score and the deciphered text preview.
+    """
+    if restarts < 1:
+        raise ValueError(f'Input restarts={restarts} must be a positive integer')
+
+    table: array = (quadgrams or english_quadgrams()).log_probabilities
+    letters: list[int] = [ord(char) - ord('A') for char in ciphertext.upper() if 'A' <= char <= 'Z']
+    if len(letters) < 4:
+        raise ValueError('Input text has not enough letters to analyse')
+
+    # distinct ciphertext quadgrams, their number of occurrences, and the quadgrams holding each letter
+    counts: Counter = Counter(zip(letters, letters[1:], letters[2:], letters[3:]))
+    quads: list[tuple[int, int, int, int]] = list(counts)
+    occurrences: list[int] = [counts[quad] for quad in quads]
+    by_letter: list[set[int]] = [set() for _ in range(ALPHABET_LENGTH)]
+    for position, quad in enumerate(quads):
+        for letter in quad:
+            by_letter[letter].add(position)
+    affected: dict[tuple[int, int], list[int]] = {
+        (x, y): sorted(by_letter[x] | by_letter[y])
+        for x in range(ALPHABET_LENGTH) for y in range(x + 1, ALPHABET_LENGTH) if by_letter[x] or by_letter[y]
+    }
+    swaps: list[tuple[int, int]] = list(affected)
+
+    def contribution(mapping: list[int], position: int) -> float:
+        a, b, c, d = quads[position]
+        return table[((mapping[a] * 26 + mapping[b]) * 26 + mapping[c]) * 26 + mapping[d]] * occurrences[position]
+
+    def climb(mapping: list[int]) -> float:
+        contributions: list[float] = [contribution(mapping, position) for position in range(len(quads))]
+        improved: bool = True
+        while improved:
+            improved = False
+            rng.shuffle(swaps)
+            for x, y in swaps:
+                positions: list[int] = affected[(x, y)]
+                mapping[x], mapping[y] = mapping[y], mapping[x]
+                new: list[float] = [contribution(mapping, position) for position in positions]
+                if sum(new) > sum(contributions[position] for position in positions):
+                    for position, value in zip(positions, new):
+                        contributions[position] = value
+                    improved = True
+                else:
+                    mapping[x], mapping[y] = mapping[y], mapping[x]
+        return sum(contributions)
+
+    rng = random.Random(seed)
+
+    # mapping[c] is the plain text letter of the ciphertext letter c: start by matching letter frequencies
+    histogram: list[int] = [0] * ALPHABET_LENGTH
+    for letter in letters:
+        histogram[letter] += 1
+    by_frequency: list[int] = sorted(range(ALPHABET_LENGTH), key=lambda letter: -ENGLISH_FREQUENCIES[letter])
+    mapping: list[int] = [0] * ALPHABET_LENGTH
+    for rank, letter in enumerate(sorted(range(ALPHABET_LENGTH), key=lambda letter: -histogram[letter])):
+        mapping[letter] = by_frequency[rank]
+
+    best_mapping: list[int] = list(mapping)
+    best_score: float = climb(best_mapping)
+    for _ in range(restarts - 1):
+        mapping = list(best_mapping)
+        for _ in range(rng.randint(2, 6)):
+            x, y = rng.sample(range(ALPHABET_LENGTH), 2)
+            mapping[x], mapping[y] = mapping[y], mapping[x]
+        score: float = climb(mapping)
+        if score > best_score:
+            best_mapping, best_score = mapping, score
+
+    key: list[str] = [''] * ALPHABET_LENGTH
+    for cipher_letter, plain_letter in enumerate(best_mapping):
+        key[plain_letter] = string.ascii_uppercase[cipher_letter]
+
+    solution: dict[str, Any] = {'key': ''.join(key), 'score': best_score}
+    if preview_length:
+        solution['preview'] = SubstitutionCipher(solution['key'])._process(ciphertext[:preview_length], decode=True)
+    return solution
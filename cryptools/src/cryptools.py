@@ -1,132 +1,318 @@
+import functools
+import itertools
+import re
 import string
+from typing import AnyStr, Callable, Iterable, Optional, Union
 
 from .utils import gcd
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
-class Cipher:
+
+CAESAR_TABLE_CACHE_SIZE: int = 64
+ALPHABET_CACHE_SIZE: int = 64
+BYTES_WINDOW_SIZE: int = 1024 ** 2
+VIGENERE_NUMPY_THRESHOLD: int = 512
+
+ALPHABETS: dict[str, str] = {
+    'uppercase': string.ascii_uppercase,
+    'lowercase': string.ascii_lowercase,
+    'both': string.ascii_uppercase + string.ascii_lowercase,
+}
+
+
+class _Alphabet:
     """
-    This is the parent cipher class.
+    Plain text alphabet of a cipher, and how the case of the texts is handled.
 
-    This class should not be instantiated.
+    The letters of an alphabet all of a same case (e.g. A to Z) have case counterparts (e.g. a to z). By default, texts \
+    are converted to the case of the alphabet before being ciphered (e.g. é becomes É), the counterparts being thus \
+    ciphered as their letter. With `preserve_case`, texts are not converted: a counterpart is ciphered to the \
+    counterpart of the image of its letter, and any other character is left unchanged. The letters of an alphabet \
+    mixing cases (e.g. 'both') have no counterparts.
+
+    The translation tables map the counterparts themselves, so that converting a text is only needed for the \
+    characters they do not cover: an ASCII text is ciphered in a single pass when the counterparts include every ASCII \
+    letter (e.g. for 'uppercase' and 'lowercase').
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, letters: str, preserve_case: bool):
+        self.letters: str = letters
+        self.preserve_case: bool = preserve_case
+        self.case: Optional[Callable[[str], str]] = \
+            str.upper if letters.isupper() else str.lower if letters.islower() else None
+        other: Callable[[str], str] = str.lower if self.case is str.upper else str.upper
+
+        # counterparts not converted back to their letter (e.g. ß for ẞ, whose upper case is SS) are left out
+        self.counterparts: dict[str, str] = {}
+        if self.case is not None:
+            for letter in letters:
+                counterpart: str = other(letter)
+                if len(counterpart) == 1 and counterpart != letter and self.case(counterpart) == letter:
+                    self.counterparts[letter] = counterpart
+        self.ascii_folded: bool = self.case is not None and all(
+            self.case(char) == char or self.case(char) in self.counterparts for char in map(chr, range(128))
+        )
+
+        characters: str = re.escape(letters + ''.join(self.counterparts.values()))
+        self.pattern: re.Pattern = re.compile(f'([{characters}]+)')
+        self.bytes_pattern: Optional[re.Pattern] = \
+            re.compile(f'([{characters}]+)'.encode('ascii')) if letters.isascii() else None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Alphabet) and \
+            (self.letters, self.preserve_case) == (other.letters, other.preserve_case)
+
+    def __hash__(self) -> int:
+        return hash((self.letters, self.preserve_case))
+
+    def normalize(self, key: str) -> str:
+        """This method converts a key made of letters to the case of the alphabet, e.g. lemon to LEMON."""
+        return key if self.case is None else self.case(key)
+
+    def convert(self, text: str) -> str:
+        """
+        This method converts the input text to the case of the alphabet, unless the translation tables do it.
 
-    async def encode(self, plaintext: str) -> str:
+        :argument: text (str) the text to cipher
+        :return: (str) the input text itself if it needs no conversion, the converted text otherwise
         """
-        This method encodes the input text.
+        if self.preserve_case or self.case is None or (self.ascii_folded and text.isascii()):
+            return text
+        return self.case(text)
 
-        In this method should be the logic necessary to transform the initial plain text into its ciphered version.
+    def table(self, source: str, target: str) -> dict[int, int]:
+        """
+        This method returns the translation table mapping each source letter to the target letter at the same position.
 
-        :argument: plaintext (str)
-            The text to cipher.
+        The counterparts of the source letters are mapped to their target letter, or to its counterpart with \
+        preserve_case.
 
-        :return: (str)
-            The ciphered text.
+        :argument: source (str) a permutation of the letters
+        :argument: target (str) another permutation of the letters
+        :return: (dict[int, int]) the str.translate table
         """
-        raise NotImplementedError
-
-    async def decode(self, ciphertext: str) -> str:
+        table: dict[int, int] = str.maketrans(source, target)
+        for letter, image in zip(source, target):
+            if letter in self.counterparts:
+                table[ord(self.counterparts[letter])] = \
+                    ord(self.counterparts.get(image, image) if self.preserve_case else image)
+        return table
+
+    def bytes_table(self, table: dict[int, int]) -> bytes:
         """
-        This method decodes the input text.
+        This method converts a translation table into a 256-entry byte translation table.
 
-        In this method should be the logic necessary to transform the initial ciphered text into its plain version.
+        Only the ASCII characters of the table are mapped, any other byte is left unchanged: binary buffers can only be \
+        ciphered with an ASCII alphabet.
 
-        :argument: ciphertext (str)
-            The text to decipher.
+        :argument: table (dict[int, int])
+            The str.translate table of the cipher.
 
-        :return: (str)
-            The plain text.
+        :return: (bytes)
+            The bytes.translate table of the cipher.
         """
-        raise NotImplementedError
+        if not self.letters.isascii():
+            raise ValueError(f"Input alphabet='{self.letters}' must be ASCII to cipher binary buffers.")
+        byte_table: bytearray = bytearray(range(256))
+        for code, image in table.items():
+            if code < 128:
+                byte_table[code] = image
+        return bytes(byte_table)
 
 
-class AtbashCipher(Cipher):
+@functools.lru_cache(maxsize=ALPHABET_CACHE_SIZE)
+def _alphabet(alphabet: str, preserve_case: bool) -> _Alphabet:
     """
-    Atbash cipher.
+    This function returns the alphabet matching the input name or letters.
 
-    This is a mono-alphabetic substitution cipher.
+    :argument: alphabet (str)
+        The alphabet name (see ALPHABETS), or its letters in order, e.g. 'ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ'.
+    :argument: preserve_case (bool)
+        Whether the case of the texts is preserved.
 
-    The plain text alphabet is reversed to create the cipher text alphabet. In other words, the first letter of the \
-    alphabet is encrypted to the last letter of the alphabet, the second letter to the penultimate letter and so forth.
+    :return: (_Alphabet)
+        The alphabet, shared by every cipher using it.
+    """
+    letters: str = ALPHABETS.get(alphabet, alphabet)
+    if len(letters) < 2 or len(set(letters)) != len(letters):
+        raise ValueError(
+            f"Input alphabet='{alphabet}' must be one of {', '.join(ALPHABETS)} or at least 2 distinct characters."
+        )
+    return _Alphabet(letters, preserve_case)
 
-    e.g. A becomes Z, B becomes Y, C becomes X, ...
 
-    It is a variant of the affine cipher, for which the multiplicative key equals 1 and the additive key equals 25.
+@functools.lru_cache(maxsize=CAESAR_TABLE_CACHE_SIZE)
+def _caesar_tables(shift: int, alphabet: _Alphabet) -> tuple[dict[int, int], dict[int, int]]:
+    """
+    This function returns the (encode, decode) translation tables of a Caesar shift.
+
+    Tables are kept in a process-wide LRU cache shared by every CaesarCipher instance, so that building a cipher for \
+    an already seen key and alphabet never rebuilds them.
+
+    :argument: shift (int)
+        The shift, already reduced modulo the alphabet length.
+    :argument: alphabet (_Alphabet)
+        The alphabet shifted.
+
+    :return: (tuple[dict[int, int], dict[int, int]])
+        The encode and decode translation tables.
+    """
+    shifted_alphabet: str = alphabet.letters[shift:] + alphabet.letters[:shift]
+    return alphabet.table(alphabet.letters, shifted_alphabet), alphabet.table(shifted_alphabet, alphabet.letters)
+
+
+class Cipher:
+    """
+    This is the parent cipher class.
+
+    This class should not be instantiated.
+
+    Subclasses precompile their encode and decode translation tables at construction time: a cipher instance is \
+    immutable once built and can therefore be shared (see src.registry.CipherRegistry).
+
+    Every cipher works on an alphabet: 'uppercase' (A to Z, the default), 'lowercase', 'both' (A to Z then a to z) or \
+    any string of distinct characters. Texts are converted to the case of the alphabet (e.g. this becomes THIS with \
+    'uppercase'), unless `preserve_case` is set (e.g. This then stays This, only its letters being ciphered). Either \
+    way, the tables map both cases: an ASCII text is translated in a single pass, into a single new string.
+
+    Binary buffers are processed with the byte counterparts of these tables, built on first use. Only ASCII letters \
+    are ciphered (and converted to the case of the alphabet), any other byte is left unchanged.
+
+    Both options are keyword-only, in every cipher: they are never taken for cipher keys.
+
+    :argument: alphabet (str) alphabet name (see ALPHABETS) or letters
+    :argument: preserve_case (bool) whether the case of the texts is preserved
     """
-    def __init__(self):
+    def __init__(self, *, alphabet: str = 'uppercase', preserve_case: bool = False):
         super().__init__()
-        self._table = str.maketrans(string.ascii_uppercase, string.ascii_uppercase[::-1])
+        self._alphabet: _Alphabet = _alphabet(alphabet, preserve_case)
+        self._encode_table: Optional[dict[int, int]] = None
+        self._decode_table: Optional[dict[int, int]] = None
 
-    async def encode(self, plaintext: str) -> str:
-        """
-        This method encodes the input text.
+    @property
+    def alphabet(self) -> str:
+        return self._alphabet.letters
 
-        In this method should be the logic necessary to transform the initial plain text into its ciphered version.
+    @property
+    def preserve_case(self) -> bool:
+        return self._alphabet.preserve_case
 
-        :argument: plaintext (str)
-            The text to cipher.
+    def _process(self, text: str, decode: bool) -> str:
+        table: Optional[dict[int, int]] = self._decode_table if decode else self._encode_table
+        if table is None:
+            raise NotImplementedError
+        return str.translate(self._alphabet.convert(text), table)
+
+    def _process_many(self, texts: list[str], decode: bool) -> list[str]:
+        joined: str = ''.join(texts)
+        processed: str = self._process(joined, decode)
+        if len(processed) != len(joined):
+            # a few characters (e.g. ß) convert to several ones: the texts cannot be split back by their lengths
+            return [self._process(text, decode) for text in texts]
+        ends: list[int] = list(itertools.accumulate(map(len, texts)))
+        return list(map(processed.__getitem__, map(slice, [0, *ends[:-1]], ends)))
+
+    @property
+    def _cipher_alphabet(self) -> str:
+        """The cipher text alphabet: the image of each letter of the alphabet, in order, by the encode table."""
+        if self._encode_table is None:
+            raise NotImplementedError
+        return str.translate(self.alphabet, self._encode_table)
+
+    @functools.cached_property
+    def _bytes_tables(self) -> tuple[bytes, bytes]:
+        if self._encode_table is None or self._decode_table is None:
+            raise NotImplementedError
+        return self._alphabet.bytes_table(self._encode_table), self._alphabet.bytes_table(self._decode_table)
+
+    def _process_bytes(self, data: Union[bytes, bytearray, memoryview], decode: bool) -> Union[bytes, bytearray]:
+        if not isinstance(data, (bytes, bytearray)):
+            data = memoryview(data).tobytes()
+        return data.translate(self._bytes_tables[decode])
+
+    def _process_into(self, buffer: Union[bytearray, memoryview], decode: bool) -> None:
+        transform: Callable[[memoryview], bytes] = self._stream_bytes(decode)
+        view: memoryview = memoryview(buffer).cast('B')
+        if view.readonly:
+            raise TypeError('Input buffer must be writable')
+        for start in range(0, len(view), BYTES_WINDOW_SIZE):
+            window: memoryview = view[start:start + BYTES_WINDOW_SIZE]
+            window[:] = transform(window)
+
+    def _stream(self, decode: bool) -> Callable[[str], str]:
+        """
+        This method returns a function processing the successive chunks of a text.
 
-        :return: (str)
-            The ciphered text.
+        Mono-alphabetic ciphers are stateless per character, so each chunk is processed on its own. Ciphers depending \
+        on the position in the text carry it from a chunk to the next one.
         """
-        return str.translate(plaintext.upper(), self._table)
+        return functools.partial(self._process, decode=decode)
 
-    async def decode(self, ciphertext: str) -> str:
+    def _stream_bytes(self, decode: bool) -> Callable[[Union[bytes, bytearray, memoryview]], bytes]:
+        """This method returns a function processing the successive chunks of a binary buffer (see _stream)."""
+        return functools.partial(self._process_bytes, decode=decode)
+
+    def encode_bytes(self, plaintext: Union[bytes, bytearray, memoryview]) -> Union[bytes, bytearray]:
         """
-        This method decodes the input text.
+        This method encodes the input binary buffer.
 
-        In this method should be the logic necessary to transform the initial ciphered text into its plain version.
+        The buffer is translated in a single pass with a 256-entry byte table.
 
-        :argument: ciphertext (str)
-            The text to decipher.
+        :argument: plaintext (bytes-like object)
+            The buffer to cipher.
 
-        :return: (str)
-            The plain text.
+        :return: (bytes)
+            The ciphered buffer (a bytearray if the input buffer is a bytearray).
         """
-        return str.translate(ciphertext.upper(), self._table)
+        return self._process_bytes(plaintext, decode=False)
 
+    def decode_bytes(self, ciphertext: Union[bytes, bytearray, memoryview]) -> Union[bytes, bytearray]:
+        """
+        This method decodes the input binary buffer.
 
-class CaesarCipher(Cipher):
-    """
-    Caesar cipher.
+        The buffer is translated in a single pass with a 256-entry byte table.
 
-    This is a mono-alphabetic substitution cipher.
+        :argument: ciphertext (bytes-like object)
+            The buffer to decipher.
 
-    The plain text alphabet is shifted to create the cipher text alphabet. In other words, any letter L of the alphabet\
-    is encrypted to the L+Nth letter of the same alphabet (where N is the input key).
+        :return: (bytes)
+            The plain buffer (a bytearray if the input buffer is a bytearray).
+        """
+        return self._process_bytes(ciphertext, decode=True)
 
-    e.g. if key = 1 then A becomes B, B becomes C, C becomes D, ...
-    e.g. if key = 3 then A becomes D, B becomes E, C becomes F, ...
+    def encode_into(self, buffer: Union[bytearray, memoryview]) -> None:
+        """
+        This method encodes the input writable buffer in place.
 
-    It is a variant of the affine cipher, for which the multiplicative key equals 1 \
-    and the additive key equals the input key.
-    """
-    def __init__(self, key: int):
-        super().__init__()
-        self.key: int = key
+        The buffer is translated window by window (see BYTES_WINDOW_SIZE), so that the temporary memory used does not \
+        depend on the buffer size. Any writable buffer can be used: bytearray, memoryview, mmap, ...
 
-    def _process(self, text: str, decode: bool) -> str:
-        processed_text: list[str] = []
+        :argument: buffer (writable bytes-like object)
+            The buffer to cipher.
+        """
+        self._process_into(buffer, decode=False)
 
-        key: int = self.key if not decode else -1 * self.key
+    def decode_into(self, buffer: Union[bytearray, memoryview]) -> None:
+        """
+        This method decodes the input writable buffer in place.
 
-        for char in text.upper():
-            if char.isalpha():
-                index: int = ord(char) + key % 26
-                if index > ord('Z'):
-                    index = index - 26
-                processed_text.append(chr(index))
-            else:
-                processed_text.append(char)
+        The buffer is translated window by window (see BYTES_WINDOW_SIZE), so that the temporary memory used does not \
+        depend on the buffer size. Any writable buffer can be used: bytearray, memoryview, mmap, ...
 
-        return ''.join(processed_text)
+        :argument: buffer (writable bytes-like object)
+            The buffer to decipher.
+        """
+        self._process_into(buffer, decode=True)
 
-    async def encode(self, plaintext: str) -> str:
+    def encode_sync(self, plaintext: str) -> str:
         """
         This method encodes the input text.
 
-        In this method should be the logic necessary to transform the initial plain text into its ciphered version.
+        This is the primary implementation: it needs no event loop, and calling it costs no coroutine. The async \
+        encode method wraps it.
 
         :argument: plaintext (str)
             The text to cipher.
@@ -134,13 +320,11 @@ class CaesarCipher(Cipher):
         :return: (str)
             The ciphered text.
         """
-        return self._process(plaintext, decode=False) if self.key != 0 else plaintext.upper()
+        return self._process(plaintext, decode=False)
 
-    async def decode(self, ciphertext: str) -> str:
+    def decode_sync(self, ciphertext: str) -> str:
         """
-        This method decodes the input text.
-
-        In this method should be the logic necessary to transform the initial ciphered text into its plain version.
+        This method decodes the input text (see encode_sync).
 
         :argument: ciphertext (str)
             The text to decipher.
@@ -150,6 +334,86 @@ class CaesarCipher(Cipher):
         """
         return self._process(ciphertext, decode=True)
 
+    def encode_many(self, plaintexts: Iterable[str]) -> list[str]:
+        """
+        This method encodes several texts.
+
+        Texts are joined and translated in a single call then split back, rather than processed one by one: for many \
+        short texts, the cost of the per-call overhead is saved. The result is the same as calling encode_sync on each \
+        text.
+
+        :argument: plaintexts (Iterable[str])
+            The texts to cipher.
+
+        :return: (list[str])
+            The ciphered texts, in the input order.
+        """
+        return self._process_many(list(plaintexts), decode=False)
+
+    def decode_many(self, ciphertexts: Iterable[str]) -> list[str]:
+        """
+        This method decodes several texts (see encode_many).
+
+        :argument: ciphertexts (Iterable[str])
+            The texts to decipher.
+
+        :return: (list[str])
+            The plain texts, in the input order.
+        """
+        return self._process_many(list(ciphertexts), decode=True)
+
+    async def encode(self, plaintext: str) -> str:
+        """This method encodes the input text, as a coroutine (see encode_sync)."""
+        return self.encode_sync(plaintext)
+
+    async def decode(self, ciphertext: str) -> str:
+        """This method decodes the input text, as a coroutine (see decode_sync)."""
+        return self.decode_sync(ciphertext)
+
+
+class AtbashCipher(Cipher):
+    """
+    Atbash cipher.
+
+    This is a mono-alphabetic substitution cipher.
+
+    The plain text alphabet is reversed to create the cipher text alphabet. In other words, the first letter of the \
+    alphabet is encrypted to the last letter of the alphabet, the second letter to the penultimate letter and so forth.
+
+    e.g. A becomes Z, B becomes Y, C becomes X, ...
+
+    It is a variant of the affine cipher, for which the multiplicative key equals -1 and the additive key equals the \
+    alphabet length minus 1 (25 for A to Z).
+    """
+    def __init__(self, *, alphabet: str = 'uppercase', preserve_case: bool = False):
+        super().__init__(alphabet=alphabet, preserve_case=preserve_case)
+        self._encode_table = self._decode_table = self._alphabet.table(self.alphabet, self.alphabet[::-1])
+
+
+class CaesarCipher(Cipher):
+    """
+    Caesar cipher.
+
+    This is a mono-alphabetic substitution cipher.
+
+    The plain text alphabet is shifted to create the cipher text alphabet. In other words, any letter L of the alphabet\
+    is encrypted to the L+Nth letter of the same alphabet (where N is the input key).
+
+    e.g. if key = 1 then A becomes B, B becomes C, C becomes D, ...
+    e.g. if key = 3 then A becomes D, B becomes E, C becomes F, ...
+
+    It is a variant of the affine cipher, for which the multiplicative key equals 1 \
+    and the additive key equals the input key.
+    """
+    def __init__(self, key: int, *, alphabet: str = 'uppercase', preserve_case: bool = False):
+        super().__init__(alphabet=alphabet, preserve_case=preserve_case)
+        self._key: int = key
+        self._encode_table, self._decode_table = _caesar_tables(key % len(self.alphabet), self._alphabet)
+
+    @property
+    def key(self) -> int:
+        return self._key
+
 
 class AffineCipher(Cipher):
     """
@@ -167,21 +431,247 @@ class AffineCipher(Cipher):
     - D(x) = c(x - b) mod m where c is the modular multiplicative inverse of a, b is the key and M the length of the alphabet.
     - c is the modular multiplicative inverse of a if: ac = 1 mod m.
 
-    For implementation's sake, the decryption algorithm in this class uses the same translation table as encryption.
+    For implementation's sake, the decryption algorithm in this class uses the inverse of the encryption translation \
+    table. Both tables are built once, at construction time.
+
+    m is the length of the cipher alphabet: 26 by default, 52 for 'both', 24 for the Greek alphabet, ...
     """
-    def __init__(self, keyA: int, keyB: int):
-        super().__init__()
-        self.keyA: int = keyA
-        self.keyB: int = keyB
+    def __init__(self, keyA: int, keyB: int, *, alphabet: str = 'uppercase', preserve_case: bool = False):
+        super().__init__(alphabet=alphabet, preserve_case=preserve_case)
+        self._keyA: int = keyA
+        self._keyB: int = keyB
         self._validate()
-        self._new_alphabet: str = ''.join(string.ascii_uppercase[(i * self.keyA + self.keyB) % len(string.ascii_uppercase)] for i in range(len(string.ascii_uppercase)))
+        length: int = len(self.alphabet)
+        self._new_alphabet: str = ''.join(self.alphabet[(i * self.keyA + self.keyB) % length] for i in range(length))
+        self._encode_table = self._alphabet.table(self.alphabet, self._new_alphabet)
+        self._decode_table = self._alphabet.table(self._new_alphabet, self.alphabet)
+
+    @property
+    def keyA(self) -> int:
+        return self._keyA
+
+    @property
+    def keyB(self) -> int:
+        return self._keyB
 
     def _validate(self) -> None:
-        if gcd(self.keyA, len(string.ascii_uppercase)) != 1:
-            raise ValueError(f'Input keyA={self.keyA} is not co-prime with alphabet length {len(string.ascii_uppercase)}.')
+        if gcd(self.keyA, len(self.alphabet)) != 1:
+            raise ValueError(f'Input keyA={self.keyA} is not co-prime with alphabet length {len(self.alphabet)}.')
 
-    async def encode(self, plaintext: str) -> str:
-        return str.translate(plaintext.upper(), str.maketrans(string.ascii_uppercase, self._new_alphabet))
 
-    async def decode(self, ciphertext: str) -> str:
-        return str.translate(ciphertext, str.maketrans(self._new_alphabet, string.ascii_uppercase))
+class SubstitutionCipher(Cipher):
+    """
+    Substitution cipher.
+
+    This is the general mono-alphabetic substitution cipher: the cipher text alphabet is any permutation of the plain \
+    text alphabet, given as the key.
+
+    e.g. if key = 'QWERTYUIOPASDFGHJKLZXCVBNM' then A becomes Q, B becomes W, C becomes E, ...
+
+    The Atbash, Caesar and Affine ciphers are special cases of this cipher.
+    """
+    def __init__(self, key: str, *, alphabet: str = 'uppercase', preserve_case: bool = False):
+        super().__init__(alphabet=alphabet, preserve_case=preserve_case)
+        self._key: str = self._alphabet.normalize(key)
+        self._validate()
+        self._encode_table = self._alphabet.table(self.alphabet, self._key)
+        self._decode_table = self._alphabet.table(self._key, self.alphabet)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def _validate(self) -> None:
+        if sorted(self._key) != sorted(self.alphabet):
+            raise ValueError(f"Input key='{self._key}' is not a permutation of the alphabet.")
+
+
+class CipherPipeline(SubstitutionCipher):
+    """
+    Cipher pipeline.
+
+    This chains several mono-alphabetic ciphers: the plain text is encoded by the first stage, its output by the second \
+    stage, and so forth. Decoding goes through the stages in reverse order.
+
+    Each stage being a permutation of the alphabet, so is the whole chain: the stages are composed into a single \
+    substitution table at construction time, so that a pipeline of any length costs a single pass over the text.
+
+    The stages must share their alphabet and case handling, which the pipeline takes on.
+
+    e.g. CipherPipeline([CaesarCipher(3), AffineCipher(5, 7), AtbashCipher()])
+    """
+    def __init__(self, stages: Iterable[Cipher]):
+        self._stages: tuple[Cipher, ...] = tuple(stages)
+        if not self._stages:
+            raise ValueError('Input stages must not be empty.')
+
+        first: Cipher = self._stages[0]
+        alphabet: str = first.alphabet
+        for stage in self._stages:
+            if stage._encode_table is None:
+                raise ValueError(f'Input stage {type(stage).__name__} is not a mono-alphabetic cipher.')
+            if stage._alphabet != first._alphabet:
+                raise ValueError(f'Input stage {type(stage).__name__} does not share the alphabet of the first stage.')
+            alphabet = str.translate(alphabet, stage._encode_table)
+
+        super().__init__(alphabet, alphabet=first.alphabet, preserve_case=first.preserve_case)
+
+    @property
+    def stages(self) -> tuple[Cipher, ...]:
+        return self._stages
+
+
+class VigenereCipher(Cipher):
+    """
+    Vigenere cipher.
+
+    This is a poly-alphabetic substitution cipher.
+
+    Each letter of the plain text is shifted, like with the Caesar cipher, by the letter of the key at the same \
+    position (A shifting by 0, B by 1, ...), the key being repeated as many times as necessary. Only letters consume \
+    the key: any other character is left unchanged and keeps the key position.
+
+    e.g. if key = 'LEMON' then ATTACK AT DAWN becomes LXFOPV EF RNHR.
+
+    With another alphabet, each letter of the key shifts by its position in that alphabet.
+
+    For performance's sake, letters are not processed one at a time: the letters at a same position modulo the key \
+    length are all shifted by the same letter of the key, so they are translated at once with a Caesar table. When \
+    NumPy is installed, ASCII texts of at least VIGENERE_NUMPY_THRESHOLD characters are processed as uint8 arrays \
+    instead, which does not depend on how letters and other characters alternate.
+    """
+    def __init__(self, key: str, *, alphabet: str = 'uppercase', preserve_case: bool = False):
+        super().__init__(alphabet=alphabet, preserve_case=preserve_case)
+        self._key: str = self._alphabet.normalize(key)
+        self._validate()
+        tables: list[tuple[dict[int, int], dict[int, int]]] = [
+            _caesar_tables(self.alphabet.index(letter), self._alphabet) for letter in self._key
+        ]
+        self._encode_tables: tuple[dict[int, int], ...] = tuple(table[0] for table in tables)
+        self._decode_tables: tuple[dict[int, int], ...] = tuple(table[1] for table in tables)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def _validate(self) -> None:
+        if not self._key or not set(self._key) <= set(self.alphabet):
+            raise ValueError(f"Input key='{self._key}' must be a non-empty string of letters.")
+
+    @functools.cached_property
+    def _vigenere_bytes_tables(self) -> tuple[tuple[bytes, ...], tuple[bytes, ...]]:
+        return (
+            tuple(map(self._alphabet.bytes_table, self._encode_tables)),
+            tuple(map(self._alphabet.bytes_table, self._decode_tables)),
+        )
+
+    @functools.cached_property
+    def _vigenere_arrays(self) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        encode_tables, decode_tables = (
+            np.frombuffer(b''.join(tables), dtype=np.uint8).reshape(len(tables), 256)
+            for tables in self._vigenere_bytes_tables
+        )
+        is_letter = np.array([self._alphabet.bytes_pattern.fullmatch(bytes([code])) is not None for code in range(256)])
+        return encode_tables, decode_tables, is_letter
+
+    def _use_numpy(self, text: AnyStr) -> bool:
+        return np is not None and len(text) >= VIGENERE_NUMPY_THRESHOLD and \
+            self._alphabet.bytes_pattern is not None and (isinstance(text, bytes) or text.isascii())
+
+    def _shift_letters(self, data: bytes, decode: bool, offset: int) -> tuple[bytes, int]:
+        """
+        This method ciphers the letters of an ASCII buffer with NumPy, the first one with the key letter at `offset`.
+
+        The letters are gathered with the letter mask of the alphabet, the ones at a same position modulo the key \
+        length are mapped at once through the byte table of their key letter, and they are scattered back.
+
+        :argument: data (bytes) ASCII text or binary buffer
+        :argument: decode (bool) whether the letters are deciphered
+        :argument: offset (int) key position of the first letter
+        :return: (tuple) ciphered buffer, number of letters
+        """
+        encode_tables, decode_tables, is_letter = self._vigenere_arrays
+        tables: 'np.ndarray' = decode_tables if decode else encode_tables
+        codes: 'np.ndarray' = np.frombuffer(data, dtype=np.uint8)
+        mask: 'np.ndarray' = is_letter[codes]
+        letters: 'np.ndarray' = codes[mask]
+
+        period: int = len(tables)
+        for position in range(min(period, len(letters))):
+            letters[position::period] = tables[(offset + position) % period][letters[position::period]]
+        processed: 'np.ndarray' = codes.copy()
+        processed[mask] = letters
+        return processed.tobytes(), len(letters)
+
+    def _process_letters(self, text: AnyStr, decode: bool, offset: int) -> tuple[AnyStr, int]:
+        """
+        This method ciphers the letters of the input text, the first one with the key letter at position `offset`.
+
+        Large ASCII texts are ciphered with NumPy (see _shift_letters). Otherwise, the text is split on its runs of \
+        letters: the letters are joined, the ones at a same position modulo the key length are translated at once \
+        with the table of their key letter, and the runs are put back between the untouched non-letter characters.
+
+        :argument: text (str | bytes) text converted to the case of the alphabet if needed (see _Alphabet.convert), or \
+            bytes
+        :argument: decode (bool) whether the letters are deciphered
+        :argument: offset (int) key position of the first letter
+        :return: (tuple) ciphered text, number of letters
+        """
+        if self._use_numpy(text):
+            if isinstance(text, str):
+                processed, count = self._shift_letters(text.encode('ascii'), decode, offset)
+                return processed.decode('ascii'), count
+            return self._shift_letters(text, decode, offset)
+
+        tables: tuple = self._tables(decode) if isinstance(text, str) else self._vigenere_bytes_tables[decode]
+        pattern: re.Pattern = self._alphabet.pattern if isinstance(text, str) else self._alphabet.bytes_pattern
+        parts: list[AnyStr] = pattern.split(text)
+        runs: list[AnyStr] = parts[1::2]
+        letters: AnyStr = text[:0].join(runs)
+
+        period: int = len(tables)
+        result: Union[list[str], bytearray] = [''] * len(letters) if isinstance(text, str) else bytearray(len(letters))
+        for position in range(min(period, len(letters))):
+            result[position::period] = letters[position::period].translate(tables[(offset + position) % period])
+        processed: AnyStr = ''.join(result) if isinstance(text, str) else bytes(result)
+
+        if len(processed) != len(text):
+            ends: list[int] = list(itertools.accumulate(map(len, runs)))
+            parts[1::2] = map(processed.__getitem__, map(slice, [0, *ends[:-1]], ends))
+            processed = text[:0].join(parts)
+        return processed, len(letters)
+
+    def _tables(self, decode: bool) -> tuple:
+        return self._decode_tables if decode else self._encode_tables
+
+    def _process(self, text: str, decode: bool) -> str:
+        return self._process_letters(self._alphabet.convert(text), decode, 0)[0]
+
+    def _process_many(self, texts: list[str], decode: bool) -> list[str]:
+        # the key restarts with each text: texts cannot be processed as a single one
+        return [self._process(text, decode) for text in texts]
+
+    def _process_bytes(self, data: Union[bytes, bytearray, memoryview], decode: bool) -> bytes:
+        return self._stream_bytes(decode)(data)
+
+    def _stream(self, decode: bool) -> Callable[[str], str]:
+        offset: int = 0
+
+        def process(text: str) -> str:
+            nonlocal offset
+            processed, letters = self._process_letters(self._alphabet.convert(text), decode, offset)
+            offset += letters
+            return processed
+
+        return process
+
+    def _stream_bytes(self, decode: bool) -> Callable[[Union[bytes, bytearray, memoryview]], bytes]:
+        offset: int = 0
+
+        def process(data: Union[bytes, bytearray, memoryview]) -> bytes:
+            nonlocal offset
+            processed, letters = self._process_letters(bytes(data), decode, offset)
+            offset += letters
+            return processed
+
+        return process
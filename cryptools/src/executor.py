@@ -0,0 +1,137 @@
+import asyncio
+import concurrent.futures
+from typing import Any, Callable, Optional
+
+from .cryptools import Cipher
+
+
+OFFLOAD_THRESHOLD: int = 256 * 1024
+OFFLOAD_WORKERS: int = 4
+OFFLOAD_WINDOW: int = 256 * 1024
+
+
+def _process_windows(cipher: Cipher, text: str, decode: bool, window: int) -> str:
+    """
+    This function ciphers the input text window by window.
+
+    str.translate holds the GIL for its whole duration: translating a large text in windows lets the event loop thread \
+    run between two windows. The windows are processed in order by the cipher stream (see Cipher._stream), so the \
+    result is the same as a single translation.
+    """
+    process: Callable[[str], str] = cipher._stream(decode)
+    return ''.join(process(text[start:start + window]) for start in range(0, len(text), window))
+
+
+class CipherExecutor:
+    """
+    Cipher executor.
+
+    This runs cipher work either inline, on the event loop, or in a worker pool through run_in_executor.
+
+    Texts shorter than `threshold` characters are processed inline: handing them to a pool would cost more than the \
+    work itself. Longer texts are sent to a thread pool (or to a process pool if `processes` is set), so that a large \
+    request does not block every other connection while it is being processed.
+
+    Pools are created on first use, so that an executor can be built before the server forks its workers.
+    """
+    def __init__(self, threshold: int = OFFLOAD_THRESHOLD, workers: int = OFFLOAD_WORKERS, processes: bool = False):
+        if threshold < 0:
+            raise ValueError(f'Input threshold={threshold} must be a positive integer')
+        if workers < 1:
+            raise ValueError(f'Input workers={workers} must be a positive integer')
+        self.threshold: int = threshold
+        self.workers: int = workers
+        self.processes: bool = processes
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self.inline: int = 0
+        self.offloaded: int = 0
+        self.pending: int = 0
+
+    @property
+    def pool(self) -> concurrent.futures.Executor:
+        if self._pool is None:
+            if self.processes:
+                self._pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix='cipher')
+        return self._pool
+
+    async def run(self, cipher: Cipher, text: str, decode: bool) -> str:
+        """
+        This method ciphers the input text, inline or in the worker pool depending on its length.
+
+        :argument: cipher (Cipher)
+            The cipher to use.
+        :argument: text (str)
+            The text to cipher or decipher.
+        :argument: decode (bool)
+            Whether the text is deciphered.
+
+        :return: (str)
+            The processed text.
+        """
+        if len(text) < self.threshold:
+            self.inline += 1
+            return cipher.decode_sync(text) if decode else cipher.encode_sync(text)
+        return await self.call(len(text), _process_windows, cipher, text, decode, OFFLOAD_WINDOW)
+
+    async def run_many(self, cipher: Cipher, texts: list[str], decode: bool) -> list[str]:
+        """
+        This method ciphers several texts at once (see Cipher.encode_many), inline or in the worker pool depending on \
+        their total length.
+
+        :argument: cipher (Cipher)
+            The cipher to use.
+        :argument: texts (list[str])
+            The texts to cipher or decipher.
+        :argument: decode (bool)
+            Whether the texts are deciphered.
+
+        :return: (list[str])
+            The processed texts, in the input order.
+        """
+        return await self.call(sum(map(len, texts)), cipher.decode_many if decode else cipher.encode_many, texts)
+
+    async def call(self, size: int, function: Callable, *args: Any) -> Any:
+        """
+        This method calls the input function, inline or in the worker pool depending on the size of its input.
+
+        With a process pool, the function and its arguments must be picklable.
+
+        :argument: size (int)
+            The size of the function input, compared with the threshold.
+        :argument: function (Callable)
+            The function to call.
+        :argument: args (Any)
+            The function arguments.
+
+        :return: (Any)
+            The function result.
+        """
+        if size < self.threshold:
+            self.inline += 1
+            return function(*args)
+
+        self.offloaded += 1
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """This method shuts the worker pool down, waiting for the pending work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def stats(self) -> dict[str, int]:
+        """This method returns the executor configuration, inline / offloaded counters and queue depth."""
+        return {
+            'threshold': self.threshold,
+            'workers': self.workers,
+            'processes': int(self.processes),
+            'inline': self.inline,
+            'offloaded': self.offloaded,
+            'pending': self.pending,
+        }
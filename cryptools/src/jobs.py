@@ -0,0 +1,314 @@
+from collections import OrderedDict
+import codecs
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+import uuid
+
+from .cryptools import Cipher
+
+
+JOB_WORKERS: int = 2
+JOB_MAX_PENDING: int = 16
+JOB_TTL: float = 600.0
+JOB_STORE_SIZE: int = 1024 ** 3
+JOB_SPILL_THRESHOLD: int = 16 * 1024 ** 2
+JOB_WINDOW: int = 1024 ** 2
+
+
+def _encode(text: str) -> bytes:
+    """This function encodes an output text in UTF-8, restoring the undecodable bytes of an input given as bytes."""
+    try:
+        return text.encode('utf-8', errors='surrogateescape')
+    except UnicodeEncodeError:
+        return text.encode('utf-8', errors='surrogatepass')
+
+
+def _windows(text: Union[str, bytes, list[bytes]], size: int) -> Iterator[Union[str, memoryview, bytes]]:
+    """
+    This function splits a text into windows of about `size` characters or bytes.
+
+    A text given as a list of byte chunks (e.g. a request body as received) is joined window by window, never as a \
+    whole: the list is emptied as the windows are produced, so that the chunks already processed are freed.
+    """
+    if not isinstance(text, list):
+        view: Union[str, memoryview] = memoryview(text) if isinstance(text, bytes) else text
+        for start in range(0, len(view), size):
+            yield view[start:start + size]
+        return
+    text.reverse()
+    window: list[bytes] = []
+    length: int = 0
+    while text:
+        window.append(text.pop())
+        length += len(window[-1])
+        if length >= size:
+            yield b''.join(window)
+            window, length = [], 0
+    if window:
+        yield b''.join(window)
+
+
+class Job:
+    """
+    Cipher job.
+
+    A job is pending until a worker picks it up, then running until its whole text is processed (done) or an error \
+    occurs (failed). Its progress is the share of the input processed so far, updated after each window.
+
+    The result is the UTF-8 encoded output, held either in memory, as a list of chunks, or in a temporary file.
+    """
+    __slots__ = (
+        'id', 'cipher', 'decode', 'size', 'status', 'processed', 'error', 'created', 'finished', 'result_size',
+        '_chunks', '_path',
+    )
+
+    def __init__(self, cipher: Cipher, decode: bool, size: int):
+        self.id: str = uuid.uuid4().hex
+        self.cipher: Cipher = cipher
+        self.decode: bool = decode
+        self.size: int = size
+        self.status: str = 'pending'
+        self.processed: int = 0
+        self.error: Optional[str] = None
+        self.created: float = time.monotonic()
+        self.finished: Optional[float] = None
+        self.result_size: int = 0
+        self._chunks: Optional[list[bytes]] = None
+        self._path: Optional[str] = None
+
+    @property
+    def progress(self) -> float:
+        return self.processed / self.size if self.size else float(self.status == 'done')
+
+    @property
+    def spilled(self) -> bool:
+        return self._path is not None
+
+    def result(self, chunk_size: int = JOB_WINDOW) -> Iterator[bytes]:
+        """
+        This method iterates over the result of a finished job, in chunks.
+
+        A spilled result is read from its file, which stays readable until the iteration ends even if the job is \
+        evicted meanwhile.
+
+        :argument: chunk_size (int) the size of the chunks read from a spilled result
+        :return: (Iterator[bytes]) the result chunks
+        """
+        if self._path is None:
+            yield from self._chunks or ()
+            return
+        with open(self._path, 'rb') as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    def describe(self) -> dict:
+        """This method returns the job status, as sent to the clients."""
+        status: dict = {
+            'id': self.id,
+            'status': self.status,
+            'progress': round(self.progress, 4),
+            'size': self.size,
+            'processed': self.processed,
+        }
+        if self.status == 'done':
+            status['result_size'] = self.result_size
+        if self.error is not None:
+            status['error'] = self.error
+        return status
+
+    def _discard(self) -> None:
+        self._chunks = None
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+class JobStore:
+    """
+    Job store.
+
+    Jobs are submitted with `submit` and run in a pool of `workers` threads, at most `max_pending` of them being \
+    pending or running at once: `accepts` tells whether another job may be submitted. Each job ciphers its text window \
+    by window (see Cipher._stream), so that its progress can be followed and large texts given as bytes are decoded \
+    incrementally, off the event loop.
+
+    Finished jobs are kept `ttl` seconds, then dropped. The results are bounded by their total size (`maxbytes`): once \
+    it is exceeded, the oldest finished jobs are dropped. When a `spill_directory` is given, the results of texts \
+    longer than `spill_threshold` are written to temporary files there instead of being held in memory.
+
+    The pool is created on first use, so that a store can be built before the server forks its workers.
+    """
+    def __init__(
+            self,
+            workers: int = JOB_WORKERS,
+            max_pending: int = JOB_MAX_PENDING,
+            ttl: float = JOB_TTL,
+            maxbytes: int = JOB_STORE_SIZE,
+            spill_directory: Optional[str] = None,
+            spill_threshold: int = JOB_SPILL_THRESHOLD,
+    ):
+        if workers < 1:
+            raise ValueError(f'Input workers={workers} must be a positive integer')
+        if max_pending < 1:
+            raise ValueError(f'Input max_pending={max_pending} must be a positive integer')
+        if ttl <= 0:
+            raise ValueError(f'Input ttl={ttl} must be a positive number')
+        if maxbytes < 1:
+            raise ValueError(f'Input maxbytes={maxbytes} must be a positive integer')
+        if spill_directory is not None and not os.path.isdir(spill_directory):
+            raise ValueError(f'Input spill_directory={spill_directory!r} must be an existing directory')
+        self.workers: int = workers
+        self.max_pending: int = max_pending
+        self.ttl: float = ttl
+        self.maxbytes: int = maxbytes
+        self.spill_directory: Optional[str] = spill_directory
+        self.spill_threshold: int = spill_threshold
+        self._jobs: dict[str, Job] = {}
+        self._finished: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.active: int = 0
+        self.size: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix='job')
+        return self._pool
+
+    def accepts(self) -> bool:
+        """This method returns whether a job may be submitted, i.e. whether fewer than max_pending are unfinished."""
+        return self.active < self.max_pending
+
+    def submit(self, cipher: Cipher, text: Union[str, bytes, list[bytes]], decode: bool) -> Job:
+        """
+        This method submits a job ciphering the input text.
+
+        :argument: cipher (Cipher) the cipher to use
+        :argument: text (Union[str, bytes, list[bytes]]) the text to cipher or decipher; bytes, possibly as a list of \
+            chunks which is then consumed by the job, are decoded as UTF-8, the invalid bytes being passed through \
+            untouched
+        :argument: decode (bool) whether the text is deciphered
+        :return: (Job) the submitted job
+        """
+        self.expire()
+        job = Job(cipher, decode, sum(map(len, text)) if isinstance(text, list) else len(text))
+        with self._lock:
+            self._jobs[job.id] = job
+            self.active += 1
+        self.pool.submit(self._run, job, text)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """This method returns the job matching the input id, or None if it is unknown, expired or evicted."""
+        self.expire()
+        return self._jobs.get(job_id)
+
+    def _run(self, job: Job, text: Union[str, bytes, list[bytes]]) -> None:
+        job.status = 'running'
+        file: Optional[BinaryIO] = None
+        chunks: list[bytes] = []
+        try:
+            if self.spill_directory is not None and job.size >= self.spill_threshold:
+                file = tempfile.NamedTemporaryFile(dir=self.spill_directory, prefix='job-', delete=False)
+                job._path = file.name
+            write: Callable[[bytes], object] = file.write if file is not None else chunks.append
+
+            process: Callable[[str], str] = job.cipher._stream(job.decode)
+            decoder: Optional[codecs.IncrementalDecoder] = None
+            if not isinstance(text, str):
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape')
+            for window in _windows(text, JOB_WINDOW):
+                size: int = len(window)
+                if decoder is not None:
+                    window = decoder.decode(window, job.processed + size >= job.size)
+                output: bytes = _encode(process(window))
+                write(output)
+                job.result_size += len(output)
+                job.processed += size
+            if file is not None:
+                file.close()
+            job._chunks = chunks
+            status: str = 'done'
+        except Exception as exc:
+            if file is not None:
+                file.close()
+            job._discard()
+            job.result_size = 0
+            job.error, status = f'{type(exc).__name__}: {exc}', 'failed'
+        self._finish(job, status)
+
+    def _finish(self, job: Job, status: str) -> None:
+        with self._lock:
+            job.status, job.finished = status, time.monotonic()
+            self.active -= 1
+            if job.id not in self._jobs:
+                job._discard()
+                return
+            self._finished[job.id] = job
+            self.size += job.result_size
+            while self.size > self.maxbytes and self._finished:
+                _, evicted = self._finished.popitem(last=False)
+                self._drop(evicted)
+                self.evictions += 1
+
+    def _drop(self, job: Job) -> None:
+        del self._jobs[job.id]
+        self.size -= job.result_size
+        job._discard()
+
+    def expire(self) -> None:
+        """This method drops the jobs finished for more than ttl seconds."""
+        deadline: float = time.monotonic() - self.ttl
+        with self._lock:
+            while self._finished:
+                job: Job = next(iter(self._finished.values()))
+                if job.finished > deadline:
+                    break
+                del self._finished[job.id]
+                self._drop(job)
+                self.expirations += 1
+
+    def shutdown(self) -> None:
+        """This method stops the workers, cancelling the pending jobs, then drops every job and its result."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        with self._lock:
+            for job in self._jobs.values():
+                job._discard()
+            self._jobs.clear()
+            self._finished.clear()
+            self.active = self.size = 0
+
+    def stats(self) -> dict[str, int]:
+        """This method returns the store bounds, the jobs by status, the results size and the drop counters."""
+        statuses: dict[str, int] = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        spilled: int = 0
+        with self._lock:
+            for job in self._jobs.values():
+                statuses[job.status] += 1
+                spilled += job.spilled
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'jobs': len(self._jobs),
+            **statuses,
+            'spilled': spilled,
+            'bytes': self.size,
+            'maxbytes': self.maxbytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
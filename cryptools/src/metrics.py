@@ -0,0 +1,230 @@
+"""
+Request metrics in the Prometheus text exposition format.
+
+Metrics are updated from the event loop thread only (handlers and the loop lag probe), so plain integers and lists are \
+enough: no lock is taken on the request path. Recording a request costs a few dictionary lookups and one bisection \
+per histogram.
+"""
+import asyncio
+import bisect
+from collections import defaultdict
+import time
+from typing import Iterable, Optional
+
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+LAG_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+LAG_INTERVAL: float = 0.5
+PREFIX: str = 'cryptools'
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[Labels, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_family(name: str, kind: str, description: str, samples: Iterable[Sample]) -> list[str]:
+    """
+    This function formats a metric family in the Prometheus text format.
+
+    :argument: name (str) metric name, without the prefix
+    :argument: kind (str) counter, gauge or histogram
+    :argument: description (str) help text
+    :argument: samples (Iterable[Sample]) (labels, value) pairs; histograms are given as Histogram values
+    :return: (list[str]) lines of the family
+    """
+    name = f'{PREFIX}_{name}'
+    lines: list[str] = [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+    for labels, value in samples:
+        if isinstance(value, Histogram):
+            lines.extend(value.format(name, labels))
+        else:
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return lines
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets.
+
+    The bucket counts are stored non-cumulative (one bisection and one increment per observation) and accumulated when \
+    they are formatted. A value equal to a bucket bound falls in that bucket, as in Prometheus.
+    """
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def format(self, name: str, labels: Labels) -> list[str]:
+        lines: list[str] = []
+        cumulative: int = 0
+        for bound, count in zip((*self.bounds, float('inf')), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels((*labels, ('le', _format_value(bound))))} {cumulative}")
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(self.sum)}')
+        lines.append(f'{name}_count{_format_labels(labels)} {self.count}')
+        return lines
+
+
+class PhaseTimer:
+    """
+    Context manager adding the duration of its block to a phase of a request.
+
+    This is a plain class rather than a contextlib.contextmanager generator, which costs twice as much per block.
+    """
+    __slots__ = ('phases', 'name', 'start')
+
+    def __init__(self, phases: dict[str, float], name: str):
+        self.phases: dict[str, float] = phases
+        self.name: str = name
+        self.start: float = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.phases[self.name] = self.phases.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class Metrics:
+    """
+    Request metrics.
+
+    Handlers report each request once it is finished with `observe_request`: its route, status code, total duration, \
+    the duration of its phases (e.g. parse, cipher, serialize), the bytes read and written and its error kind, if any.
+
+    The event loop lag is the delay with which a callback scheduled every `LAG_INTERVAL` seconds actually runs: a \
+    handler blocking the loop for 200 ms shows up as a 200 ms lag.
+    """
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets: tuple[float, ...] = buckets
+        self.requests: defaultdict[tuple[str, int], int] = defaultdict(int)
+        self.latency: dict[str, Histogram] = {}
+        self.phases: dict[tuple[str, str], Histogram] = {}
+        self.bytes_in: defaultdict[str, int] = defaultdict(int)
+        self.bytes_out: defaultdict[str, int] = defaultdict(int)
+        self.errors: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.loop_lag: Histogram = Histogram(LAG_BUCKETS)
+        self.last_loop_lag: float = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._probe: Optional[asyncio.TimerHandle] = None
+
+    def observe_request(
+            self,
+            route: str,
+            code: int,
+            duration: float,
+            phases: dict[str, float],
+            bytes_in: int,
+            bytes_out: int,
+            error: Optional[str] = None
+    ) -> None:
+        self.requests[route, code] += 1
+        histogram: Optional[Histogram] = self.latency.get(route)
+        if histogram is None:
+            histogram = self.latency[route] = Histogram(self.buckets)
+        histogram.observe(duration)
+        for phase, phase_duration in phases.items():
+            histogram = self.phases.get((route, phase))
+            if histogram is None:
+                histogram = self.phases[route, phase] = Histogram(self.buckets)
+            histogram.observe(phase_duration)
+        self.bytes_in[route] += bytes_in
+        self.bytes_out[route] += bytes_out
+        if error is not None:
+            self.errors[route, error] += 1
+
+    def monitor(self, loop: asyncio.AbstractEventLoop, interval: float = LAG_INTERVAL) -> None:
+        """
+        This method starts measuring the lag of the input event loop, if it is not measured yet.
+
+        :argument: loop (asyncio.AbstractEventLoop) the loop running the handlers
+        :argument: interval (float) seconds between two measures
+        """
+        if self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+
+        def probe(expected: float) -> None:
+            lag: float = max(0.0, loop.time() - expected)
+            self.loop_lag.observe(lag)
+            self.last_loop_lag = lag
+            self._probe = loop.call_at(loop.time() + interval, probe, loop.time() + interval)
+
+        self._probe = loop.call_at(loop.time() + interval, probe, loop.time() + interval)
+
+    def stop(self) -> None:
+        if self._probe is not None:
+            self._probe.cancel()
+        self._loop = self._probe = None
+
+    def render(self, extra: Iterable[tuple[str, str, str, Iterable[Sample]]] = ()) -> str:
+        """
+        This method returns all the metrics in the Prometheus text format.
+
+        :argument: extra (Iterable[tuple]) other families, as (name, kind, description, samples), e.g. gauges read \
+            from other components at scrape time
+        :return: (str)
+        """
+        families: list[tuple[str, str, str, Iterable[Sample]]] = [
+            (
+                'requests_total', 'counter', 'Requests handled, by route and status code.',
+                [((('route', route), ('code', str(code))), count) for (route, code), count in sorted(self.requests.items())]
+            ),
+            (
+                'request_duration_seconds', 'histogram', 'Request duration, from its start to its end.',
+                [((('route', route),), histogram) for route, histogram in sorted(self.latency.items())]
+            ),
+            (
+                'request_phase_seconds', 'histogram', 'Duration of each request phase: parse, cipher and serialize.',
+                [
+                    ((('route', route), ('phase', phase)), histogram)
+                    for (route, phase), histogram in sorted(self.phases.items())
+                ]
+            ),
+            (
+                'request_bytes_total', 'counter', 'Request body bytes read.',
+                [((('route', route),), count) for route, count in sorted(self.bytes_in.items())]
+            ),
+            (
+                'response_bytes_total', 'counter', 'Response body bytes written.',
+                [((('route', route),), count) for route, count in sorted(self.bytes_out.items())]
+            ),
+            (
+                'errors_total', 'counter', 'Failed requests, by route and error kind.',
+                [((('route', route), ('kind', kind)), count) for (route, kind), count in sorted(self.errors.items())]
+            ),
+            ('event_loop_lag_seconds', 'histogram', 'Delay of a periodic event loop callback.', [((), self.loop_lag)]),
+            ('event_loop_last_lag_seconds', 'gauge', 'Delay of the last periodic event loop callback.',
+             [((), self.last_loop_lag)]),
+            *extra,
+        ]
+        lines: list[str] = []
+        for name, kind, description, samples in families:
+            lines.extend(format_family(name, kind, description, samples))
+        return '\n'.join(lines) + '\n'
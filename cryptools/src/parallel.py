@@ -0,0 +1,151 @@
+import concurrent.futures
+from multiprocessing import shared_memory
+import os
+from typing import Optional, Union
+
+from .cryptools import Cipher, BYTES_WINDOW_SIZE
+
+
+SHARD_SIZE: int = 16 * 1024 ** 2
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """This function attaches to an existing shared memory block, leaving its lifetime to the process that created it."""
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13: the block gets registered again, to the resource tracker shared with the parent process
+        return shared_memory.SharedMemory(name)
+
+
+def _translate_shard(name: str, start: int, end: int, table: bytes) -> None:
+    """This function translates, in place, the [start, end) slice of a shared memory block (run in worker processes)."""
+    memory = _attach(name)
+    try:
+        for offset in range(start, end, BYTES_WINDOW_SIZE):
+            with memory.buf[offset:min(offset + BYTES_WINDOW_SIZE, end)] as window:
+                window[:] = window.tobytes().translate(table)
+    finally:
+        memory.close()
+
+
+class ParallelCipher:
+    """
+    Parallel cipher engine.
+
+    This wraps a cipher to process large binary buffers on several cores.
+
+    Ciphers are stateless per character, so a buffer is split into shards translated independently by worker processes. \
+    The buffer is placed in a shared memory block which workers translate in place: only the block name, the shard \
+    bounds and the 256-byte translation table are sent to the workers, never the text itself.
+
+    Buffers smaller than one shard are processed in the calling process.
+
+    Only mono-alphabetic ciphers, translated with a single byte table, can be sharded: position-dependent ciphers \
+    (e.g. VigenereCipher) are rejected.
+
+    e.g.
+        with ParallelCipher(CaesarCipher(3), workers=8) as cipher:
+            ciphertext = cipher.encode_bytes(plaintext)
+    """
+    def __init__(self, cipher: Cipher, workers: Optional[int] = None, shard_size: int = SHARD_SIZE):
+        if shard_size < 1:
+            raise ValueError(f'Input shard_size={shard_size} must be a positive integer')
+        if cipher._encode_table is None or cipher._decode_table is None:
+            raise ValueError(f'Input cipher {type(cipher).__name__} has no single translation table to shard')
+        self.cipher: Cipher = cipher
+        self.workers: int = workers or os.cpu_count() or 1
+        self.shard_size: int = shard_size
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ParallelCipher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    @property
+    def pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        """This method stops the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _process_shared(self, memory: shared_memory.SharedMemory, size: int, decode: bool) -> None:
+        table: bytes = self.cipher._bytes_tables[decode]
+        futures = [
+            self.pool.submit(_translate_shard, memory.name, start, min(start + self.shard_size, size), table)
+            for start in range(0, size, self.shard_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def _process_bytes(self, data: Union[bytes, bytearray, memoryview], decode: bool) -> bytes:
+        with memoryview(data) as view, view.cast('B') as buffer:
+            size: int = len(buffer)
+            if size <= self.shard_size:
+                return bytes(self.cipher._process_bytes(buffer, decode))
+            memory = shared_memory.SharedMemory(create=True, size=size)
+            memory.buf[:size] = buffer
+
+        try:
+            self._process_shared(memory, size, decode)
+            return bytes(memory.buf[:size])
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def encode_bytes(self, plaintext: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        This method encodes the input binary buffer on several cores.
+
+        :argument: plaintext (bytes-like object)
+            The buffer to cipher.
+
+        :return: (bytes)
+            The ciphered buffer.
+        """
+        return self._process_bytes(plaintext, decode=False)
+
+    def decode_bytes(self, ciphertext: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        This method decodes the input binary buffer on several cores.
+
+        :argument: ciphertext (bytes-like object)
+            The buffer to decipher.
+
+        :return: (bytes)
+            The plain buffer.
+        """
+        return self._process_bytes(ciphertext, decode=True)
+
+    def encode_shared(self, memory: shared_memory.SharedMemory, size: Optional[int] = None) -> None:
+        """
+        This method encodes, in place, the content of a shared memory block on several cores.
+
+        No copy at all is made: this is the fastest way to process a buffer the caller already holds in shared memory.
+
+        :argument: memory (SharedMemory)
+            The shared memory block to cipher.
+        :argument: size (Optional[int])
+            The number of bytes to cipher from the start of the block, the whole block if not set.
+        """
+        self._process_shared(memory, memory.size if size is None else size, decode=False)
+
+    def decode_shared(self, memory: shared_memory.SharedMemory, size: Optional[int] = None) -> None:
+        """
+        This method decodes, in place, the content of a shared memory block on several cores.
+
+        No copy at all is made: this is the fastest way to process a buffer the caller already holds in shared memory.
+
+        :argument: memory (SharedMemory)
+            The shared memory block to decipher.
+        :argument: size (Optional[int])
+            The number of bytes to decipher from the start of the block, the whole block if not set.
+        """
+        self._process_shared(memory, memory.size if size is None else size, decode=True)
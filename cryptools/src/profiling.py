@@ -0,0 +1,221 @@
+"""
+Opt-in request profiling.
+
+A request is profiled when it asks for it with the `X-Profile` header (if the profiler accepts it), or when it is \
+sampled at the profiler rate. Its handler then runs under cProfile, tracemalloc or both, from prepare() to finish(): \
+the profile holds the function statistics, the duration of the request phases (parse, cipher, serialize) and the peak \
+traced memory with the top allocation sites.
+
+cProfile and tracemalloc trace the whole process: a single request is profiled at a time, and its profile includes \
+whatever else ran on the event loop meanwhile. Nothing is traced between profiled requests.
+"""
+from collections import OrderedDict
+import cProfile
+import datetime
+import io
+import json
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from typing import Optional
+import uuid
+
+
+PROFILE_HEADER: str = 'X-Profile'
+SUMMARY_HEADER: str = 'X-Profile-Summary'
+PROFILE_MODES: tuple[str, ...] = ('cpu', 'memory')
+PROFILE_KEEP: int = 100
+TOP_ALLOCATIONS: int = 10
+
+
+class _Statistics:
+    """Marshalled function statistics, as pstats.Stats loads them: an object with a create_stats method and stats."""
+    def __init__(self, data: bytes):
+        self.stats: dict = marshal.loads(data)
+
+    def create_stats(self) -> None:
+        pass
+
+
+class Profile:
+    """
+    Profile of a single request.
+
+    :argument: modes (frozenset[str]) `cpu` for cProfile, `memory` for tracemalloc
+    """
+    def __init__(self, modes: frozenset[str]):
+        self.id: str = uuid.uuid4().hex
+        self.modes: frozenset[str] = modes
+        self.profile: Optional[cProfile.Profile] = cProfile.Profile() if 'cpu' in modes else None
+        self.metadata: dict = {}
+        self.stats: Optional[bytes] = None
+        self._tracing: bool = False
+        self._start: float = 0.0
+
+    def start(self) -> None:
+        if 'memory' in self.modes:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._tracing = True
+        self._start = time.perf_counter()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self, route: str, method: str, status: int, phases: dict[str, float]) -> None:
+        """
+        This method stops the profile and records its metadata.
+
+        :argument: route (str) the request path
+        :argument: method (str) the request method
+        :argument: status (int) the response status
+        :argument: phases (dict[str, float]) the duration of the request phases, in seconds
+        """
+        if self.profile is not None:
+            self.profile.disable()
+        duration: float = time.perf_counter() - self._start
+        self.metadata = {
+            'id': self.id,
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'route': route,
+            'method': method,
+            'status': status,
+            'modes': sorted(self.modes),
+            'duration': duration,
+            'phases': dict(phases),
+        }
+        if 'memory' in self.modes:
+            snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+            self.metadata['peak'] = tracemalloc.get_traced_memory()[1]
+            self.metadata['allocations'] = [
+                {'site': str(statistic.traceback), 'size': statistic.size, 'count': statistic.count}
+                for statistic in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+            ]
+            if self._tracing:
+                tracemalloc.stop()
+        if self.profile is not None:
+            self.profile.create_stats()
+            self.stats = marshal.dumps(self.profile.stats)
+            self.profile = None
+
+    def summary(self) -> str:
+        """This method returns the profile summary sent as a response header, e.g. `id=...; total=1.2ms; peak=4096B`."""
+        parts: list[str] = [f"id={self.id}", f"total={self.metadata['duration'] * 1e3:.3f}ms"]
+        parts.extend(f'{phase}={duration * 1e3:.3f}ms' for phase, duration in self.metadata['phases'].items())
+        if 'peak' in self.metadata:
+            parts.append(f"peak={self.metadata['peak']}B")
+        return '; '.join(parts)
+
+    def report(self, sort: str = 'cumulative', limit: int = 30) -> str:
+        """This method returns the function statistics as text, as printed by pstats, or an empty string."""
+        if self.stats is None:
+            return ''
+        stream = io.StringIO()
+        stats = pstats.Stats(_Statistics(self.stats), stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+class Profiler:
+    """
+    Request profiler.
+
+    Requests are profiled when sampled (`rate`, from 0 to 1, in the `modes` given) or, if `allow_header` is set, when \
+    they send the `X-Profile` header with the modes wanted (e.g. `X-Profile: cpu,memory`). The last `keep` profiles are \
+    held in memory and, if a `directory` is given, written there: `<id>.prof` (pstats format, e.g. for snakeviz) and \
+    `<id>.json` (metadata). The profiles of older requests are deleted.
+
+    e.g. Profiler(rate=0.01) profiles the CPU of 1% of the requests.
+    """
+    def __init__(
+            self,
+            rate: float = 0.0,
+            allow_header: bool = False,
+            directory: Optional[str] = None,
+            keep: int = PROFILE_KEEP,
+            modes: tuple[str, ...] = ('cpu',),
+    ):
+        if not 0 <= rate <= 1:
+            raise ValueError(f'Input rate={rate} must be between 0 and 1')
+        if keep < 1:
+            raise ValueError(f'Input keep={keep} must be a positive integer')
+        if not modes or not set(modes) <= set(PROFILE_MODES):
+            raise ValueError(f"Input modes={modes} must be among {', '.join(PROFILE_MODES)}")
+        if directory is not None and not os.path.isdir(directory):
+            raise ValueError(f'Input directory={directory!r} must be an existing directory')
+        self.rate: float = rate
+        self.allow_header: bool = allow_header
+        self.directory: Optional[str] = directory
+        self.keep: int = keep
+        self.modes: frozenset[str] = frozenset(modes)
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._active: bool = False
+        self._lock = threading.Lock()
+        self.skipped: int = 0
+
+    def start(self, header: Optional[str]) -> Optional[Profile]:
+        """
+        This method starts profiling a request, if it asks for it or is sampled.
+
+        :argument: header (Optional[str]) the X-Profile header of the request
+        :return: (Optional[Profile]) the started profile, None if the request is not profiled
+        """
+        modes: frozenset[str] = frozenset()
+        if header is not None and self.allow_header:
+            modes = frozenset(mode.strip() for mode in header.lower().split(',')) & set(PROFILE_MODES)
+        if not modes and self.rate and random.random() < self.rate:
+            modes = self.modes
+        if not modes:
+            return None
+        with self._lock:
+            if self._active:
+                self.skipped += 1
+                return None
+            self._active = True
+        profile = Profile(modes)
+        profile.start()
+        return profile
+
+    def stop(self, profile: Profile, route: str, method: str, status: int, phases: dict[str, float]) -> None:
+        """This method stops the input profile (see Profile.stop), then keeps it and writes it if so configured."""
+        try:
+            profile.stop(route, method, status, phases)
+        finally:
+            with self._lock:
+                self._active = False
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.keep:
+                _, dropped = self._profiles.popitem(last=False)
+                self._remove(dropped)
+        if self.directory is not None:
+            self._write(profile)
+
+    def _write(self, profile: Profile) -> None:
+        if profile.stats is not None:
+            with open(os.path.join(self.directory, f'{profile.id}.prof'), 'wb') as file:
+                file.write(profile.stats)
+        with open(os.path.join(self.directory, f'{profile.id}.json'), 'w') as file:
+            json.dump(profile.metadata, file, indent=2)
+
+    def _remove(self, profile: Profile) -> None:
+        if self.directory is None:
+            return
+        for extension in ('prof', 'json'):
+            try:
+                os.unlink(os.path.join(self.directory, f'{profile.id}.{extension}'))
+            except OSError:
+                pass
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def profiles(self) -> list[dict]:
+        """This method returns the metadata of the kept profiles, most recent first."""
+        with self._lock:
+            return [profile.metadata for profile in reversed(self._profiles.values())]
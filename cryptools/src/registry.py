@@ -0,0 +1,122 @@
+from collections import OrderedDict
+import threading
+from typing import Callable, Hashable
+
+from .cryptools import Cipher, AtbashCipher, CaesarCipher, AffineCipher, SubstitutionCipher, CipherPipeline, \
+    VigenereCipher
+
+
+REGISTRY_SIZE: int = 512
+
+
+def _pipeline(*stages: tuple[Hashable, ...], **options: Hashable) -> CipherPipeline:
+    """
+    This function builds a cipher pipeline from its stages, each given as a (cipher name, *keys) tuple, the options \
+    (alphabet, preserve_case) applying to every stage.
+    """
+    for stage in stages:
+        if not isinstance(stage, tuple) or not stage or stage[0] not in CIPHERS:
+            raise ValueError(f'Input stage {stage} is not a (cipher name, *keys) tuple.')
+    return CipherPipeline(CIPHERS[name](*keys, **options) for name, *keys in stages)
+
+
+CIPHERS: dict[str, Callable[..., Cipher]] = {
+    'atbash': AtbashCipher,
+    'caesar': CaesarCipher,
+    'affine': AffineCipher,
+    'substitution': SubstitutionCipher,
+    'vigenere': VigenereCipher,
+    'pipeline': _pipeline,
+}
+
+
+class CipherRegistry:
+    """
+    Cipher registry.
+
+    This is a factory returning cached cipher instances keyed on (cipher name, key material, options).
+
+    Cipher instances precompile their translation tables at construction time and are immutable, so a single instance \
+    is shared by every caller asking for the same cipher and keys. The registry is bounded: once `maxsize` instances \
+    are held, the least recently used one is evicted.
+
+    e.g. registry.get('affine', 5, 7) returns the same AffineCipher(5, 7) instance on every call.
+    e.g. registry.get('pipeline', ('caesar', 3), ('atbash',)) returns a CipherPipeline of both ciphers.
+    e.g. registry.get('caesar', 3, preserve_case=True) returns a CaesarCipher(3) keeping the case of the texts.
+    """
+    def __init__(self, maxsize: int = REGISTRY_SIZE, ciphers: dict[str, Callable[..., Cipher]] = None):
+        if maxsize < 1:
+            raise ValueError(f'Input maxsize={maxsize} must be a positive integer')
+        self.maxsize: int = maxsize
+        self._ciphers: dict[str, Callable[..., Cipher]] = dict(ciphers if ciphers is not None else CIPHERS)
+        self._instances: OrderedDict[tuple[Hashable, ...], Cipher] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ciphers
+
+    def get(self, name: str, *keys: Hashable, **options: Hashable) -> Cipher:
+        """
+        This method returns the cipher instance matching the input name and keys.
+
+        The instance is built on the first call and served from the registry afterwards.
+
+        :argument: name (str)
+            The cipher name (e.g. 'caesar').
+        :argument: keys (Hashable)
+            The cipher keys, as expected by the cipher constructor.
+        :argument: options (Hashable)
+            The cipher options, as expected by the cipher constructor: alphabet, preserve_case.
+
+        :return: (Cipher)
+            The shared cipher instance.
+        """
+        if name not in self._ciphers:
+            raise KeyError(f"Unknown cipher '{name}'")
+
+        entry: tuple[Hashable, ...] = (name, *keys, *sorted(options.items())) if options else (name, *keys)
+
+        with self._lock:
+            cipher: Cipher = self._instances.get(entry)
+            if cipher is not None:
+                self._instances.move_to_end(entry)
+                self.hits += 1
+                return cipher
+            self.misses += 1
+
+        # built outside of the lock: invalid keys raise here and are never cached
+        cipher = self._ciphers[name](*keys, **options)
+
+        with self._lock:
+            self._instances[entry] = cipher
+            self._instances.move_to_end(entry)
+            while len(self._instances) > self.maxsize:
+                self._instances.popitem(last=False)
+                self.evictions += 1
+
+        return cipher
+
+    def clear(self) -> None:
+        """This method drops every cached instance and resets the counters."""
+        with self._lock:
+            self._instances.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """This method returns the registry size, bound and hit / miss / eviction counters."""
+        return {
+            'size': len(self._instances),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+default_registry = CipherRegistry()
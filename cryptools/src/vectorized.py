@@ -0,0 +1,177 @@
+"""
+NumPy backend.
+
+Vectorized Caesar / Affine ciphering of binary buffers, for many keys or many texts at once:
+
+    affine_keys(ciphertext, [(1, 3), (5, 7), ...], decode=True)     # one text, K keys
+    encode_texts(CaesarCipher(3), [record, record, ...])            # N texts, one key
+
+NumPy is optional: without it (or for inputs too small to benefit from it), the same results are computed with the \
+byte translation tables of the ciphers. For a single text and a single key, bytes.translate is faster than NumPy \
+indexing, so the cipher byte API remains the one to use.
+"""
+import string
+from typing import Sequence, Union
+
+from .cryptools import Cipher, AffineCipher, CaesarCipher
+from .utils import gcd
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+HAS_NUMPY: bool = np is not None
+NUMPY_THRESHOLD: int = 64 * 1024
+
+ALPHABET_LENGTH: int = len(string.ascii_uppercase)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise ImportError('NumPy is required by this function, install it with: pip install numpy')
+
+
+def affine_tables(keys: Sequence[tuple[int, int]], decode: bool = False) -> 'np.ndarray':
+    """
+    This function builds the byte translation tables of several Affine keys in one vectorized computation.
+
+    Each table maps the letters through E(x) = (ax + b) mod 26 (or its inverse if decode is set), lowercase letters \\
+    being mapped like their uppercase counterpart. Any other byte is left unchanged.
+
+    :argument: keys (Sequence[tuple[int, int]])
+        The (keyA, keyB) pairs.
+    :argument: decode (bool)
+        Whether the decode tables are built.
+
+    :return: (np.ndarray)
+        A (len(keys), 256) uint8 array, one translation table per row.
+    """
+    _require_numpy()
+
+    pairs = np.asarray(keys, dtype=np.int64).reshape(-1, 2)
+    # validated as AffineCipher does, so that a key is rejected whichever path ciphers it
+    for keyA in dict.fromkeys(pairs[:, 0].tolist()):
+        if gcd(keyA, ALPHABET_LENGTH) != 1:
+            raise ValueError(f'Input keyA={keyA} is not co-prime with alphabet length {ALPHABET_LENGTH}.')
+
+    letters = np.arange(ALPHABET_LENGTH)
+    images = (pairs[:, :1] * letters + pairs[:, 1:]) % ALPHABET_LENGTH
+    if decode:
+        inverse = np.empty_like(images)
+        np.put_along_axis(inverse, images, np.broadcast_to(letters, images.shape), axis=1)
+        images = inverse
+
+    tables = np.tile(np.arange(256, dtype=np.uint8), (len(pairs), 1))
+    tables[:, ord('A'):ord('Z') + 1] = images + ord('A')
+    tables[:, ord('a'):ord('z') + 1] = images + ord('A')
+    return tables
+
+
+def caesar_tables(keys: Sequence[int], decode: bool = False) -> 'np.ndarray':
+    """
+    This function builds the byte translation tables of several Caesar keys in one vectorized computation.
+
+    :argument: keys (Sequence[int])
+        The Caesar keys.
+    :argument: decode (bool)
+        Whether the decode tables are built.
+
+    :return: (np.ndarray)
+        A (len(keys), 256) uint8 array, one translation table per row.
+    """
+    return affine_tables([(1, key) for key in keys], decode)
+
+
+def translate_keys(data: Buffer, tables: 'np.ndarray') -> 'np.ndarray':
+    """
+    This function translates one buffer with several translation tables at once.
+
+    The buffer is viewed as a uint8 array without being copied.
+
+    :argument: data (bytes-like object)
+        The buffer to translate.
+    :argument: tables (np.ndarray)
+        A (K, 256) uint8 array of translation tables.
+
+    :return: (np.ndarray)
+        A (K, len(data)) uint8 array, one translated buffer per row.
+    """
+    _require_numpy()
+    return tables[:, np.frombuffer(data, dtype=np.uint8)]
+
+
+def _use_numpy(size: int) -> bool:
+    return HAS_NUMPY and size >= NUMPY_THRESHOLD
+
+
+def affine_keys(data: Buffer, keys: Sequence[tuple[int, int]], decode: bool = False) -> list[bytes]:
+    """
+    This function ciphers one buffer with several Affine keys.
+
+    NumPy is used when it is installed and the total output is at least NUMPY_THRESHOLD bytes long.
+
+    :argument: data (bytes-like object)
+        The buffer to cipher or decipher.
+    :argument: keys (Sequence[tuple[int, int]])
+        The (keyA, keyB) pairs.
+    :argument: decode (bool)
+        Whether the buffer is deciphered.
+
+    :return: (list[bytes])
+        The processed buffers, in the keys order.
+    """
+    if _use_numpy(len(data) * len(keys)):
+        return [row.tobytes() for row in translate_keys(data, affine_tables(keys, decode))]
+    return [bytes(AffineCipher(*key)._process_bytes(data, decode)) for key in keys]
+
+
+def caesar_keys(data: Buffer, keys: Sequence[int], decode: bool = False) -> list[bytes]:
+    """
+    This function ciphers one buffer with several Caesar keys.
+
+    NumPy is used when it is installed and the total output is at least NUMPY_THRESHOLD bytes long.
+
+    :argument: data (bytes-like object)
+        The buffer to cipher or decipher.
+    :argument: keys (Sequence[int])
+        The Caesar keys.
+    :argument: decode (bool)
+        Whether the buffer is deciphered.
+
+    :return: (list[bytes])
+        The processed buffers, in the keys order.
+    """
+    if _use_numpy(len(data) * len(keys)):
+        return [row.tobytes() for row in translate_keys(data, caesar_tables(keys, decode))]
+    return [bytes(CaesarCipher(key)._process_bytes(data, decode)) for key in keys]
+
+
+def encode_texts(cipher: Cipher, texts: Sequence[Buffer], decode: bool = False) -> list[bytes]:
+    """
+    This function ciphers several buffers with one cipher.
+
+    The buffers are concatenated and translated in a single call, then split back. The result is the same as calling \
+    the cipher byte API on each buffer. bytes.translate is used rather than NumPy, which is not faster here.
+
+    :argument: cipher (Cipher)
+        The cipher to use.
+    :argument: texts (Sequence[bytes-like object])
+        The buffers to cipher or decipher.
+    :argument: decode (bool)
+        Whether the buffers are deciphered.
+
+    :return: (list[bytes])
+        The processed buffers, in the input order.
+    """
+    translated: bytes = b''.join(texts).translate(cipher._bytes_tables[decode])
+    results: list[bytes] = []
+    start: int = 0
+    for text in texts:
+        end: int = start + len(text)
+        results.append(translated[start:end])
+        start = end
+    return results
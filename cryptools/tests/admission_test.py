@@ -0,0 +1,36 @@
+import unittest
+
+from cryptools.src.admission import AdmissionController
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            AdmissionController(max_in_flight=-1)
+        with self.assertRaises(ValueError):
+            AdmissionController(cipher_limits={'caesar': 0})
+        with self.assertRaises(ValueError):
+            AdmissionController(retry_after=-1)
+
+    def test_max_in_flight(self) -> None:
+        admission = AdmissionController(max_in_flight=2)
+        self.assertTrue(admission.acquire('caesar'))
+        self.assertTrue(admission.acquire('affine'))
+        self.assertFalse(admission.acquire('caesar'))
+        admission.release('affine')
+        self.assertTrue(admission.acquire('caesar'))
+        self.assertEqual(admission.stats(), {
+            'max_in_flight': 2, 'cipher_limits': {}, 'in_flight': 2, 'cipher_in_flight': {'caesar': 2},
+            'rejected': {'caesar': 1},
+        })
+
+    def test_cipher_limits(self) -> None:
+        admission = AdmissionController(max_in_flight=0, cipher_limits={'vigenere': 1})
+        self.assertTrue(admission.acquire('vigenere'))
+        self.assertFalse(admission.acquire('vigenere'))
+        for _ in range(100):
+            self.assertTrue(admission.acquire('caesar'))
+        admission.release('vigenere')
+        self.assertTrue(admission.acquire('vigenere'))
+        self.assertEqual(admission.rejected, {'vigenere': 1})
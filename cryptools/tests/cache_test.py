@@ -0,0 +1,63 @@
+import unittest
+
+from cryptools.src.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            ResponseCache(maxbytes=0)
+        with self.assertRaises(ValueError):
+            ResponseCache(max_text=-1)
+
+    def test_key(self) -> None:
+        key = ResponseCache.key(('caesar', 3), False, 'abc')
+        self.assertEqual(key, ResponseCache.key(('caesar', 3), False, 'abc'))
+        self.assertEqual(len(key), 16)
+        for other in (
+            ResponseCache.key(('caesar', 4), False, 'abc'),
+            ResponseCache.key(('caesar', 3), True, 'abc'),
+            ResponseCache.key(('caesar', 3), False, 'abd'),
+            ResponseCache.key(('affine', 3), False, 'abc'),
+        ):
+            self.assertNotEqual(key, other)
+        # lone surrogates are valid JSON strings
+        self.assertEqual(len(ResponseCache.key(('atbash',), False, '\ud800')), 16)
+
+    def test_get_put(self) -> None:
+        cache = ResponseCache()
+        self.assertIsNone(cache.get(b'key'))
+        cache.put(b'key', b'{"text": "DEF"}')
+        self.assertEqual(cache.get(b'key'), b'{"text": "DEF"}')
+        self.assertEqual(cache.stats(), {
+            'entries': 1, 'bytes': 15, 'maxbytes': cache.maxbytes, 'max_text': cache.max_text,
+            'hits': 1, 'misses': 1, 'evictions': 0,
+        })
+
+    def test_bounded_by_bytes(self) -> None:
+        cache = ResponseCache(maxbytes=10)
+        cache.put(b'a', b'aaaa')
+        cache.put(b'b', b'bbbb')
+        cache.get(b'a')                     # b becomes the least recently used
+        cache.put(b'c', b'cccc')
+        self.assertIsNone(cache.get(b'b'))
+        self.assertEqual(cache.get(b'a'), b'aaaa')
+        self.assertEqual(cache.get(b'c'), b'cccc')
+        self.assertEqual((cache.size, cache.evictions), (8, 1))
+
+        cache.put(b'd', b'd' * 11)          # larger than the whole cache: not stored
+        self.assertIsNone(cache.get(b'd'))
+        self.assertEqual(len(cache), 2)
+
+    def test_accepts(self) -> None:
+        cache = ResponseCache(max_text=3)
+        self.assertTrue(cache.accepts('abc'))
+        self.assertFalse(cache.accepts('abcd'))
+
+    def test_clear(self) -> None:
+        cache = ResponseCache()
+        cache.put(b'key', b'value')
+        cache.get(b'key')
+        cache.clear()
+        self.assertEqual((len(cache), cache.size, cache.hits), (0, 0, 0))
@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 
 from cryptools.src import cryptools
 
@@ -154,6 +155,121 @@ class TestCaesar(unittest.IsolatedAsyncioTestCase):
                 self.plaintext_any_character.upper()
             )
 
+    async def test_non_ascii_letters_untouched(self) -> None:
+        self.assertEqual(await cryptools.CaesarCipher(3).encode('Café déjà vu'), 'FDIÉ GÉMÀ YX')
+        self.assertEqual(await cryptools.CaesarCipher(3).decode('FDIÉ GÉMÀ YX'), 'CAFÉ DÉJÀ VU')
+
+    def test_tables_shared_between_instances(self) -> None:
+        cryptools._caesar_tables.cache_clear()
+        first, second, equivalent = cryptools.CaesarCipher(7), cryptools.CaesarCipher(7), cryptools.CaesarCipher(33)
+        self.assertIs(first._encode_table, second._encode_table)
+        self.assertIs(first._encode_table, equivalent._encode_table)
+        self.assertEqual(cryptools._caesar_tables.cache_info().misses, 1)
+
+
+class TestSubstitution(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.key = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+
+    def test_invalid_argument(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptools.SubstitutionCipher('ABC')
+        with self.assertRaises(ValueError):
+            cryptools.SubstitutionCipher('QWERTYUIOPASDFGHJKLZXCVBNQ')    # duplicate letter
+
+    async def test_encode_any_character(self) -> None:
+        self.assertEqual(
+            await cryptools.SubstitutionCipher(self.key).encode('#>This messag@ shall rema5!in private'),
+            '#>ZIOL DTLLQU@ LIQSS KTDQ5!OF HKOCQZT'
+        )
+
+    async def test_decode_any_character(self) -> None:
+        self.assertEqual(
+            await cryptools.SubstitutionCipher(self.key.lower()).decode('#>ZIOL DTLLQU@ LIQSS KTDQ5!OF HKOCQZT'),
+            '#>THIS MESSAG@ SHALL REMA5!IN PRIVATE'
+        )
+
+    async def test_affine_special_case(self) -> None:
+        affine = cryptools.AffineCipher(5, 7)
+        substitution = cryptools.SubstitutionCipher(affine._new_alphabet)
+        self.assertEqual(await substitution.encode('This message'), await affine.encode('This message'))
+
+
+class TestVigenere(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.plaintext = '#>Attack at 5 dawn, at dawn!'
+        self.ciphertext = '#>LXFOPV EF 5 RNHR, MH QLAZ!'
+
+    def test_invalid_argument(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptools.VigenereCipher('')
+        with self.assertRaises(ValueError):
+            cryptools.VigenereCipher('LEM0N')
+
+    async def test_encode_key_advances_on_letters(self) -> None:
+        self.assertEqual(await cryptools.VigenereCipher('lemon').encode(self.plaintext), self.ciphertext)
+
+    async def test_decode(self) -> None:
+        self.assertEqual(await cryptools.VigenereCipher('LEMON').decode(self.ciphertext), self.plaintext.upper())
+
+    async def test_matches_per_character_loop(self) -> None:
+        key = 'CRYPTOGRAPHY'
+        text = 'The quick, brown fox — jumps over the lazy dog! ' * 7
+        expected, position = [], 0
+        for char in text.upper():
+            if 'A' <= char <= 'Z':
+                char = chr((ord(char) - 65 + ord(key[position % len(key)]) - 65) % 26 + 65)
+                position += 1
+            expected.append(char)
+        self.assertEqual(await cryptools.VigenereCipher(key).encode(text), ''.join(expected))
+
+    def test_stream_carries_key_position(self) -> None:
+        cipher = cryptools.VigenereCipher('LEMON')
+        process = cipher._stream(decode=False)
+        chunks = [self.plaintext[start:start + 3] for start in range(0, len(self.plaintext), 3)]
+        self.assertEqual(''.join(map(process, chunks)), self.ciphertext)
+
+    def test_bytes(self) -> None:
+        cipher = cryptools.VigenereCipher('LEMON')
+        plaintext = self.plaintext.encode() + b' \xc3\xa9\xff'
+        ciphertext = self.ciphertext.encode() + b' \xc3\xa9\xff'
+        self.assertEqual(cipher.encode_bytes(plaintext), ciphertext)
+        self.assertEqual(cipher.decode_bytes(memoryview(ciphertext)), plaintext.upper())
+        buffer = bytearray(plaintext)
+        with unittest.mock.patch.object(cryptools, 'BYTES_WINDOW_SIZE', 4):
+            cipher.encode_into(buffer)
+        self.assertEqual(buffer, ciphertext)
+
+    def test_not_in_pipeline(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptools.CipherPipeline([cryptools.CaesarCipher(3), cryptools.VigenereCipher('LEMON')])
+
+    @unittest.skipUnless(cryptools.np is not None, 'requires numpy')
+    def test_numpy_matches_tables(self) -> None:
+        text = self.plaintext + ' Hello, World! 42' * 50
+        data = text.encode() + b' \xc3\xa9\xff'
+
+        def process(cipher: cryptools.VigenereCipher, decode: bool) -> list:
+            stream = cipher._stream(decode)
+            return [
+                cipher._process(text, decode), cipher._process_bytes(data, decode),
+                stream(text[:7]) + stream(text[7:400]) + stream(text[400:]),
+            ]
+
+        for cipher in (
+                cryptools.VigenereCipher('LEMON'), cryptools.VigenereCipher('lemon', alphabet='lowercase'),
+                cryptools.VigenereCipher('LeMoN', alphabet='both'),
+                cryptools.VigenereCipher('LEMON', preserve_case=True),
+        ):
+            for decode in (False, True):
+                expected = process(cipher, decode)
+                with unittest.mock.patch.object(cryptools, 'VIGENERE_NUMPY_THRESHOLD', 1):
+                    self.assertEqual(process(cipher, decode), expected)
+
 
 class TestAtbash(unittest.IsolatedAsyncioTestCase):
 
@@ -186,3 +302,171 @@ class TestCipher(unittest.IsolatedAsyncioTestCase):
     async def test_decode(self) -> None:
         with self.assertRaises(NotImplementedError):
             await cryptools.Cipher().decode('ciphertext')
+
+
+class TestCipherSync(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.ciphers = [
+            cryptools.AtbashCipher(), cryptools.CaesarCipher(3), cryptools.AffineCipher(5, 7),
+            cryptools.SubstitutionCipher('QWERTYUIOPASDFGHJKLZXCVBNM'), cryptools.VigenereCipher('LEMON'),
+        ]
+        self.texts = ['This message', '', 'shall remain', ' private! é', 'abc']
+
+    def test_encode_decode_sync(self) -> None:
+        self.assertEqual(cryptools.AffineCipher(5, 7).encode_sync('This message'), 'YQVT PBTTHLB')
+        self.assertEqual(cryptools.AffineCipher(5, 7).decode_sync('YQVT PBTTHLB'), 'THIS MESSAGE')
+        with self.assertRaises(NotImplementedError):
+            cryptools.Cipher().encode_sync('plaintext')
+
+    def test_encode_many_matches_encode_sync(self) -> None:
+        for cipher in self.ciphers:
+            self.assertEqual(cipher.encode_many(iter(self.texts)), [cipher.encode_sync(text) for text in self.texts])
+            self.assertEqual(cipher.decode_many(self.texts), [cipher.decode_sync(text) for text in self.texts])
+            self.assertEqual(cipher.encode_many([]), [])
+
+    def test_encode_many_length_changing_upper(self) -> None:
+        cipher = cryptools.CaesarCipher(3)
+        texts = ['straße', 'abc']
+        self.assertEqual(cipher.encode_many(texts), ['VWUDVVH', 'DEF'])
+
+    def test_encode_many_not_implemented(self) -> None:
+        with self.assertRaises(NotImplementedError):
+            cryptools.Cipher().encode_many(['plaintext'])
+
+
+class TestCipherBytes(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.plaintext = b'#>This messag@ shall rema5!in private \xc3\xa9\xff'
+        self.ciphertext = b'#>YQVT PBTTHL@ TQHKK OBPH5!VU EOVIHYB \xc3\xa9\xff'
+        self.cipher = cryptools.AffineCipher(5, 7)
+
+    def test_encode_bytes(self) -> None:
+        self.assertEqual(self.cipher.encode_bytes(self.plaintext), self.ciphertext)
+        self.assertEqual(self.cipher.encode_bytes(memoryview(self.plaintext)), self.ciphertext)
+        self.assertEqual(self.cipher.encode_bytes(bytearray(self.plaintext)), bytearray(self.ciphertext))
+
+    def test_decode_bytes(self) -> None:
+        self.assertEqual(self.cipher.decode_bytes(self.ciphertext.lower()), self.plaintext.upper())
+
+    def test_encode_into(self) -> None:
+        buffer = bytearray(self.plaintext * 3)
+        with unittest.mock.patch.object(cryptools, 'BYTES_WINDOW_SIZE', 7):
+            self.cipher.encode_into(memoryview(buffer)[len(self.plaintext):])
+        self.assertEqual(buffer, self.plaintext + self.ciphertext * 2)
+
+    def test_decode_into(self) -> None:
+        buffer = bytearray(self.ciphertext)
+        self.cipher.decode_into(buffer)
+        self.assertEqual(buffer, self.plaintext.upper())
+
+    def test_read_only_buffer(self) -> None:
+        with self.assertRaises(TypeError):
+            self.cipher.encode_into(self.plaintext)
+
+    def test_matches_text_cipher(self) -> None:
+        text = 'The quick brown fox jumps over the lazy dog'
+        for cipher in (cryptools.AtbashCipher(), cryptools.CaesarCipher(11), cryptools.AffineCipher(9, 3)):
+            self.assertEqual(cipher.encode_bytes(text.encode()), cipher._process(text, decode=False).encode())
+            self.assertEqual(cipher.decode_bytes(text.encode()), cipher._process(text, decode=True).encode())
+
+    def test_not_implemented(self) -> None:
+        with self.assertRaises(NotImplementedError):
+            cryptools.Cipher().encode_bytes(b'plaintext')
+
+
+class TestAlphabet(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.greek = 'ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ'
+
+    def test_invalid_alphabet(self) -> None:
+        for alphabet in ('', 'A', 'ABCA'):
+            with self.assertRaises(ValueError):
+                cryptools.AtbashCipher(alphabet=alphabet)
+
+    def test_lowercase(self) -> None:
+        cipher = cryptools.CaesarCipher(3, alphabet='lowercase')
+        self.assertEqual(cipher.encode_sync('Hello, World! Café'), 'khoor, zruog! fdié')
+        self.assertEqual(cipher.decode_sync('KHOOR'), 'hello')
+        self.assertEqual(cryptools.SubstitutionCipher('QWERTYUIOPASDFGHJKLZXCVBNM', alphabet='lowercase').key, 'qwertyuiopasdfghjklzxcvbnm')
+
+    def test_both(self) -> None:
+        cipher = cryptools.CaesarCipher(1, alphabet='both')
+        self.assertEqual(cipher.encode_sync('Zz Aa é'), 'aA Bb é')
+        self.assertEqual(cipher.decode_sync('aA Bb é'), 'Zz Aa é')
+        with self.assertRaises(ValueError):
+            cryptools.AffineCipher(13, 1, alphabet='both')    # not co-prime with 52
+
+    def test_custom_alphabet(self) -> None:
+        cipher = cryptools.AffineCipher(5, 7, alphabet=self.greek)
+        self.assertEqual(cipher._new_alphabet, ''.join(self.greek[(5 * i + 7) % 24] for i in range(24)))
+        self.assertEqual(cipher.decode_sync(cipher.encode_sync('Αλφα, abc')), 'ΑΛΦΑ, ABC')
+        with self.assertRaises(ValueError):
+            cryptools.AffineCipher(3, 1, alphabet=self.greek)    # not co-prime with 24
+        with self.assertRaises(ValueError):
+            cipher.encode_bytes(b'abc')
+        vigenere = cryptools.VigenereCipher('γβ', alphabet=self.greek)
+        self.assertEqual(vigenere.encode_sync('αα αα'), 'ΓΒ ΓΒ')
+
+    def test_preserve_case(self) -> None:
+        for cipher in (
+                cryptools.AtbashCipher(preserve_case=True), cryptools.CaesarCipher(3, preserve_case=True),
+                cryptools.AffineCipher(5, 7, preserve_case=True), cryptools.VigenereCipher('LEMON', preserve_case=True),
+                cryptools.AffineCipher(5, 7, alphabet=self.greek, preserve_case=True),
+        ):
+            for text in ('#>This messag@ shall rema5!in private', 'Straße, Café, Καλημέρα'):
+                self.assertEqual(cipher.decode_sync(cipher.encode_sync(text)), text)
+        self.assertEqual(cryptools.CaesarCipher(3, preserve_case=True).encode_sync('Hello, Café ß'), 'Khoor, Fdié ß')
+        self.assertEqual(cryptools.VigenereCipher('lemon', preserve_case=True).encode_sync('Attack at dawn'), 'Lxfopv ef rnhr')
+
+    def test_preserve_case_bytes(self) -> None:
+        cipher = cryptools.AffineCipher(5, 7, preserve_case=True)
+        self.assertEqual(cipher.encode_bytes(b'This message \xff'), b'Yqvt pbtthlb \xff')
+        self.assertEqual(cryptools.VigenereCipher('LEMON', preserve_case=True).encode_bytes(b'Attack'), b'Lxfopv')
+
+    def test_tables_fold_ascii_case(self) -> None:
+        cipher = cryptools.CaesarCipher(3)
+        self.assertEqual(cipher._encode_table[ord('a')], ord('D'))
+        self.assertEqual(cipher._bytes_tables[0][ord('a')], ord('D'))
+        self.assertIsNot(cryptools.CaesarCipher(3, preserve_case=True)._encode_table, cipher._encode_table)
+
+    def test_pipeline_alphabets(self) -> None:
+        stages = [cryptools.CaesarCipher(3, preserve_case=True), cryptools.AtbashCipher(preserve_case=True)]
+        pipeline = cryptools.CipherPipeline(stages)
+        self.assertTrue(pipeline.preserve_case)
+        self.assertEqual(pipeline.encode_sync('Hello'), stages[1].encode_sync(stages[0].encode_sync('Hello')))
+        with self.assertRaises(ValueError):
+            cryptools.CipherPipeline([cryptools.CaesarCipher(3), cryptools.AtbashCipher(preserve_case=True)])
+
+
+class TestCipherPipeline(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.stages = [cryptools.CaesarCipher(3), cryptools.AffineCipher(5, 7), cryptools.AtbashCipher()]
+        self.plaintext = '#>This messag@ shall rema5!in private'
+
+    def test_invalid_argument(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptools.CipherPipeline([])
+
+    async def test_encode_matches_chained_stages(self) -> None:
+        expected = self.plaintext
+        for stage in self.stages:
+            expected = await stage.encode(expected)
+        self.assertEqual(await cryptools.CipherPipeline(self.stages).encode(self.plaintext), expected)
+
+    async def test_decode(self) -> None:
+        pipeline = cryptools.CipherPipeline(self.stages)
+        self.assertEqual(await pipeline.decode(await pipeline.encode(self.plaintext)), self.plaintext.upper())
+
+    async def test_nested_pipeline(self) -> None:
+        inner = cryptools.CipherPipeline(self.stages[:2])
+        pipeline = cryptools.CipherPipeline([inner, self.stages[2]])
+        self.assertEqual(pipeline.key, cryptools.CipherPipeline(self.stages).key)
+        self.assertEqual(pipeline.stages, (inner, self.stages[2]))
@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from cryptools import __main__ as cli
+from cryptools.src import cryptools
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input_path = os.path.join(self.directory.name, 'input.txt')
+        self.output_path = os.path.join(self.directory.name, 'output.txt')
+        self.plaintext = b'#>This messag@ shall rema5!in private\n' * 100
+        self.ciphertext = b'#>YQVT PBTTHL@ TQHKK OBPH5!VU EOVIHYB\n' * 100
+        with open(self.input_path, 'wb') as file:
+            file.write(self.plaintext)
+
+    def _read_output(self) -> bytes:
+        with open(self.output_path, 'rb') as file:
+            return file.read()
+
+    def test_encode_file(self) -> None:
+        cli.main(['affine', '--keys', '5', '7', '--encrypt', '--window', '64', '--quiet', self.input_path, self.output_path])
+        self.assertEqual(self._read_output(), self.ciphertext)
+
+    def test_decode_file_in_place(self) -> None:
+        with open(self.output_path, 'wb') as file:
+            file.write(self.ciphertext)
+        cli.main(['affine', '--keys', '5', '7', '--decrypt', '--quiet', self.output_path, self.output_path])
+        self.assertEqual(self._read_output(), self.plaintext.upper())
+
+    def test_preserve_case(self) -> None:
+        cli.main(['affine', '--keys', '5', '7', '--encrypt', '--preserve-case', '--quiet', self.input_path, self.output_path])
+        self.assertEqual(self._read_output(), b'#>Yqvt pbtthl@ tqhkk obph5!vu eovihyb\n' * 100)
+
+    def test_non_ascii_alphabet(self) -> None:
+        with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            cli.main(['atbash', '--alphabet', 'ΑΒΓ', '--encrypt', self.input_path, self.output_path])
+        self.assertIn('ASCII', stderr.getvalue())
+
+    def test_empty_file(self) -> None:
+        open(self.input_path, 'wb').close()
+        cli.main(['atbash', '--encrypt', '--quiet', self.input_path, self.output_path])
+        self.assertEqual(self._read_output(), b'')
+
+    def test_stream(self) -> None:
+        source, destination = io.BytesIO(self.plaintext), io.BytesIO()
+        size = cli._transform_stream(cryptools.AffineCipher(5, 7), False, source, destination, 64)
+        self.assertEqual(size, len(self.plaintext))
+        self.assertEqual(destination.getvalue(), self.ciphertext)
+
+    def test_throughput_report(self) -> None:
+        with unittest.mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            cli.main(['caesar', '--key', '3', '--encrypt', self.input_path, self.output_path])
+        self.assertIn('MB/s', stderr.getvalue())
+
+    def test_missing_key(self) -> None:
+        with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', new_callable=io.StringIO):
+            cli.main(['caesar', '--encrypt', self.input_path, self.output_path])
+
+    def test_missing_paths(self) -> None:
+        missing = os.path.join(self.directory.name, 'missing', 'input.txt')
+        for paths in ([missing, self.output_path], [self.input_path, missing]):
+            with self.assertRaises(SystemExit) as context, \
+                    unittest.mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                cli.main(['atbash', '--encrypt', *paths])
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn('No such file or directory', stderr.getvalue())
+
+    def test_invalid_keys(self) -> None:
+        with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            cli.main(['affine', '--keys', '2', '2', '--encrypt', self.input_path, self.output_path])
+        self.assertIn('not co-prime', stderr.getvalue())
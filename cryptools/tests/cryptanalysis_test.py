@@ -0,0 +1,90 @@
+import math
+import unittest
+import unittest.mock
+
+from cryptools.src import cryptanalysis, cryptools
+
+
+class TestCryptanalysis(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.plaintext = 'Frequency analysis recovers the key of any monoalphabetic substitution from letter counts alone'
+        self.ciphertexts = {
+            ('caesar', 7): await cryptools.CaesarCipher(7).encode(self.plaintext),
+            ('affine', (5, 8)): await cryptools.AffineCipher(5, 8).encode(self.plaintext),
+            ('atbash', None): await cryptools.AtbashCipher().encode(self.plaintext),
+        }
+
+    def test_keyspace(self) -> None:
+        self.assertEqual(len(cryptanalysis.AFFINE_KEYS), 312)
+        self.assertEqual(len(set(cryptanalysis.IMAGES)), 312)
+
+    def test_letter_histogram(self) -> None:
+        histogram = cryptanalysis.letter_histogram('aAb, Zé!')
+        self.assertEqual((histogram[0], histogram[1], histogram[25], sum(histogram)), (2, 1, 1, 4))
+
+    def _assert_cracked(self) -> None:
+        for method in cryptanalysis.METHODS:
+            best = cryptanalysis.crack(self.ciphertexts[('caesar', 7)], top=1, method=method)[0]
+            self.assertEqual((best['cipher'], best['key'], best['preview']), ('caesar', 7, self.plaintext.upper()[:64]))
+            best = cryptanalysis.crack(self.ciphertexts[('affine', (5, 8))], top=1, method=method)[0]
+            self.assertEqual((best['cipher'], best['keys']), ('affine', [5, 8]))
+            best = cryptanalysis.crack(self.ciphertexts[('atbash', None)], top=1, method=method)[0]
+            self.assertEqual(best['cipher'], 'atbash')
+
+    def test_crack(self) -> None:
+        self._assert_cracked()
+
+    def test_crack_without_numpy(self) -> None:
+        with unittest.mock.patch.object(cryptanalysis, 'HAS_NUMPY', False):
+            self._assert_cracked()
+
+    def test_ranking(self) -> None:
+        candidates = cryptanalysis.crack(self.ciphertexts[('caesar', 7)], top=10, preview_length=None)
+        self.assertEqual(len(candidates), 10)
+        self.assertEqual([c['score'] for c in candidates], sorted(c['score'] for c in candidates))
+        self.assertNotIn('preview', candidates[0])
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptanalysis.crack('1234 !')
+        with self.assertRaises(ValueError):
+            cryptanalysis.crack('abc', top=0)
+        with self.assertRaises(ValueError):
+            cryptanalysis.crack('abc', method='entropy')
+
+
+class TestSubstitutionSolver(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.key = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+        self.plaintext = (
+            'It is a truth universally acknowledged that a single man in possession of a good fortune must be in want '
+            'of a wife. However little known the feelings or views of such a man may be on his first entering a '
+            'neighbourhood, this truth is so well fixed in the minds of the surrounding families, that he is considered '
+            'as the rightful property of some one or other of their daughters. My dear Mr Bennet, said his lady to '
+            'him one day, have you heard that Netherfield Park is let at last? Mr Bennet replied that he had not.'
+        )
+        self.ciphertext = await cryptools.SubstitutionCipher(self.key).encode(self.plaintext)
+
+    def test_quadgram_table(self) -> None:
+        quadgrams = cryptanalysis.QuadgramTable({'THAT': 3, 'TION': 1})
+        self.assertEqual(len(quadgrams.log_probabilities), 26 ** 4)
+        self.assertAlmostEqual(quadgrams.score('that'), math.log10(0.75))
+        self.assertEqual(quadgrams.score('qqqq'), quadgrams.floor)
+        english = cryptanalysis.english_quadgrams()
+        self.assertGreater(english.score(self.plaintext), english.score(self.ciphertext))
+
+    def test_solve(self) -> None:
+        solution = cryptanalysis.solve_substitution(self.ciphertext, seed=0)
+        self.assertEqual(solution['preview'], self.plaintext.upper()[:64])
+        # letters absent from the text (J, Q, Z) cannot be recovered
+        self.assertGreaterEqual(sum(a == b for a, b in zip(solution['key'], self.key)), 23)
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            cryptanalysis.solve_substitution('abc')
+        with self.assertRaises(ValueError):
+            cryptanalysis.solve_substitution(self.ciphertext, restarts=0)
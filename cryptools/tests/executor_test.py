@@ -0,0 +1,48 @@
+import unittest
+import unittest.mock
+
+from cryptools.src import cryptools, executor
+from cryptools.src.executor import CipherExecutor
+
+
+class TestCipherExecutor(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.cipher = cryptools.AffineCipher(5, 7)
+        self.plaintext = 'This message shall remain private'
+        self.ciphertext = 'YQVT PBTTHLB TQHKK OBPHVU EOVIHYB'
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            CipherExecutor(threshold=-1)
+        with self.assertRaises(ValueError):
+            CipherExecutor(workers=0)
+
+    async def test_inline(self) -> None:
+        cipher_executor = CipherExecutor(threshold=len(self.plaintext) + 1)
+        self.assertEqual(await cipher_executor.run(self.cipher, self.plaintext, decode=False), self.ciphertext)
+        self.assertEqual(cipher_executor.stats()['inline'], 1)
+        self.assertIsNone(cipher_executor._pool)
+
+    async def test_run_many(self) -> None:
+        texts = [self.plaintext, 'abc']
+        expected = [self.ciphertext, 'HMR']
+        cipher_executor = CipherExecutor(threshold=len(self.plaintext) + 4)
+        self.addCleanup(cipher_executor.shutdown)
+        self.assertEqual(await cipher_executor.run_many(self.cipher, texts, decode=False), expected)
+        self.assertEqual(await cipher_executor.run_many(self.cipher, texts * 2, decode=False), expected * 2)
+        self.assertEqual((cipher_executor.stats()['inline'], cipher_executor.stats()['offloaded']), (1, 1))
+
+    async def test_offloaded_to_threads(self) -> None:
+        cipher_executor = CipherExecutor(threshold=len(self.plaintext))
+        self.addCleanup(cipher_executor.shutdown)
+        with unittest.mock.patch.object(executor, 'OFFLOAD_WINDOW', 5):
+            self.assertEqual(await cipher_executor.run(self.cipher, self.ciphertext, decode=True), self.plaintext.upper())
+        self.assertEqual(cipher_executor.stats()['offloaded'], 1)
+        self.assertEqual(cipher_executor.stats()['pending'], 0)
+
+    async def test_offloaded_to_processes(self) -> None:
+        cipher_executor = CipherExecutor(threshold=0, workers=1, processes=True)
+        self.addCleanup(cipher_executor.shutdown)
+        self.assertEqual(await cipher_executor.run(self.cipher, self.plaintext * 100, decode=False), self.ciphertext * 100)
@@ -1,10 +1,21 @@
+import asyncio
 from http import HTTPStatus
 import json
+from typing import Awaitable
 
+import tornado.httpclient
 import tornado.testing
 import tornado.web
+import tornado.websocket
+import unittest
+from unittest import mock
 
-from cryptools.app import make_app
+from cryptools.app import make_app, HAS_MSGPACK, JobsHandler, _negotiate
+from cryptools.src.admission import AdmissionController
+from cryptools.src.cache import ResponseCache
+from cryptools.src.jobs import JobStore
+from cryptools.src.profiling import Profiler
+from cryptools.src.executor import CipherExecutor
 
 
 class TestAffineCipherHandler(tornado.testing.AsyncHTTPTestCase):
@@ -28,6 +39,27 @@ class TestAffineCipherHandler(tornado.testing.AsyncHTTPTestCase):
         self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
         self.assertEqual(json.loads(response.body), {'error': "Invalid type for body argument 'keys'"})
 
+    def test_post_invalid_argument_length_keys(self) -> None:
+        # extra items are never taken for cipher options
+        response = self.fetch(
+            self.url,
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({"text": self.plaintext, 'encrypt': True, "keys": [5, 7, 'lowercase']})
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid length for body argument 'keys'"})
+
+    def test_post_invalid_keys(self) -> None:
+        response = self.fetch(
+            self.url,
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({"text": self.plaintext, 'encrypt': True, "keys": [4, 7]})
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Input keyA=4 is not co-prime with alphabet length 26.'})
+
     def test_post_encode(self) -> None:
         response = self.fetch(
             self.url,
@@ -162,4 +194,799 @@ class TestBaseCipherValidation(tornado.testing.AsyncHTTPTestCase):
             body=json.dumps({"text": "Dummy string"})
         )
         self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
-        self.assertEqual(json.loads(response.body), {'error': 'Missing body argument'})
\ No newline at end of file
+        self.assertEqual(json.loads(response.body), {'error': 'Missing body argument'})
+
+
+class TestBatchCipherHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = '/cipher/batch/'
+        self.headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        self.plaintext = 'This message shall remain private'
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post_invalid_argument_type_items(self) -> None:
+        response = self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps({'items': 'not a list'}))
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for body argument 'items'"})
+
+    def test_post_invalid_json(self) -> None:
+        response = self.fetch(self.url, method='POST', headers=self.headers, body='{"items": [')
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Invalid JSON body'})
+
+    def test_post_results_in_order(self) -> None:
+        items = [
+            {'cipher': 'caesar', 'key': 3, 'encrypt': True, 'text': self.plaintext},
+            {'cipher': 'affine', 'keys': [5, 7], 'encrypt': True, 'text': self.plaintext},
+            {'cipher': 'caesar', 'key': 3, 'encrypt': False, 'text': 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH'},
+            {'cipher': 'atbash', 'encrypt': True, 'text': self.plaintext},
+        ]
+        response = self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps({'items': items}))
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'results': [
+            {'text': 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH'},
+            {'text': 'YQVT PBTTHLB TQHKK OBPHVU EOVIHYB'},
+            {'text': self.plaintext.upper()},
+            {'text': 'GSRH NVHHZTV HSZOO IVNZRM KIREZGV'},
+        ]})
+
+    def test_post_item_errors(self) -> None:
+        items = [
+            {'cipher': 'enigma', 'encrypt': True, 'text': self.plaintext},
+            {'cipher': 'caesar', 'key': 'not an int', 'encrypt': True, 'text': self.plaintext},
+            {'cipher': 'affine', 'keys': [2, 2], 'encrypt': True, 'text': self.plaintext},
+            {'cipher': 'atbash', 'text': self.plaintext},
+            {'cipher': 'atbash', 'encrypt': False, 'text': 'ZYX'},
+            {'cipher': 'affine', 'keys': [5], 'encrypt': True, 'text': self.plaintext},
+        ]
+        response = self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps({'items': items}))
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'results': [
+            {'error': "Unknown cipher 'enigma'"},
+            {'error': "Invalid type for body argument 'key'"},
+            {'error': 'Input keyA=2 is not co-prime with alphabet length 26.'},
+            {'error': 'Missing body argument'},
+            {'text': 'ABC'},
+            {'error': "Invalid length for body argument 'keys'"},
+        ]})
+
+
+class TestCipherStreamHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.headers = {'Content-Type': 'text/plain; charset=UTF-8'}
+        self.plaintext = 'This message shall remain private'
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post_encode(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/stream/?encrypt=true&key=3', method='POST', headers=self.headers, body=self.plaintext
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.body.decode(), 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH')
+
+    def test_post_decode(self) -> None:
+        response = self.fetch(
+            '/cipher/affine/stream/?encrypt=false&keys=5&keys=7',
+            method='POST',
+            headers={'Content-Type': 'application/octet-stream'},
+            body='YQVT PBTTHLB TQHKK OBPHVU EOVIHYB'
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.body.decode(), self.plaintext.upper())
+
+    def test_post_large_body(self) -> None:
+        response = self.fetch(
+            '/cipher/atbash/stream/?encrypt=true', method='POST', headers=self.headers, body='abc é ' * 200000
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.body.decode(), 'ZYX É ' * 200000)
+
+    def test_post_missing_argument(self) -> None:
+        response = self.fetch('/cipher/caesar/stream/?encrypt=true', method='POST', headers=self.headers, body='abc')
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Missing query argument'})
+
+    def test_post_invalid_keys(self) -> None:
+        for keys in ('5', '5,7,9'):
+            response = self.fetch(
+                f'/cipher/affine/stream/?encrypt=true&keys={keys}', method='POST', headers=self.headers, body='abc'
+            )
+            self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+            self.assertEqual(json.loads(response.body), {'error': 'Invalid cipher keys'})
+
+    def test_post_invalid_argument_type_keys(self) -> None:
+        response = self.fetch(
+            '/cipher/affine/stream/?encrypt=true&keys=5,x', method='POST', headers=self.headers, body='abc'
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for query argument 'keys'"})
+
+    def test_post_vigenere_chunks(self) -> None:
+        async def body_producer(write):
+            for chunk in ('Attack a', 't dawn, a', 't dawn'):
+                await write(chunk.encode())
+
+        response = self.fetch(
+            '/cipher/vigenere/stream/?encrypt=true&key=lemon',
+            method='POST',
+            headers=self.headers,
+            body_producer=body_producer
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.body.decode(), 'LXFOPV EF RNHR, MH QLAZ')
+
+    def test_post_unsupported_content_type(self) -> None:
+        response = self.fetch(
+            '/cipher/atbash/stream/?encrypt=true',
+            method='POST',
+            headers={'Content-Type': 'application/json'},
+            body=json.dumps({'text': 'abc'})
+        )
+        self.assertEqual(response.code, HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+
+
+class TestCachedCipherHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.body = json.dumps({'text': 'This message', 'encrypt': True, 'keys': [5, 7]})
+
+    def get_app(self) -> tornado.web.Application:
+        self.cache = ResponseCache(max_text=64)
+        return make_app(cache=self.cache)
+
+    def test_post_cached(self) -> None:
+        first = self.fetch('/cipher/affine/', method='POST', body=self.body)
+        second = self.fetch('/cipher/affine/', method='POST', body=self.body)
+        self.assertEqual(json.loads(first.body), {'text': 'YQVT PBTTHLB'})
+        self.assertEqual(second.body, first.body)
+        self.assertTrue(second.headers['Content-Type'].startswith('application/json'))
+        self.assertEqual(second.headers['Etag'], first.headers['Etag'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        response = self.fetch('/stats/')
+        self.assertEqual(json.loads(response.body)['cache']['hits'], 1)
+        response = self.fetch('/metrics')
+        self.assertIn('cryptools_cache_hits_total 1\n', response.body.decode())
+
+    def test_post_if_none_match(self) -> None:
+        etag = self.fetch('/cipher/affine/', method='POST', body=self.body).headers['Etag']
+        response = self.fetch('/cipher/affine/', method='POST', body=self.body, headers={'If-None-Match': etag})
+        self.assertEqual(response.code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.body, b'')
+        response = self.fetch(
+            '/cipher/affine/',
+            method='POST',
+            body=json.dumps({'text': 'This message', 'encrypt': False, 'keys': [5, 7]}),
+            headers={'If-None-Match': etag}
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+
+    def test_post_large_text_not_cached(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/', method='POST', body=json.dumps({'text': 'a' * 65, 'encrypt': True, 'key': 3})
+        )
+        self.assertEqual(json.loads(response.body), {'text': 'D' * 65})
+        self.assertNotIn('Etag', response.headers)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestContentNegotiation(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = '/cipher/caesar/'
+        self.plaintext = 'This message shall remain private'
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app(cache=ResponseCache())
+
+    def test_negotiate(self) -> None:
+        self.assertEqual(_negotiate('', 'json'), 'json')
+        self.assertEqual(_negotiate('*/*', 'octet-stream'), 'octet-stream')
+        self.assertEqual(_negotiate('text/html, application/octet-stream', 'json'), 'octet-stream')
+        self.assertEqual(
+            _negotiate('application/octet-stream;q=0.5, application/json;q=0.9', 'octet-stream'), 'json'
+        )
+        self.assertEqual(_negotiate('application/octet-stream;q=invalid', 'json'), 'json')
+
+    def test_post_octet_stream(self) -> None:
+        response = self.fetch(
+            self.url + '?encrypt=true&key=3',
+            method='POST',
+            headers={'Content-Type': 'application/octet-stream'},
+            body=self.plaintext.encode() + b' \xff',
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.headers['Content-Type'], 'application/octet-stream')
+        self.assertEqual(response.body, b'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH \xff')
+
+    def test_post_octet_stream_headers(self) -> None:
+        response = self.fetch(
+            '/cipher/affine/',
+            method='POST',
+            headers={
+                'Content-Type': 'application/octet-stream',
+                'Accept': 'application/json',
+                'X-Cipher-Encrypt': 'true',
+                'X-Cipher-Keys': '5,7',
+            },
+            body=self.plaintext,
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'text': 'YQVT PBTTHLB TQHKK OBPHVU EOVIHYB'})
+
+    def test_post_octet_stream_invalid_argument(self) -> None:
+        response = self.fetch(
+            self.url + '?encrypt=true&key=three',
+            method='POST',
+            headers={'Content-Type': 'application/octet-stream'},
+            body=self.plaintext,
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response.headers['Content-Type'], 'application/json; charset=UTF-8')
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for query argument 'key'"})
+
+    def test_post_octet_stream_crack(self) -> None:
+        response = self.fetch(
+            '/crack/?top=1',
+            method='POST',
+            headers={'Content-Type': 'application/octet-stream', 'Accept': 'application/octet-stream'},
+            body='WKLV PHVVDJH VKDOO UHPDLQ SULYDWH',
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.headers['Content-Type'], 'application/json; charset=UTF-8')
+        self.assertEqual(len(json.loads(response.body)['candidates']), 1)
+
+    def test_post_octet_stream_unsupported(self) -> None:
+        response = self.fetch(
+            '/cipher/batch/', method='POST', headers={'Content-Type': 'application/octet-stream'}, body='abc'
+        )
+        self.assertEqual(response.code, HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+        self.assertEqual(
+            json.loads(response.body), {'error': "Unsupported content type 'application/octet-stream'"}
+        )
+
+    def test_post_accept_octet_stream(self) -> None:
+        response = self.fetch(
+            self.url,
+            method='POST',
+            headers={'Accept': 'application/octet-stream'},
+            body=json.dumps({'text': self.plaintext, 'encrypt': True, 'key': 3}),
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.body, b'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH')
+
+    def test_post_cached_formats(self) -> None:
+        body: str = json.dumps({'text': self.plaintext, 'encrypt': True, 'key': 3})
+        etags: set[str] = set()
+        for _ in range(2):
+            for accept in ('application/json', 'application/octet-stream'):
+                response = self.fetch(self.url, method='POST', headers={'Accept': accept}, body=body)
+                self.assertEqual(response.code, HTTPStatus.OK)
+                self.assertEqual(response.headers['Content-Type'].split(';')[0], accept)
+                etags.add(response.headers['Etag'])
+        self.assertEqual(len(etags), 2)
+        self.assertEqual(self._app.settings['cache'].stats()['hits'], 2)
+
+    @unittest.skipUnless(HAS_MSGPACK, 'msgpack is not installed')
+    def test_post_msgpack(self) -> None:
+        import msgpack
+
+        response = self.fetch(
+            self.url,
+            method='POST',
+            headers={'Content-Type': 'application/msgpack'},
+            body=msgpack.packb({'text': self.plaintext, 'encrypt': True, 'key': 3}),
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.headers['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.body), {'text': 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH'})
+
+    @unittest.skipUnless(HAS_MSGPACK, 'msgpack is not installed')
+    def test_post_invalid_msgpack(self) -> None:
+        import msgpack
+
+        response = self.fetch(
+            self.url, method='POST', headers={'Content-Type': 'application/msgpack'}, body=b'\xc1'
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response.headers['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.body), {'error': 'Invalid msgpack body'})
+
+
+class TestCipherWebSocketHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def _connect(self, path: str) -> Awaitable[tornado.websocket.WebSocketClientConnection]:
+        return tornado.websocket.websocket_connect(f'ws://127.0.0.1:{self.get_http_port()}{path}')
+
+    @tornado.testing.gen_test
+    async def test_messages(self) -> None:
+        connection = await self._connect('/cipher/caesar/ws/?encrypt=true&key=3')
+        await connection.write_message('This message')
+        self.assertEqual(await connection.read_message(), 'WKLV PHVVDJH')
+        await connection.write_message(b'This message \xff', binary=True)
+        self.assertEqual(await connection.read_message(), b'WKLV PHVVDJH \xff')
+        connection.close()
+
+    @tornado.testing.gen_test
+    async def test_pipelined_messages(self) -> None:
+        connection = await self._connect('/cipher/vigenere/ws/?encrypt=false&key=LEMON')
+        texts: list[str] = [f'LXFOPV EF RNHR {index}' for index in range(200)]
+        for text in texts:
+            connection.write_message(text)
+        replies: list[str] = [await connection.read_message() for _ in texts]
+        self.assertEqual(replies, [f'ATTACK AT DAWN {index}' for index in range(200)])
+        connection.close()
+
+    @tornado.testing.gen_test
+    async def test_invalid_argument(self) -> None:
+        with self.assertRaises(tornado.httpclient.HTTPClientError) as context:
+            await self._connect('/cipher/affine/ws/?encrypt=true&keys=2,7')
+        self.assertEqual(context.exception.code, HTTPStatus.BAD_REQUEST)
+        with self.assertRaises(tornado.httpclient.HTTPClientError) as context:
+            await self._connect('/cipher/caesar/ws/?key=3')
+        self.assertEqual(context.exception.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(context.exception.response.body), {'error': 'Missing query argument'})
+        with self.assertRaises(tornado.httpclient.HTTPClientError) as context:
+            await self._connect('/cipher/affine/ws/?encrypt=true&keys=5')
+        self.assertEqual(context.exception.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(context.exception.response.body), {'error': 'Invalid cipher keys'})
+
+    @tornado.testing.gen_test
+    async def test_metrics(self) -> None:
+        connection = await self._connect('/cipher/atbash/ws/?encrypt=true')
+        await connection.write_message('abc')
+        await connection.read_message()
+        connection.close()
+        while 'websocket' not in self._app.settings['metrics'].latency:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self._app.settings['metrics'].requests['websocket', 101], 1)
+        self.assertEqual(self._app.settings['metrics'].bytes_in['websocket'], 3)
+
+
+class TestAdmission(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.body = json.dumps({'text': 'abc', 'encrypt': True, 'key': 3})
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app(
+            admission=AdmissionController(max_in_flight=2, cipher_limits={'vigenere': 1}, retry_after=2),
+            body_limits={'caesar': 64},
+        )
+
+    def test_post_body_too_large(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/', method='POST', body=json.dumps({'text': 'a' * 64, 'encrypt': True, 'key': 3})
+        )
+        self.assertEqual(response.code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(json.loads(response.body), {'error': 'Request body larger than 64 bytes'})
+        # other routes keep the default limit
+        response = self.fetch(
+            '/cipher/affine/', method='POST', body=json.dumps({'text': 'a' * 64, 'encrypt': True, 'keys': [5, 7]})
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+
+    def test_post_too_many_requests(self) -> None:
+        admission: AdmissionController = self._app.settings['admission']
+        admission.acquire('affine')
+        admission.acquire('affine')
+        response = self.fetch('/cipher/caesar/', method='POST', body=self.body)
+        self.assertEqual(response.code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(response.headers['Retry-After'], '2')
+        self.assertEqual(json.loads(response.body), {'error': 'Too many requests'})
+
+        admission.release('affine')
+        response = self.fetch('/cipher/caesar/', method='POST', body=self.body)
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(admission.in_flight, 1)
+
+    def test_post_cipher_limit(self) -> None:
+        admission: AdmissionController = self._app.settings['admission']
+        admission.acquire('vigenere')
+        response = self.fetch(
+            '/cipher/vigenere/', method='POST', body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 'LEMON'})
+        )
+        self.assertEqual(response.code, HTTPStatus.TOO_MANY_REQUESTS)
+        response = self.fetch('/cipher/vigenere/stream/?encrypt=true&key=LEMON', method='POST', body='abc')
+        self.assertEqual(response.code, HTTPStatus.TOO_MANY_REQUESTS)
+        response = self.fetch('/cipher/caesar/', method='POST', body=self.body)
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(self._app.settings['admission'].stats()['rejected'], {'vigenere': 2})
+
+
+class TestJobHandlers(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app(jobs=JobStore(workers=1, max_pending=2))
+
+    def tearDown(self) -> None:
+        self._app.settings['jobs'].shutdown()
+        super().tearDown()
+
+    def _wait(self, location: str) -> dict:
+        for _ in range(500):
+            status: dict = json.loads(self.fetch(location).body)
+            if status['status'] not in ('pending', 'running'):
+                return status
+            self.io_loop.run_sync(lambda: asyncio.sleep(0.01))
+        self.fail('Job not finished')
+
+    def test_post_job(self) -> None:
+        response = self.fetch(
+            '/jobs/', method='POST',
+            body=json.dumps({'cipher': 'affine', 'keys': [5, 7], 'encrypt': True, 'text': 'This message'}),
+        )
+        self.assertEqual(response.code, HTTPStatus.ACCEPTED)
+        job: dict = json.loads(response.body)
+        self.assertEqual(response.headers['Location'], f"/jobs/{job['id']}")
+        self.assertEqual(job['size'], 12)
+
+        status: dict = self._wait(response.headers['Location'])
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual(status['progress'], 1.0)
+        response = self.fetch(response.headers['Location'] + '/result')
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.headers['Content-Type'], 'text/plain; charset=UTF-8')
+        self.assertEqual(response.body, b'YQVT PBTTHLB')
+
+    def test_post_job_octet_stream(self) -> None:
+        response = self.fetch(
+            '/jobs/?cipher=vigenere&key=LEMON&encrypt=false', method='POST',
+            headers={'Content-Type': 'application/octet-stream'}, body=b'LXFOPV EF RNHR \xff',
+        )
+        self.assertEqual(response.code, HTTPStatus.ACCEPTED)
+        self.assertEqual(response.headers['Content-Type'], 'application/json; charset=UTF-8')
+        self.assertEqual(self._wait(response.headers['Location'])['status'], 'done')
+        response = self.fetch(response.headers['Location'] + '/result')
+        self.assertEqual(response.body, b'ATTACK AT DAWN \xff')
+
+    def test_post_invalid_job(self) -> None:
+        for url, body, error in (
+            ('/jobs/', {'cipher': 'rot13', 'encrypt': True, 'text': 'abc'}, "Unknown cipher 'rot13'"),
+            ('/jobs/', {'cipher': 'caesar', 'encrypt': True, 'text': 'abc'}, 'Missing body argument'),
+            ('/jobs/', {'cipher': 'affine', 'keys': [2, 7], 'encrypt': True, 'text': 'abc'}, None),
+        ):
+            response = self.fetch(url, method='POST', body=json.dumps(body))
+            self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+            if error is not None:
+                self.assertEqual(json.loads(response.body), {'error': error})
+        response = self.fetch(
+            '/jobs/?cipher=caesar&encrypt=true', method='POST',
+            headers={'Content-Type': 'application/octet-stream'}, body='abc',
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Missing query argument'})
+
+    def test_get_unknown_job(self) -> None:
+        for url in ('/jobs/0123abcd', '/jobs/0123abcd/result'):
+            response = self.fetch(url)
+            self.assertEqual(response.code, HTTPStatus.NOT_FOUND)
+            self.assertEqual(json.loads(response.body), {'error': 'Unknown job'})
+
+    def test_too_many_jobs(self) -> None:
+        jobs: JobStore = self._app.settings['jobs']
+        jobs.active = jobs.max_pending
+        response = self.fetch(
+            '/jobs/', method='POST', body=json.dumps({'cipher': 'atbash', 'encrypt': True, 'text': 'abc'})
+        )
+        self.assertEqual(response.code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response.headers)
+        # the submission is rejected from its headers, its body is not read
+        with mock.patch.object(JobsHandler, 'data_received') as data_received:
+            response = self.fetch(
+                '/jobs/?cipher=atbash&encrypt=true', method='POST', body=b'abc' * 1024,
+                headers={'Content-Type': 'application/octet-stream'},
+            )
+        self.assertEqual(response.code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(json.loads(response.body), {'error': 'Too many jobs'})
+        data_received.assert_not_called()
+        jobs.active = 0
+
+    def test_body_limit(self) -> None:
+        # JSON bodies are parsed on the event loop: only octet-stream bodies get the jobs limit
+        with mock.patch('cryptools.app.MAX_BODY_SIZE', 64):
+            response = self.fetch(
+                '/jobs/', method='POST', body=json.dumps({'cipher': 'atbash', 'encrypt': True, 'text': 'a' * 64})
+            )
+            self.assertEqual(response.code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            self.assertEqual(json.loads(response.body), {'error': 'Request body larger than 64 bytes'})
+            response = self.fetch(
+                '/jobs/?cipher=atbash&encrypt=true', method='POST', body=b'a' * 64,
+                headers={'Content-Type': 'application/octet-stream'},
+            )
+            self.assertEqual(response.code, HTTPStatus.ACCEPTED)
+
+
+class TestProfiling(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app(profiler=Profiler(allow_header=True))
+
+    def test_post_profiled(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/', method='POST', headers={'X-Profile': 'cpu, memory'},
+            body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3}),
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'text': 'DEF'})
+        self.assertRegex(
+            response.headers['X-Profile-Summary'],
+            r'^id=[0-9a-f]{32}; total=[0-9.]+ms; parse=[0-9.]+ms; cipher=[0-9.]+ms; serialize=[0-9.]+ms; peak=\d+B$'
+        )
+        profile_id: str = response.headers['X-Profile-Summary'][3:35]
+
+        profiles: list[dict] = json.loads(self.fetch('/admin/profiles/').body)['profiles']
+        self.assertEqual([profile['id'] for profile in profiles], [profile_id])
+        self.assertEqual(profiles[0]['route'], '/cipher/caesar/')
+        self.assertEqual(profiles[0]['status'], 200)
+
+        response = self.fetch(f'/admin/profiles/{profile_id}')
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(response.headers['Content-Type'], 'application/octet-stream')
+        response = self.fetch(f'/admin/profiles/{profile_id}?format=text&sort=tottime')
+        self.assertIn('function calls', response.body.decode())
+        response = self.fetch(f'/admin/profiles/{profile_id}?format=text&sort=invalid')
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+
+    def test_post_not_profiled(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/', method='POST', body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3})
+        )
+        self.assertNotIn('X-Profile-Summary', response.headers)
+        self.assertEqual(json.loads(self.fetch('/admin/profiles/').body), {'profiles': []})
+        self.assertEqual(self.fetch('/admin/profiles/0123').code, HTTPStatus.NOT_FOUND)
+
+
+class TestProfilingDisabled(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post(self) -> None:
+        response = self.fetch(
+            '/cipher/caesar/', method='POST', headers={'X-Profile': 'cpu'},
+            body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3}),
+        )
+        self.assertNotIn('X-Profile-Summary', response.headers)
+        self.assertEqual(self.fetch('/admin/profiles/').code, HTTPStatus.NOT_FOUND)
+
+
+class TestMetricsHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_get_metrics(self) -> None:
+        self.fetch('/cipher/caesar/', method='POST', body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3}))
+        self.fetch('/cipher/caesar/', method='POST', body='{')
+        self.fetch(
+            '/cipher/caesar/stream/?encrypt=true&key=3', method='POST', headers={'Content-Type': 'text/plain'}, body='abc'
+        )
+
+        response = self.fetch('/metrics')
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertTrue(response.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.body.decode()
+        self.assertIn('cryptools_requests_total{route="caesar",code="200"} 1\n', text)
+        self.assertIn('cryptools_errors_total{route="caesar",kind="bad_request"} 1\n', text)
+        for phase in ('parse', 'cipher', 'serialize'):
+            self.assertIn(f'cryptools_request_phase_seconds_count{{route="caesar",phase="{phase}"}}', text)
+        self.assertIn('cryptools_request_bytes_total{route="stream"} 3\n', text)
+        self.assertIn('cryptools_response_bytes_total{route="stream"} 3\n', text)
+        self.assertIn('cryptools_requests_in_flight 0\n', text)
+        self.assertIn('cryptools_registry_hits_total', text)
+        self.assertIn('cryptools_executor_calls_total{mode="inline"}', text)
+        self.assertIn('cryptools_event_loop_lag_seconds_count', text)
+
+    def test_route_label_fixed(self) -> None:
+        for job_id in ('0' * 32, '1' * 32, '2' * 32):
+            self.assertEqual(self.fetch(f'/jobs/{job_id}').code, HTTPStatus.NOT_FOUND)
+            self.assertEqual(self.fetch(f'/jobs/{job_id}/result').code, HTTPStatus.NOT_FOUND)
+
+        text = self.fetch('/metrics').body.decode()
+        self.assertIn('cryptools_requests_total{route="job",code="404"} 3\n', text)
+        self.assertIn('cryptools_requests_total{route="job_result",code="404"} 3\n', text)
+        self.assertNotIn('/jobs/', text)
+
+
+class TestOffloadedCipherHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        self.executor = CipherExecutor(threshold=16)
+        self.addCleanup(self.executor.shutdown)
+        return make_app(self.executor)
+
+    def test_post_encode(self) -> None:
+        for text, expected in (('abc', 'DEF'), ('This message shall remain private', 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH')):
+            response = self.fetch(
+                '/cipher/caesar/', method='POST', body=json.dumps({'text': text, 'encrypt': True, 'key': 3})
+            )
+            self.assertEqual(json.loads(response.body), {'text': expected})
+
+        response = self.fetch('/stats/')
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(
+            json.loads(response.body)['executor'],
+            {'threshold': 16, 'workers': 4, 'processes': 0, 'inline': 1, 'offloaded': 1, 'pending': 0}
+        )
+
+
+class TestCrackHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = '/crack/'
+        self.headers = {'Content-Type': 'application/json; charset=UTF-8'}
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post_crack(self) -> None:
+        response = self.fetch(
+            self.url,
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'WKLV PHVVDJH VKDOO UHPDLQ SULYDWH', 'top': 2})
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        candidates = json.loads(response.body)['candidates']
+        self.assertEqual(len(candidates), 2)
+        self.assertEqual(candidates[0]['cipher'], 'caesar')
+        self.assertEqual(candidates[0]['key'], 3)
+        self.assertEqual(candidates[0]['preview'], 'THIS MESSAGE SHALL REMAIN PRIVATE')
+
+    def test_post_invalid_argument_type_top(self) -> None:
+        response = self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps({'text': 'abc', 'top': 'one'}))
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for body argument 'top'"})
+
+    def test_post_no_letter(self) -> None:
+        response = self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps({'text': '1234'}))
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Input text has no letter to analyse'})
+
+
+class TestSubstitutionHandlers(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        self.key = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post_encode(self) -> None:
+        response = self.fetch(
+            '/cipher/substitution/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'This message shall remain private', 'encrypt': True, 'key': self.key})
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'text': 'ZIOL DTLLQUT LIQSS KTDQOF HKOCQZT'})
+
+    def test_post_invalid_argument_type_key(self) -> None:
+        response = self.fetch(
+            '/cipher/substitution/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3})
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for body argument 'key'"})
+
+    def test_post_invalid_key(self) -> None:
+        response = self.fetch(
+            '/cipher/substitution/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 'ABC'})
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Input key='ABC' is not a permutation of the alphabet."})
+
+    def test_post_crack(self) -> None:
+        plaintext = (
+            'However little known the feelings or views of such a man may be on his first entering a neighbourhood, '
+            'this truth is so well fixed in the minds of the surrounding families, that he is considered as the '
+            'rightful property of some one or other of their daughters. My dear Mr Bennet, said his lady to him one '
+            'day, have you heard that Netherfield Park is let at last? Mr Bennet replied that he had not.'
+        )
+        response = self.fetch(
+            '/cipher/substitution/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': plaintext, 'encrypt': True, 'key': self.key})
+        )
+        response = self.fetch(
+            '/crack/substitution/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': json.loads(response.body)['text'], 'seed': 1})
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body)['preview'], plaintext.upper()[:64])
+
+
+class TestVigenereCipherHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.headers = {'Content-Type': 'application/json; charset=UTF-8'}
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_post_encode_decode(self) -> None:
+        response = self.fetch(
+            '/cipher/vigenere/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'Attack at dawn', 'encrypt': True, 'key': 'LEMON'})
+        )
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(json.loads(response.body), {'text': 'LXFOPV EF RNHR'})
+        response = self.fetch(
+            '/cipher/vigenere/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'LXFOPV EF RNHR', 'encrypt': False, 'key': 'lemon'})
+        )
+        self.assertEqual(json.loads(response.body), {'text': 'ATTACK AT DAWN'})
+
+    def test_post_invalid_key(self) -> None:
+        response = self.fetch(
+            '/cipher/vigenere/',
+            method='POST',
+            headers=self.headers,
+            body=json.dumps({'text': 'abc', 'encrypt': True, 'key': 'LEM0N'})
+        )
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+
+
+class TestPipelineCipherHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = '/cipher/pipeline/'
+        self.headers = {'Content-Type': 'application/json; charset=UTF-8'}
+        self.stages = [{'cipher': 'caesar', 'key': 3}, {'cipher': 'affine', 'keys': [5, 7]}, {'cipher': 'atbash'}]
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def _post(self, body: dict) -> tornado.httpclient.HTTPResponse:
+        return self.fetch(self.url, method='POST', headers=self.headers, body=json.dumps(body))
+
+    def test_post_encode_decode(self) -> None:
+        response = self._post({'text': 'This message', 'encrypt': True, 'stages': self.stages})
+        self.assertEqual(response.code, HTTPStatus.OK)
+        ciphertext = json.loads(response.body)['text']
+        self.assertEqual(ciphertext, 'MUPR VJRRDZJ')
+        response = self._post({'text': ciphertext, 'encrypt': False, 'stages': self.stages})
+        self.assertEqual(json.loads(response.body), {'text': 'THIS MESSAGE'})
+
+    def test_post_invalid_stage(self) -> None:
+        response = self._post({'text': 'abc', 'encrypt': True, 'stages': [{'cipher': 'caesar', 'key': 'three'}]})
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': "Invalid type for body argument 'key'"})
+
+    def test_post_empty_stages(self) -> None:
+        response = self._post({'text': 'abc', 'encrypt': True, 'stages': []})
+        self.assertEqual(response.code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(json.loads(response.body), {'error': 'Input stages must not be empty.'})
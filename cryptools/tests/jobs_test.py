@@ -0,0 +1,125 @@
+import tempfile
+import threading
+import time
+from typing import Callable
+import unittest
+from unittest import mock
+
+from cryptools.src import jobs
+from cryptools.src.cryptools import CaesarCipher, VigenereCipher
+from cryptools.src.jobs import Job, JobStore
+
+
+def _wait(job: Job) -> Job:
+    """This function waits for a job to finish, for up to 5 seconds."""
+    deadline: float = time.monotonic() + 5
+    while job.status in ('pending', 'running') and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return job
+
+
+class TestJobStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.store = JobStore(workers=1)
+
+    def tearDown(self) -> None:
+        self.store.shutdown()
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            JobStore(workers=0)
+        with self.assertRaises(ValueError):
+            JobStore(max_pending=0)
+        with self.assertRaises(ValueError):
+            JobStore(ttl=0)
+        with self.assertRaises(ValueError):
+            JobStore(maxbytes=0)
+        with self.assertRaises(ValueError):
+            JobStore(spill_directory='/nonexistent/directory')
+
+    @mock.patch.object(jobs, 'JOB_WINDOW', 5)
+    def test_submit(self) -> None:
+        job: Job = _wait(self.store.submit(VigenereCipher('LEMON'), 'attack at dawn', decode=False))
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(b''.join(job.result()), b'LXFOPV EF RNHR')
+        self.assertEqual(job.describe(), {
+            'id': job.id, 'status': 'done', 'progress': 1.0, 'size': 14, 'processed': 14, 'result_size': 14,
+        })
+        self.assertIs(self.store.get(job.id), job)
+        self.assertIsNone(self.store.get('unknown'))
+
+    @mock.patch.object(jobs, 'JOB_WINDOW', 3)
+    def test_submit_bytes(self) -> None:
+        # windows split the multi-byte characters, the invalid byte is passed through
+        job: Job = _wait(self.store.submit(CaesarCipher(3), 'abc été '.encode() + b'\xff', decode=False))
+        self.assertEqual(b''.join(job.result()), 'DEF ÉWÉ '.encode() + b'\xff')
+
+    def test_submit_chunks(self) -> None:
+        # the chunks are joined window by window, even where a character is split between two of them
+        chunks: list[bytes] = [b'ab', b'c \xc3', b'\xa9t', '\xe9 '.encode() + b'\xff']
+        job: Job = _wait(self.store.submit(CaesarCipher(3), chunks, decode=False))
+        self.assertEqual(job.size, len('abc été '.encode()) + 1)
+        self.assertEqual(b''.join(job.result()), 'DEF ÉWÉ '.encode() + b'\xff')
+        self.assertEqual(chunks, [])
+
+    def test_failed(self) -> None:
+        cipher = CaesarCipher(3)
+        with mock.patch.object(cipher, '_stream', side_effect=RuntimeError('boom')):
+            job: Job = _wait(self.store.submit(cipher, 'abc', decode=False))
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.describe()['error'], 'RuntimeError: boom')
+        self.assertEqual(self.store.stats()['failed'], 1)
+
+    def test_spill(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = JobStore(workers=1, spill_directory=directory, spill_threshold=4)
+            small: Job = _wait(store.submit(CaesarCipher(3), 'abc', decode=False))
+            large: Job = _wait(store.submit(CaesarCipher(3), 'abcdef', decode=False))
+            self.assertFalse(small.spilled)
+            self.assertTrue(large.spilled)
+            self.assertEqual(b''.join(large.result(chunk_size=4)), b'DEFGHI')
+            self.assertEqual(store.stats()['spilled'], 1)
+            store.shutdown()
+            self.assertEqual(len(store), 0)
+            self.assertEqual(list(large.result()), [])
+
+    def test_bounded_by_bytes(self) -> None:
+        store = JobStore(workers=1, maxbytes=10)
+        first: Job = _wait(store.submit(CaesarCipher(3), 'abcdef', decode=False))
+        second: Job = _wait(store.submit(CaesarCipher(3), 'abcdef', decode=False))
+        self.assertIsNone(store.get(first.id))
+        self.assertIs(store.get(second.id), second)
+        self.assertEqual(store.stats()['evictions'], 1)
+        self.assertEqual(store.size, 6)
+        store.shutdown()
+
+    def test_expire(self) -> None:
+        store = JobStore(workers=1, ttl=60)
+        job: Job = _wait(store.submit(CaesarCipher(3), 'abc', decode=False))
+        with mock.patch.object(time, 'monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNone(store.get(job.id))
+        self.assertEqual(store.stats()['expirations'], 1)
+        self.assertEqual(store.size, 0)
+        store.shutdown()
+
+    def test_accepts(self) -> None:
+        store = JobStore(workers=1, max_pending=1)
+        self.assertTrue(store.accepts())
+        cipher = CaesarCipher(3)
+        started, release = threading.Event(), threading.Event()
+
+        def stream(decode: bool) -> Callable[[str], str]:
+            started.set()
+            release.wait(5)
+            return str.upper
+
+        with mock.patch.object(cipher, '_stream', stream):
+            job: Job = store.submit(cipher, 'abc', decode=False)
+            started.wait(5)
+            self.assertEqual(store.get(job.id).status, 'running')
+            self.assertFalse(store.accepts())
+            release.set()
+            _wait(job)
+        self.assertTrue(store.accepts())
+        store.shutdown()
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import unittest
+
+from cryptools.src.metrics import Histogram, Metrics, PhaseTimer, format_family
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_format_cumulative_buckets(self) -> None:
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.format('latency', (('route', '/a/'),)), [
+            'latency_bucket{route="/a/",le="0.1"} 2',
+            'latency_bucket{route="/a/",le="1.0"} 3',
+            'latency_bucket{route="/a/",le="+Inf"} 4',
+            'latency_sum{route="/a/"} 3.65',
+            'latency_count{route="/a/"} 4',
+        ])
+
+    def test_format_family_escapes_labels(self) -> None:
+        self.assertEqual(format_family('errors_total', 'counter', 'Errors.', [((('kind', 'a"b\\c\n'),), 3)]), [
+            '# HELP cryptools_errors_total Errors.',
+            '# TYPE cryptools_errors_total counter',
+            'cryptools_errors_total{kind="a\\"b\\\\c\\n"} 3',
+        ])
+
+
+class TestMetrics(unittest.IsolatedAsyncioTestCase):
+
+    def test_observe_request(self) -> None:
+        metrics = Metrics()
+        metrics.observe_request('/cipher/caesar/', 200, 0.002, {'parse': 0.0001, 'cipher': 0.001}, 40, 20)
+        metrics.observe_request('/cipher/caesar/', 400, 0.001, {'parse': 0.0001}, 10, 30, 'bad_request')
+        text = metrics.render([('requests_in_flight', 'gauge', 'Requests being processed.', [((), 1)])])
+
+        self.assertIn('cryptools_requests_total{route="/cipher/caesar/",code="200"} 1\n', text)
+        self.assertIn('cryptools_requests_total{route="/cipher/caesar/",code="400"} 1\n', text)
+        self.assertIn('cryptools_request_duration_seconds_count{route="/cipher/caesar/"} 2\n', text)
+        self.assertIn('cryptools_request_phase_seconds_count{route="/cipher/caesar/",phase="parse"} 2\n', text)
+        self.assertIn('cryptools_request_phase_seconds_count{route="/cipher/caesar/",phase="cipher"} 1\n', text)
+        self.assertIn('cryptools_request_bytes_total{route="/cipher/caesar/"} 50\n', text)
+        self.assertIn('cryptools_response_bytes_total{route="/cipher/caesar/"} 50\n', text)
+        self.assertIn('cryptools_errors_total{route="/cipher/caesar/",kind="bad_request"} 1\n', text)
+        self.assertIn('# TYPE cryptools_requests_in_flight gauge\ncryptools_requests_in_flight 1\n', text)
+
+    def test_phase_timer(self) -> None:
+        phases: dict[str, float] = {}
+        for _ in range(2):
+            with PhaseTimer(phases, 'cipher'):
+                time.sleep(0.01)
+        self.assertGreaterEqual(phases['cipher'], 0.02)
+
+    async def test_event_loop_lag(self) -> None:
+        metrics = Metrics()
+        metrics.monitor(asyncio.get_running_loop(), interval=0.01)
+        self.addCleanup(metrics.stop)
+        await asyncio.sleep(0.005)
+        time.sleep(0.05)    # blocks the event loop
+        await asyncio.sleep(0.02)
+        self.assertGreaterEqual(metrics.loop_lag.count, 1)
+        self.assertGreaterEqual(max(metrics.last_loop_lag, metrics.loop_lag.sum), 0.03)
@@ -0,0 +1,41 @@
+from multiprocessing import shared_memory
+import unittest
+
+from cryptools.src import cryptools
+from cryptools.src.parallel import ParallelCipher
+
+
+class TestParallelCipher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.plaintext = b'#>This messag@ shall rema5!in private\n' * 1000
+        self.ciphertext = b'#>YQVT PBTTHL@ TQHKK OBPH5!VU EOVIHYB\n' * 1000
+        self.cipher = ParallelCipher(cryptools.AffineCipher(5, 7), workers=2, shard_size=4096)
+        self.addCleanup(self.cipher.shutdown)
+
+    def test_invalid_shard_size(self) -> None:
+        with self.assertRaises(ValueError):
+            ParallelCipher(cryptools.AtbashCipher(), shard_size=0)
+
+    def test_position_dependent_cipher(self) -> None:
+        with self.assertRaises(ValueError):
+            ParallelCipher(cryptools.VigenereCipher('LEMON'))
+
+    def test_encode_bytes(self) -> None:
+        self.assertEqual(self.cipher.encode_bytes(self.plaintext), self.ciphertext)
+
+    def test_decode_bytes(self) -> None:
+        self.assertEqual(self.cipher.decode_bytes(bytearray(self.ciphertext)), self.plaintext.upper())
+
+    def test_small_buffer_not_sharded(self) -> None:
+        self.assertEqual(self.cipher.encode_bytes(self.plaintext[:100]), self.ciphertext[:100])
+        self.assertIsNone(self.cipher._pool)
+
+    def test_encode_shared(self) -> None:
+        memory = shared_memory.SharedMemory(create=True, size=len(self.plaintext))
+        self.addCleanup(memory.unlink)
+        self.addCleanup(memory.close)
+        memory.buf[:len(self.plaintext)] = self.plaintext
+        self.cipher.encode_shared(memory, len(self.plaintext))
+        self.assertEqual(bytes(memory.buf[:len(self.plaintext)]), self.ciphertext)
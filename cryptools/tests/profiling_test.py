@@ -0,0 +1,74 @@
+import json
+import marshal
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from cryptools.src.profiling import Profile, Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def _profile(self, profiler: Profiler, header: str = None) -> Profile:
+        profile: Profile = profiler.start(header)
+        self.assertIsNotNone(profile)
+        'abc'.upper()
+        profiler.stop(profile, '/cipher/caesar/', 'POST', 200, {'parse': 0.001, 'cipher': 0.002})
+        return profile
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            Profiler(rate=1.5)
+        with self.assertRaises(ValueError):
+            Profiler(keep=0)
+        with self.assertRaises(ValueError):
+            Profiler(modes=('io',))
+        with self.assertRaises(ValueError):
+            Profiler(directory='/nonexistent/directory')
+
+    def test_not_sampled(self) -> None:
+        self.assertIsNone(Profiler().start(None))
+        # the header is ignored unless allowed
+        self.assertIsNone(Profiler().start('cpu'))
+        self.assertIsNone(Profiler(allow_header=True).start('unknown'))
+
+    def test_cpu(self) -> None:
+        profiler = Profiler(rate=1.0)
+        profile: Profile = self._profile(profiler)
+        self.assertEqual(profile.metadata['modes'], ['cpu'])
+        self.assertEqual(profile.metadata['phases'], {'parse': 0.001, 'cipher': 0.002})
+        self.assertNotIn('peak', profile.metadata)
+        self.assertIsInstance(marshal.loads(profile.stats), dict)
+        self.assertIn("method 'upper' of 'str' objects", profile.report())
+        self.assertRegex(profile.summary(), rf'^id={profile.id}; total=[0-9.]+ms; parse=1.000ms; cipher=2.000ms$')
+        self.assertEqual(profiler.profiles(), [profile.metadata])
+        self.assertIs(profiler.get(profile.id), profile)
+
+    def test_memory(self) -> None:
+        profile: Profile = self._profile(Profiler(allow_header=True), 'memory')
+        self.assertIsNone(profile.stats)
+        self.assertGreaterEqual(profile.metadata['peak'], 0)
+        self.assertIsInstance(profile.metadata['allocations'], list)
+        self.assertIn('; peak=', profile.summary())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_single_profile(self) -> None:
+        profiler = Profiler(rate=1.0)
+        profile: Profile = profiler.start(None)
+        self.assertIsNone(profiler.start(None))
+        self.assertEqual(profiler.skipped, 1)
+        profiler.stop(profile, '/', 'GET', 200, {})
+        self._profile(profiler)
+
+    def test_keep(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler(rate=1.0, directory=directory, keep=2)
+            profiles: list[Profile] = [self._profile(profiler) for _ in range(3)]
+            self.assertEqual([metadata['id'] for metadata in profiler.profiles()], [profiles[2].id, profiles[1].id])
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                sorted(f'{profile.id}.{extension}' for profile in profiles[1:] for extension in ('prof', 'json'))
+            )
+            with open(os.path.join(directory, f'{profiles[2].id}.json')) as file:
+                self.assertEqual(json.load(file), profiles[2].metadata)
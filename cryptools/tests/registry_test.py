@@ -0,0 +1,64 @@
+import unittest
+
+from cryptools.src import cryptools
+from cryptools.src.registry import CipherRegistry
+
+
+class TestCipherRegistry(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.registry = CipherRegistry(maxsize=2)
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(ValueError):
+            CipherRegistry(maxsize=0)
+
+    def test_unknown_cipher(self) -> None:
+        with self.assertRaises(KeyError):
+            self.registry.get('enigma')
+
+    def test_instances_are_shared(self) -> None:
+        cipher = self.registry.get('affine', 5, 7)
+        self.assertIsInstance(cipher, cryptools.AffineCipher)
+        self.assertIs(self.registry.get('affine', 5, 7), cipher)
+        self.assertEqual(self.registry.stats(), {'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_least_recently_used_evicted(self) -> None:
+        caesar = self.registry.get('caesar', 3)
+        self.registry.get('atbash')
+        self.registry.get('caesar', 3)
+        self.registry.get('affine', 5, 7)
+        self.assertEqual(len(self.registry), 2)
+        self.assertEqual(self.registry.evictions, 1)
+        self.assertIs(self.registry.get('caesar', 3), caesar)
+
+    def test_options(self) -> None:
+        cipher = self.registry.get('caesar', 3, preserve_case=True)
+        self.assertTrue(cipher.preserve_case)
+        self.assertIsNot(self.registry.get('caesar', 3), cipher)
+        self.assertIs(self.registry.get('caesar', 3, preserve_case=True), cipher)
+        pipeline = self.registry.get('pipeline', ('caesar', 3), ('atbash',), alphabet='lowercase')
+        self.assertEqual(pipeline.alphabet, 'abcdefghijklmnopqrstuvwxyz')
+
+    def test_invalid_keys_not_cached(self) -> None:
+        with self.assertRaises(ValueError):
+            self.registry.get('affine', 2, 2)
+        self.assertEqual(len(self.registry), 0)
+
+    def test_keys_read_only(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.registry.get('caesar', 3).key = 4
+
+    async def test_shared_instance_output(self) -> None:
+        cipher = self.registry.get('affine', 5, 7)
+        self.assertEqual(await cipher.encode('This message'), 'YQVT PBTTHLB')
+        self.assertEqual(await self.registry.get('affine', 5, 7).decode('yqvt pbtthlb'), 'THIS MESSAGE')
+
+    async def test_pipeline(self) -> None:
+        pipeline = self.registry.get('pipeline', ('caesar', 3), ('atbash',))
+        self.assertIsInstance(pipeline, cryptools.CipherPipeline)
+        self.assertIs(self.registry.get('pipeline', ('caesar', 3), ('atbash',)), pipeline)
+        self.assertEqual(await pipeline.encode('abc'), await cryptools.AtbashCipher().encode('DEF'))
+        with self.assertRaises(ValueError):
+            self.registry.get('pipeline', ('enigma', 1))
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+import unittest.mock
+import urllib.request
+
+import tornado.testing
+import tornado.web
+
+from cryptools.app import make_app, BaseHandler
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+class TestMakeApp(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self) -> tornado.web.Application:
+        return make_app()
+
+    def test_make_app_does_not_listen(self) -> None:
+        with unittest.mock.patch.object(tornado.web.Application, 'listen') as listen:
+            make_app()
+        listen.assert_not_called()
+
+    def test_in_flight_requests_released(self) -> None:
+        response = self.fetch('/cipher/atbash/', method='POST', body=json.dumps({'text': 'abc', 'encrypt': True}))
+        self.assertEqual(response.code, HTTPStatus.OK)
+        self.assertEqual(BaseHandler.in_flight, 0)
+
+
+class TestServe(unittest.TestCase):
+
+    def _start(self, *args: str) -> tuple[subprocess.Popen, int]:
+        sock, port = tornado.testing.bind_unused_port()
+        sock.close()
+        process = subprocess.Popen(
+            [sys.executable, APP_PATH, '--port', str(port), '--address', '127.0.0.1', *args],
+            stdout=subprocess.DEVNULL,
+        )
+        self.addCleanup(process.kill)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            with socket.socket() as sock:
+                if sock.connect_ex(('127.0.0.1', port)) == 0:
+                    return process, port
+            time.sleep(0.05)
+        self.fail('Server did not start')
+
+    def _post(self, port: int) -> dict:
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{port}/cipher/caesar/',
+            data=json.dumps({'text': 'abc', 'encrypt': True, 'key': 3}).encode(),
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_graceful_shutdown(self) -> None:
+        process, port = self._start()
+        self.assertEqual(self._post(port), {'text': 'DEF'})
+        process.send_signal(signal.SIGTERM)
+        self.assertEqual(process.wait(timeout=10), 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_workers(self) -> None:
+        process, port = self._start('--workers', '2', '--reuse-port')
+        for _ in range(4):
+            self.assertEqual(self._post(port), {'text': 'DEF'})
+        process.send_signal(signal.SIGTERM)
+        self.assertEqual(process.wait(timeout=10), 0)
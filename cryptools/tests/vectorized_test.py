@@ -0,0 +1,52 @@
+import unittest
+import unittest.mock
+
+from cryptools.src import cryptools, vectorized
+
+
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.plaintext = b'#>This messag@ shall rema5!in private \xc3\xa9'
+        self.keys = [(1, 3), (5, 7), (9, 3), (25, 25)]
+
+    def _expected(self, keys: list[tuple[int, int]], decode: bool) -> list[bytes]:
+        return [bytes(cryptools.AffineCipher(*key)._process_bytes(self.plaintext, decode)) for key in keys]
+
+    @unittest.skipUnless(vectorized.HAS_NUMPY, 'requires numpy')
+    def test_affine_keys_numpy(self) -> None:
+        with unittest.mock.patch.object(vectorized, 'NUMPY_THRESHOLD', 0):
+            for decode in (False, True):
+                self.assertEqual(vectorized.affine_keys(self.plaintext, self.keys, decode), self._expected(self.keys, decode))
+
+    @unittest.skipUnless(vectorized.HAS_NUMPY, 'requires numpy')
+    def test_caesar_keys_numpy(self) -> None:
+        with unittest.mock.patch.object(vectorized, 'NUMPY_THRESHOLD', 0):
+            self.assertEqual(
+                vectorized.caesar_keys(self.plaintext, range(27), decode=True),
+                self._expected([(1, key) for key in range(27)], decode=True)
+            )
+
+    @unittest.skipUnless(vectorized.HAS_NUMPY, 'requires numpy')
+    def test_invalid_keys_numpy(self) -> None:
+        with self.assertRaises(ValueError):
+            vectorized.affine_tables([(5, 7), (2, 2)])
+
+    def test_invalid_keys_both_paths(self) -> None:
+        for threshold in (0, 2 ** 62):
+            with unittest.mock.patch.object(vectorized, 'NUMPY_THRESHOLD', threshold):
+                for keys in ([(-5, 7)], [(0, 1)], [(13, 1)]):
+                    with self.assertRaises(ValueError):
+                        vectorized.affine_keys(self.plaintext, keys)
+
+    def test_affine_keys_fallback(self) -> None:
+        with unittest.mock.patch.object(vectorized, 'HAS_NUMPY', False):
+            self.assertEqual(vectorized.affine_keys(self.plaintext, self.keys), self._expected(self.keys, False))
+            with self.assertRaises(ImportError):
+                vectorized.affine_tables(self.keys)
+
+    def test_encode_texts(self) -> None:
+        cipher = cryptools.CaesarCipher(3)
+        texts = [b'abc', b'', bytearray(b'Hello, World!'), self.plaintext]
+        self.assertEqual(vectorized.encode_texts(cipher, texts), [cipher.encode_bytes(bytes(text)) for text in texts])